@@ -6,7 +6,10 @@ from discord import app_commands
 from discord.ext import commands
 from bot.model.conf_vars import ConfVars as Conf
 import bot.model.data_model as gdm
+from bot.model.game_journal import ItemMovedEvent
 from bot.botlogger.logging_manager import log_interaction_call, log_info
+from bot.utils.rate_limiter import rate_limit
+from bot.utils.channel_resolver import channel_resolver
 from bot.utils.command_autocompletes import game_item_autocomplete, player_item_autocomplete, player_list_autocomplete, \
     game_action_autocomplete, player_action_autocomplete
 from bot.cogs.moderator_request_management import send_message_to_moderator as modmsg
@@ -38,7 +41,7 @@ class ActionItemManager(commands.Cog):
 
     @app_commands.command(name="items-inventory-view",
                           description="Displays all current items in your inventory")
-    @app_commands.checks.cooldown(1, 5, key=lambda i: i.guild_id)
+    @rate_limit()
     async def items_inventory_view(self,
                                    interaction: discord.Interaction):
         log_interaction_call(interaction)
@@ -78,7 +81,7 @@ class ActionItemManager(commands.Cog):
 
     @app_commands.command(name="items-send-to-player",
                           description="Allows a player to send an item to another player")
-    @app_commands.checks.cooldown(1, 5, key=lambda i: i.guild_id)
+    @rate_limit()
     @app_commands.autocomplete(player=player_list_autocomplete)
     @app_commands.autocomplete(item=player_item_autocomplete)
     async def items_send_to_player(self,
@@ -90,36 +93,46 @@ class ActionItemManager(commands.Cog):
         game = await gdm.get_game(file_path=Conf.GAME_PATH)
         guild = interaction.guild
 
-        if not game.is_active or game.items_locked:
-            await interaction.response.send_message(
+        if not game.is_active:
+            await interaction.followup.send(
                 f'The bot has been put in an inactive state by the moderator. Please try again later.', ephemeral=True)
             return
         elif game.items_locked:
-            await interaction.response.send_message(f'Items cannot currently be sent!', ephemeral=True)
+            await interaction.followup.send(f'Items cannot currently be sent!', ephemeral=True)
             return
 
-        sending_player = game.get_player(interaction.user.id)
-        receiving_player = game.get_player(int(player))
-
-        item_to_send = sending_player.get_item(item)
-
-        if item_to_send is None:
-            await interaction.response.send_message(f'Item {item} not found in your inventory!', ephemeral=True)
-        if receiving_player is None:
-            await interaction.response.send_message(f'Recipient player was not a valid choice!', ephemeral=True)
-
-        sending_player.remove_item(item_to_send)
-        receiving_player.add_item(item_to_send)
-
-        await gdm.write_game(game=game)
+        # Two sends of the same item must not both pass the inventory check
+        async with gdm.mutate_game() as mutation:
+            game = mutation.game
+            sending_player = game.get_player(interaction.user.id)
+            receiving_player = game.get_player(int(player))
+            item_to_send = sending_player.get_item(item) if sending_player else None
+
+            if sending_player is None:
+                rejection = f'Player {interaction.user.name} is not currently defined in this game!'
+            elif item_to_send is None:
+                rejection = f'Item {item} not found in your inventory!'
+            elif receiving_player is None:
+                rejection = f'Recipient player was not a valid choice!'
+            else:
+                rejection = None
+                sending_player.remove_item(item_to_send)
+                receiving_player.add_item(item_to_send)
+                mutation.events.append(ItemMovedEvent(item_name=item_to_send.item_name,
+                                                      from_player_id=sending_player.player_id,
+                                                      to_player_id=receiving_player.player_id))
+
+        if rejection is not None:
+            await interaction.followup.send(rejection, ephemeral=True)
+            return
 
-        await interaction.response.send_message(f'Sent item {item} to player {receiving_player.player_discord_name}!',
-                                                ephemeral=True)
+        await interaction.followup.send(f'Sent item {item} to player {receiving_player.player_discord_name}!',
+                                        ephemeral=True)
 
-        sending_player_mod_channel = await interaction.guild.fetch_channel(
-            sending_player.player_mod_channel) if sending_player.player_mod_channel is not None else None
-        receiving_player_mod_channel = await interaction.guild.fetch_channel(
-            receiving_player.player_mod_channel) if receiving_player.player_mod_channel is not None else None
+        sending_player_mod_channel = await channel_resolver.resolve_channel(
+            interaction.guild, sending_player.player_mod_channel)
+        receiving_player_mod_channel = await channel_resolver.resolve_channel(
+            interaction.guild, receiving_player.player_mod_channel)
 
         item_lost_formatted_responses = await construct_item_transfer_display(action='lost', item=item_to_send,
                                                                               guild=guild, game=game)
@@ -147,30 +160,37 @@ class ActionItemManager(commands.Cog):
                                item: str):
         log_interaction_call(interaction)
         await interaction.response.defer(ephemeral=True, thinking=True)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
         guild = interaction.guild
 
-        game_player = game.get_player(int(player))
-
-        game_item = game.get_item(item)
-
-        if game_item is None:
-            await interaction.followup.send(f'Item {item} not defined in this game!', ephemeral=True)
-        if game_player is None:
-            await interaction.followup.send(f'Recipient player was not a valid choice!', ephemeral=True)
+        async with gdm.mutate_game() as mutation:
+            game = mutation.game
+            game_player = game.get_player(int(player))
+
+            game_item = game.get_item(item)
+
+            if game_item is None:
+                rejection = f'Item {item} not defined in this game!'
+            elif game_player is None:
+                rejection = f'Recipient player was not a valid choice!'
+            else:
+                rejection = None
+                # The player gets their own copy, so using it never changes the catalog entry or other holders' copies
+                game_player.add_item(game_item.model_copy(deep=True))
+                mutation.events.append(ItemMovedEvent(item_name=game_item.item_name,
+                                                      to_player_id=game_player.player_id))
+
+        if rejection is not None:
+            await interaction.followup.send(rejection, ephemeral=True)
+            return
 
-        game_player.add_item(game_item)
         item_mod_responses = await construct_item_transfer_display(action='gained', item=game_item, guild=guild,
                                                                    game=game)
 
-        await gdm.write_game(game=game)
-
         await interaction.followup.send(
             f'Added item {item} to player {game_player.player_discord_name}\'s inventory!',
             ephemeral=True)
 
-        player_mod_channel = await interaction.guild.fetch_channel(
-            game_player.player_mod_channel) if game_player.player_mod_channel is not None else None
+        player_mod_channel = await channel_resolver.resolve_channel(interaction.guild, game_player.player_mod_channel)
 
         if player_mod_channel is not None:
             for response in item_mod_responses:
@@ -187,33 +207,35 @@ class ActionItemManager(commands.Cog):
                                   item: str):
         log_interaction_call(interaction)
         await interaction.response.defer(ephemeral=True, thinking=True)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
         guild = interaction.guild
 
-        game_player = game.get_player(int(player))
-
-        if game_player is None:
-            await interaction.followup.send(f'Recipient player was not a valid choice!', ephemeral=True)
-            return
-
-        player_item = game_player.get_item(item)
-
-        if player_item is None:
-            await interaction.followup.send(f'Item {item} not defined in this game!', ephemeral=True)
+        async with gdm.mutate_game() as mutation:
+            game = mutation.game
+            game_player = game.get_player(int(player))
+            player_item = game_player.get_item(item) if game_player else None
+
+            if game_player is None:
+                rejection = f'Recipient player was not a valid choice!'
+            elif player_item is None:
+                rejection = f'Item {item} not defined in this game!'
+            else:
+                rejection = None
+                game_player.remove_item(player_item)
+                mutation.events.append(ItemMovedEvent(item_name=player_item.item_name,
+                                                      from_player_id=game_player.player_id))
+
+        if rejection is not None:
+            await interaction.followup.send(rejection, ephemeral=True)
             return
 
-        game_player.remove_item(player_item)
         item_mod_responses = await construct_item_transfer_display(action='lost', item=player_item, guild=guild,
                                                                    game=game)
 
-        await gdm.write_game(game=game)
-
         await interaction.followup.send(
             f'Remove item {item} from player {game_player.player_discord_name}\'s inventory!',
             ephemeral=True)
 
-        player_mod_channel = await interaction.guild.fetch_channel(
-            game_player.player_mod_channel) if game_player.player_mod_channel is not None else None
+        player_mod_channel = await channel_resolver.resolve_channel(interaction.guild, game_player.player_mod_channel)
 
         if player_mod_channel is not None:
             for response in item_mod_responses:
@@ -232,33 +254,38 @@ class ActionItemManager(commands.Cog):
                                     item: str):
         log_interaction_call(interaction)
         await interaction.response.defer(ephemeral=True, thinking=True)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
         guild = interaction.guild
 
-        sending_player = game.get_player(int(player))
-        receiving_player = game.get_player(int(recipient_player))
-
-        item_to_send = sending_player.get_item(item)
-
-        if item_to_send is None:
-            await interaction.followup.send(
-                f'Item {item} not found in the player {sending_player.player_discord_name}\'s inventory!',
-                ephemeral=True)
-        if receiving_player is None:
-            await interaction.followup.send(f'Recipient player was not a valid choice!', ephemeral=True)
-
-        sending_player.remove_item(item_to_send)
-        receiving_player.add_item(item_to_send)
-
-        await gdm.write_game(game=game)
+        async with gdm.mutate_game() as mutation:
+            game = mutation.game
+            sending_player = game.get_player(int(player))
+            receiving_player = game.get_player(int(recipient_player))
+
+            item_to_send = sending_player.get_item(item)
+
+            if item_to_send is None:
+                rejection = f'Item {item} not found in the player {sending_player.player_discord_name}\'s inventory!'
+            elif receiving_player is None:
+                rejection = f'Recipient player was not a valid choice!'
+            else:
+                rejection = None
+                sending_player.remove_item(item_to_send)
+                receiving_player.add_item(item_to_send)
+                mutation.events.append(ItemMovedEvent(item_name=item_to_send.item_name,
+                                                      from_player_id=sending_player.player_id,
+                                                      to_player_id=receiving_player.player_id))
+
+        if rejection is not None:
+            await interaction.followup.send(rejection, ephemeral=True)
+            return
 
         await interaction.followup.send(f'Sent item {item} to player {receiving_player.player_discord_name}!',
                                         ephemeral=True)
 
-        sending_player_mod_channel = await interaction.guild.fetch_channel(
-            sending_player.player_mod_channel) if sending_player.player_mod_channel is not None else None
-        receiving_player_mod_channel = await interaction.guild.fetch_channel(
-            receiving_player.player_mod_channel) if receiving_player.player_mod_channel is not None else None
+        sending_player_mod_channel = await channel_resolver.resolve_channel(
+            interaction.guild, sending_player.player_mod_channel)
+        receiving_player_mod_channel = await channel_resolver.resolve_channel(
+            interaction.guild, receiving_player.player_mod_channel)
 
         item_lost_formatted_responses = await construct_item_transfer_display(action='lost', item=item_to_send,
                                                                               guild=guild, game=game)
@@ -294,7 +321,7 @@ class ActionItemManager(commands.Cog):
 
     @app_commands.command(name="actions-available-view",
                           description="Displays all current actions you can use")
-    @app_commands.checks.cooldown(1, 5, key=lambda i: i.guild_id)
+    @rate_limit()
     async def actions_available_view(self,
                                      interaction: discord.Interaction):
         log_interaction_call(interaction)
@@ -366,30 +393,30 @@ class ActionItemManager(commands.Cog):
                                       uses_to_add: app_commands.Range[int, 1, 5]):
         log_interaction_call(interaction)
         await interaction.response.defer(ephemeral=True, thinking=True)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
         guild = interaction.guild
 
-        game_player = game.get_player(int(player))
-        player_action = game_player.get_action(action)
-
-        if game_player is None:
-            await interaction.followup.send(f'No valid player found with that identifier in the current game!')
-            return
-        if player_action is None:
-            await interaction.followup.send(
-                f'No action {action} could be found for the player {game_player.player_discord_name}!')
+        async with gdm.mutate_game() as mutation:
+            game = mutation.game
+            game_player = game.get_player(int(player))
+            player_action = game_player.get_action(action) if game_player else None
+
+            if game_player is None:
+                rejection = f'No valid player found with that identifier in the current game!'
+            elif player_action is None:
+                rejection = f'No action {action} could be found for the player {game_player.player_discord_name}!'
+            else:
+                rejection = None
+                player_action.action_uses = player_action.action_uses + uses_to_add
+
+        if rejection is not None:
+            await interaction.followup.send(rejection)
             return
 
-        player_action.action_uses = player_action.action_uses + uses_to_add
-
-        await gdm.write_game(game=game)
-
         formatted_responses = await construct_action_change_display(status='uses_increment', action=player_action,
                                                                     guild=guild,
                                                                     game=game, uses_changed=uses_to_add)
 
-        player_mod_channel = await interaction.guild.fetch_channel(
-            game_player.player_mod_channel) if game_player.player_mod_channel is not None else None
+        player_mod_channel = await channel_resolver.resolve_channel(interaction.guild, game_player.player_mod_channel)
         if player_mod_channel is not None:
             for response in formatted_responses:
                 await player_mod_channel.send(f'{response}')
@@ -410,33 +437,33 @@ class ActionItemManager(commands.Cog):
                                          uses_to_remove: app_commands.Range[int, 1, 5]):
         log_interaction_call(interaction)
         await interaction.response.defer(ephemeral=True, thinking=True)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
         guild = interaction.guild
 
-        game_player = game.get_player(int(player))
-        player_action = game_player.get_action(action)
-
-        if game_player is None:
-            await interaction.followup.send(f'No valid player found with that identifier in the current game!')
-            return
-        if player_action is None:
-            await interaction.followup.send(
-                f'No action {action} could be found for the player {game_player.player_discord_name}!')
+        async with gdm.mutate_game() as mutation:
+            game = mutation.game
+            game_player = game.get_player(int(player))
+            player_action = game_player.get_action(action) if game_player else None
+
+            if game_player is None:
+                rejection = f'No valid player found with that identifier in the current game!'
+            elif player_action is None:
+                rejection = f'No action {action} could be found for the player {game_player.player_discord_name}!'
+            else:
+                rejection = None
+                if player_action.action_uses <= uses_to_remove:
+                    player_action.action_uses = 0
+                else:
+                    player_action.action_uses = player_action.action_uses - uses_to_remove
+
+        if rejection is not None:
+            await interaction.followup.send(rejection)
             return
 
-        if player_action.action_uses <= uses_to_remove:
-            player_action.action_uses = 0
-        else:
-            player_action.action_uses = player_action.action_uses - uses_to_remove
-
-        await gdm.write_game(game=game)
-
         formatted_responses = await construct_action_change_display(status='uses_decrement', action=player_action,
                                                                     guild=guild,
                                                                     game=game, uses_changed=uses_to_remove)
 
-        player_mod_channel = await interaction.guild.fetch_channel(
-            game_player.player_mod_channel) if game_player.player_mod_channel is not None else None
+        player_mod_channel = await channel_resolver.resolve_channel(interaction.guild, game_player.player_mod_channel)
         if player_mod_channel is not None:
             for response in formatted_responses:
                 await player_mod_channel.send(f'{response}')
@@ -456,29 +483,31 @@ class ActionItemManager(commands.Cog):
                                  action: str):
         log_interaction_call(interaction)
         await interaction.response.defer(ephemeral=True, thinking=True)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
         guild = interaction.guild
 
-        game_player = game.get_player(int(player))
-
-        game_action = game.get_action(action)
+        async with gdm.mutate_game() as mutation:
+            game = mutation.game
+            game_player = game.get_player(int(player))
 
-        if game_player is None:
-            await interaction.followup.send(f'No valid player found with that identifier in the current game!')
-            return
-        if game_action is None:
-            await interaction.followup.send(f'No action {action} could be found in the current game!')
-            return
+            game_action = game.get_action(action)
 
-        game_player.add_action(game_action)
+            if game_player is None:
+                rejection = f'No valid player found with that identifier in the current game!'
+            elif game_action is None:
+                rejection = f'No action {action} could be found in the current game!'
+            else:
+                rejection = None
+                # The player gets their own copy, so using it never changes the catalog entry or other holders' copies
+                game_player.add_action(game_action.model_copy(deep=True))
 
-        await gdm.write_game(game=game)
+        if rejection is not None:
+            await interaction.followup.send(rejection)
+            return
 
         formatted_responses = await construct_action_change_display(status='gained', action=game_action, guild=guild,
                                                                     game=game)
 
-        player_mod_channel = await interaction.guild.fetch_channel(
-            game_player.player_mod_channel) if game_player.player_mod_channel is not None else None
+        player_mod_channel = await channel_resolver.resolve_channel(interaction.guild, game_player.player_mod_channel)
         if player_mod_channel is not None:
             for response in formatted_responses:
                 await player_mod_channel.send(f'{response}')
@@ -498,29 +527,28 @@ class ActionItemManager(commands.Cog):
         log_interaction_call(interaction)
         await interaction.response.defer(ephemeral=True, thinking=True)
         guild = interaction.guild
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
 
-        game_player = game.get_player(int(player))
-
-        if game_player is None:
-            await interaction.followup.send(f'No valid player found with that identifier in the current game!')
+        async with gdm.mutate_game() as mutation:
+            game = mutation.game
+            game_player = game.get_player(int(player))
+            player_action = game_player.get_action(action) if game_player else None
+
+            if game_player is None:
+                rejection = f'No valid player found with that identifier in the current game!'
+            elif player_action is None:
+                rejection = f'No action {action} could be found in the current game!'
+            else:
+                rejection = None
+                game_player.remove_action(player_action)
+
+        if rejection is not None:
+            await interaction.followup.send(rejection)
             return
 
-        player_action = game_player.get_action(action)
-
-        if player_action is None:
-            await interaction.followup.send(f'No action {action} could be found in the current game!')
-            return
-
-        game_player.remove_action(player_action)
-
-        await gdm.write_game(game=game)
-
         formatted_responses = await construct_action_change_display(status='lost', action=player_action, guild=guild,
                                                                     game=game)
 
-        player_mod_channel = await interaction.guild.fetch_channel(
-            game_player.player_mod_channel) if game_player.player_mod_channel is not None else None
+        player_mod_channel = await channel_resolver.resolve_channel(interaction.guild, game_player.player_mod_channel)
         if player_mod_channel is not None:
             for response in formatted_responses:
                 await player_mod_channel.send(f'{response}')
@@ -7,6 +7,7 @@ from discord.ext import commands
 from bot.model.conf_vars import ConfVars as Conf
 import bot.model.data_model as gdm
 from bot.botlogger.logging_manager import log_interaction_call, log_info
+from bot.utils.channel_resolver import channel_resolver
 from bot.utils.command_autocompletes import player_list_autocomplete, attribute_type_autocomplete
 from bot.utils.message_formatter import *
 
@@ -93,11 +94,15 @@ class AttributeManager(commands.Cog):
                                    attribute_amt: app_commands.Range[int, 1, 100]):
         log_interaction_call(interaction)
         await interaction.response.defer(ephemeral=True, thinking=True)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
         guild = interaction.guild
 
-        game_player = game.get_player(int(player))
-        attribute_to_modify = game_player.get_attribute(attribute_type)
+        async with gdm.mutate_game() as mutation:
+            game = mutation.game
+            game_player = game.get_player(int(player))
+            attribute_to_modify = game_player.get_attribute(attribute_type)
+
+            if attribute_to_modify is not None:
+                game_player.modify_attribute(attribute_name=attribute_type, amt=attribute_amt)
 
         if attribute_to_modify is None:
             await interaction.followup.send(
@@ -105,15 +110,11 @@ class AttributeManager(commands.Cog):
                 ephemeral=True)
             return
 
-        game_player.modify_attribute(attribute_name=attribute_type, amt=attribute_amt)
-
-        await gdm.write_game(game=game)
-
         await interaction.followup.send(f'Player attribute {attribute_type} increased by {attribute_amt} for '
                                         f'{game_player.player_discord_name}!', ephemeral=True)
 
-        game_player_mod_channel = await interaction.guild.fetch_channel(
-            game_player.player_mod_channel) if game_player.player_mod_channel is not None else None
+        game_player_mod_channel = await channel_resolver.resolve_channel(
+            interaction.guild, game_player.player_mod_channel)
 
         attribute_modified_response = await construct_attribute_modified_display(action='increased',
                                                                                  player_attribute=attribute_to_modify,
@@ -137,11 +138,15 @@ class AttributeManager(commands.Cog):
                                       attribute_amt: app_commands.Range[int, 1, 100]):
         log_interaction_call(interaction)
         await interaction.response.defer(ephemeral=True, thinking=True)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
         guild = interaction.guild
 
-        game_player = game.get_player(int(player))
-        attribute_to_modify = game_player.get_attribute(attribute_type)
+        async with gdm.mutate_game() as mutation:
+            game = mutation.game
+            game_player = game.get_player(int(player))
+            attribute_to_modify = game_player.get_attribute(attribute_type)
+
+            if attribute_to_modify is not None:
+                game_player.modify_attribute(attribute_name=attribute_type, amt=-attribute_amt)
 
         if attribute_to_modify is None:
             await interaction.followup.send(
@@ -149,15 +154,11 @@ class AttributeManager(commands.Cog):
                 ephemeral=True)
             return
 
-        game_player.modify_attribute(attribute_name=attribute_type, amt=-attribute_amt)
-
-        await gdm.write_game(game=game)
-
         await interaction.followup.send(f'Player attribute {attribute_type} decreased by {attribute_amt} for '
                                         f'{game_player.player_discord_name}!', ephemeral=True)
 
-        game_player_mod_channel = await interaction.guild.fetch_channel(
-            game_player.player_mod_channel) if game_player.player_mod_channel is not None else None
+        game_player_mod_channel = await channel_resolver.resolve_channel(
+            interaction.guild, game_player.player_mod_channel)
 
         attribute_modified_response = await construct_attribute_modified_display(action='decreased',
                                                                                  player_attribute=attribute_to_modify,
@@ -7,6 +7,7 @@ from discord.ext import commands
 from typing import Literal, Optional
 from bot.model.conf_vars import ConfVars as Conf
 from bot.botlogger.logging_manager import log_interaction_call, log_info
+from bot.utils.rate_limiter import rate_limit
 import random
 
 
@@ -16,7 +17,7 @@ class DiceManager(commands.Cog):
 
     @app_commands.command(name="roll-dice",
                           description="Rolls dice with a specified number of sides with optional modifier")
-    @app_commands.checks.cooldown(1, 5, key=lambda i: i.guild_id)
+    @rate_limit()
     async def roll_dice(self, interaction: discord.Interaction,
                         dice_to_roll: Literal[1, 2, 3, 4, 5],
                         die_faces: Literal[2, 4, 6, 8, 10, 12, 20],
@@ -4,26 +4,41 @@
 import discord
 from discord.ext import commands
 from discord import Guild
+from typing import Sequence
 from bot.model.conf_vars import ConfVars as Conf
 from bot.botlogger.logging_manager import log_info
 
 guild_emoji_map = {}
+# Set once the map has been loaded; a guild without custom emojis legitimately has an empty map
+guild_emoji_map_populated = False
+# Bumped whenever the emoji map changes, so that matchers compiled from an older map are rebuilt
+guild_emoji_version = 0
 
 async def populate_guild_emojis(guild: Guild) -> dict[str, str]:
+    global guild_emoji_version, guild_emoji_map_populated
     guild_emojis = guild.emojis
 
-    for emoji in guild_emojis:
-        guild_emoji_map[f":{emoji.name}:"] = f"<:{emoji.name}:{emoji.id}>"
+    # Rebuilt from scratch so that deleted and renamed emojis do not linger
+    new_emoji_map = {f":{emoji.name}:": f"<:{emoji.name}:{emoji.id}>" for emoji in guild_emojis}
+    if new_emoji_map != guild_emoji_map:
+        guild_emoji_map.clear()
+        guild_emoji_map.update(new_emoji_map)
+        guild_emoji_version += 1
+    guild_emoji_map_populated = True
 
     return guild_emoji_map
 
 async def get_guild_emojis(guild: Guild) -> dict[str, str]:
-    if not guild_emoji_map:
-        log_info(f'Guild emoji map was not populated; repopulating now')
+    if not guild_emoji_map_populated:
+        log_info(f'Guild emoji map was not populated; populating now')
         await populate_guild_emojis(guild)
     return guild_emoji_map
 
 
+def get_guild_emoji_version() -> int:
+    return guild_emoji_version
+
+
 class EmojiManager(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
@@ -36,6 +51,15 @@ class EmojiManager(commands.Cog):
 
         log_info(f'Custom Emoji mappings loaded for guild {guild.name}')
 
+    @commands.Cog.listener()
+    async def on_guild_emojis_update(self, guild: Guild, before: Sequence[discord.Emoji],
+                                     after: Sequence[discord.Emoji]):
+        if guild.id != Conf.GUILD_ID:
+            return
+        await populate_guild_emojis(guild=guild)
+
+        log_info(f'Custom Emoji mappings reloaded for guild {guild.name}; {len(guild_emoji_map)} emojis')
+
 
 async def setup(bot: commands.Bot) -> None:
     cog = EmojiManager(bot)
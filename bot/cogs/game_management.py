@@ -11,6 +11,13 @@ import bot.model.data_model as gdm
 from bot.model.data_model import Game, Action, Item, Player, Party, Round, Dilemma, Resource, ResourceCost, Attribute, \
     AttributeModifier, ResourceDefinition, AttributeDefinition, ItemTypeDefinition, Skill, StatusModifier
 from bot.botlogger.logging_manager import log_interaction_call, log_info
+from bot.utils.channel_resolver import channel_resolver
+from bot.utils.member_resolver import member_resolver
+from bot.utils.report_refresher import report_refresher
+from bot.utils.rate_limiter import rate_limiter
+from bot.utils.command_autocompletes import autocomplete_flights
+from bot.utils.fragment_cache import fragment_cache
+from bot.utils.view_refresher import view_refresher
 
 
 class GameManager(commands.Cog):
@@ -64,10 +71,12 @@ class GameManager(commands.Cog):
 
         # If generate channels is enabled, generate channels for players and parties, if they are defined
         if generate_channels:
-            category_channel = await interaction.guild.fetch_channel(Conf.MOD_CATEGORY)
+            category_channel = await channel_resolver.resolve_channel(interaction.guild, Conf.MOD_CATEGORY)
+            discord_members = await member_resolver.resolve_members(interaction.guild,
+                                                                    [player.player_id for player in players])
 
             for player in players:
-                discord_member = await interaction.guild.fetch_member(player.player_id)
+                discord_member = discord_members[player.player_id]
                 if player.player_mod_channel is None:
                     overwrites = {
                         interaction.guild.default_role: discord.PermissionOverwrite(read_messages=False),
@@ -80,7 +89,7 @@ class GameManager(commands.Cog):
                                                                               category=category_channel)
                     player.player_mod_channel = mod_channel.id
 
-            private_chat_channel = await interaction.guild.fetch_channel(Conf.PRIVATE_CHAT_CATEGORY)
+            private_chat_channel = await channel_resolver.resolve_channel(interaction.guild, Conf.PRIVATE_CHAT_CATEGORY)
             for party in parties:
                 if party.channel_id is None:
                     overwrites = {
@@ -93,11 +102,11 @@ class GameManager(commands.Cog):
                                                                                 category=private_chat_channel)
                     party.channel_id = party_channel.id
                 else:
-                    party_channel = await interaction.guild.fetch_channel(party.channel_id)
+                    party_channel = await channel_resolver.resolve_channel(interaction.guild, party.channel_id)
 
                 for player_id in party.player_ids:
                     party_player = player_map[player_id]
-                    party_member = await interaction.guild.fetch_member(player_id)
+                    party_member = await member_resolver.resolve_member(interaction.guild, player_id)
                     await party_channel.set_permissions(party_member, read_messages=True, send_messages=True,
                                                         read_message_history=True)
                     await party_channel.send(f'**{party_player.player_discord_name}** has joined {party.party_name}!')
@@ -107,7 +116,7 @@ class GameManager(commands.Cog):
                     resource_definitions=res_defs, item_type_definitions=item_type_defs, skills=skills,
                     status_modifiers=status_mods, actions=actions, items=items, pi_views=[])
 
-        await gdm.write_game(game=game)
+        await gdm.write_new_game(game=game)
 
         await interaction.followup.send(f'Initialized a new game at file location {Conf.GAME_PATH}')
 
@@ -118,18 +127,16 @@ class GameManager(commands.Cog):
                                   interaction: discord.Interaction):
         log_interaction_call(interaction)
 
-        game = gdm.read_json_to_dom(filepath=Conf.GAME_PATH)
-
         # TODO: Check if game exists, if it doesn't fail out
 
         actions = await gdm.read_actions_file(Conf.ACTION_PATH) if Conf.ACTION_PATH else []
 
-        game.actions = actions
+        async with gdm.mutate_game() as mutation:
+            mutation.game.actions = actions
+            mutation.catalog_changed = True
 
         # TODO: Iterate over players and also update their values (but not uses!)
 
-        await gdm.write_game(game=game)
-
         await interaction.response.send_message(f'Updated game actions!')
 
     @app_commands.command(name="update-game-items",
@@ -139,18 +146,16 @@ class GameManager(commands.Cog):
                                 interaction: discord.Interaction):
         log_interaction_call(interaction)
 
-        game = gdm.read_json_to_dom(filepath=Conf.GAME_PATH)
-
         # TODO: Check if game exists, if it doesn't fail out
 
         items = await gdm.read_items_file(Conf.ITEM_PATH) if Conf.ITEM_PATH else []
 
-        game.items = items
+        async with gdm.mutate_game() as mutation:
+            mutation.game.items = items
+            mutation.catalog_changed = True
 
         # TODO: Iterate over players and also update their values (but not uses!)
 
-        await gdm.write_game(game=game)
-
         await interaction.response.send_message(f'Updated game items!')
 
     @app_commands.command(name="toggle-game-active-state",
@@ -160,11 +165,10 @@ class GameManager(commands.Cog):
                                        interaction: discord.Interaction,
                                        is_active: Literal['True', 'False']):
         log_interaction_call(interaction)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
 
-        game.is_active = True if is_active == 'True' else False
+        async with gdm.mutate_game() as mutation:
+            mutation.game.is_active = True if is_active == 'True' else False
 
-        await gdm.write_game(game=game)
         await interaction.response.send_message(f'Game active state has been set to {is_active}!', ephemeral=True)
 
     @app_commands.command(name="party-toggle-lock-state",
@@ -174,11 +178,10 @@ class GameManager(commands.Cog):
                                       interaction: discord.Interaction,
                                       is_locked: Literal['True', 'False']):
         log_interaction_call(interaction)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
 
-        game.parties_locked = True if is_locked == 'True' else False
+        async with gdm.mutate_game() as mutation:
+            mutation.game.parties_locked = True if is_locked == 'True' else False
 
-        await gdm.write_game(game=game)
         await interaction.response.send_message(f'Player party lock status set to {is_locked}!', ephemeral=True)
 
     @app_commands.command(name="items-toggle-lock-state",
@@ -188,11 +191,10 @@ class GameManager(commands.Cog):
                                       interaction: discord.Interaction,
                                       is_locked: Literal['True', 'False']):
         log_interaction_call(interaction)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
 
-        game.items_locked = True if is_locked == 'True' else False
+        async with gdm.mutate_game() as mutation:
+            mutation.game.items_locked = True if is_locked == 'True' else False
 
-        await gdm.write_game(game=game)
         await interaction.response.send_message(f'Item transfer lock status set to {is_locked}!', ephemeral=True)
 
     @app_commands.command(name="voting-toggle-lock-state",
@@ -202,11 +204,10 @@ class GameManager(commands.Cog):
                                        interaction: discord.Interaction,
                                        is_locked: Literal['True', 'False']):
         log_interaction_call(interaction)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
 
-        game.voting_locked = True if is_locked == 'True' else False
+        async with gdm.mutate_game() as mutation:
+            mutation.game.voting_locked = True if is_locked == 'True' else False
 
-        await gdm.write_game(game=game)
         await interaction.response.send_message(f'Voting lock status set to {is_locked}!', ephemeral=True)
 
     @app_commands.command(name="resources-toggle-lock-state",
@@ -216,13 +217,93 @@ class GameManager(commands.Cog):
                                           interaction: discord.Interaction,
                                           is_locked: Literal['True', 'False']):
         log_interaction_call(interaction)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
 
-        game.resources_locked = True if is_locked == 'True' else False
+        async with gdm.mutate_game() as mutation:
+            mutation.game.resources_locked = True if is_locked == 'True' else False
 
-        await gdm.write_game(game=game)
         await interaction.response.send_message(f'Resources lock status set to {is_locked}!', ephemeral=True)
 
+    @app_commands.command(name="game-cache-stats",
+                          description="Displays counters for the game cache, reports and views, Discord lookups, rendering and rate limits")
+    @app_commands.default_permissions(manage_guild=True)
+    async def game_cache_stats(self,
+                               interaction: discord.Interaction):
+        log_interaction_call(interaction)
+
+        cache_stats = gdm.game_store.stats()
+        report_stats = report_refresher.stats()
+        view_stats = view_refresher.stats()
+        channel_stats = channel_resolver.stats()
+        member_stats = member_resolver.stats()
+        autocomplete_stats = autocomplete_flights.stats()
+        fragment_stats = fragment_cache.stats()
+        fragment_lookups = fragment_stats["hits"] + fragment_stats["misses"]
+        fragment_hit_rate = fragment_stats["hits"] / fragment_lookups if fragment_lookups else 0.0
+        formatted_rate_limits = ', '.join(f'{command_name} {counts["rejected"]}/{counts["allowed"] + counts["rejected"]}'
+                                          for command_name, counts in rate_limiter.stats().items()) or 'none'
+
+        await interaction.response.send_message(f'Game cache hits: {cache_stats["hits"]}, '
+                                                f'misses: {cache_stats["misses"]}, '
+                                                f'flushes: {cache_stats["flushes"]}, '
+                                                f'coalesced writes: {cache_stats["coalesced_writes"]}\n'
+                                                f'Vote report edits requested: {report_stats["requested_edits"]}, '
+                                                f'performed: {report_stats["performed_edits"]}, '
+                                                f'failed: {report_stats["failed_edits"]}, '
+                                                f'saved: {report_stats["saved_edits"]}\n'
+                                                f'Persistent view message edits performed: {view_stats["performed_edits"]}, '
+                                                f'skipped as unchanged: {view_stats["skipped_edits"]}\n'
+                                                f'Channel lookups from cache: {channel_stats["cache_hits"]}, '
+                                                f'REST fetches: {channel_stats["rest_fetches"]}\n'
+                                                f'Member lookups from cache: {member_stats["cache_hits"]}, '
+                                                f'REST fetches: {member_stats["rest_fetches"]}\n'
+                                                f'Autocompletes computed: {autocomplete_stats["computed_calls"]}, '
+                                                f'shared in flight: {autocomplete_stats["shared_calls"]}, '
+                                                f'memoized: {autocomplete_stats["memo_hits"]}\n'
+                                                f'Rendered fragments reused: {fragment_stats["hits"]}/{fragment_lookups} '
+                                                f'({fragment_hit_rate:.0%}), '
+                                                f'cached: {fragment_stats["entries"]} ({fragment_stats["bytes"]} bytes), '
+                                                f'evicted: {fragment_stats["evictions"]}\n'
+                                                f'Rate limit rejections (rejected/total): {formatted_rate_limits}',
+                                                ephemeral=True)
+
+    @app_commands.command(name="game-checkpoint",
+                          description="Forces any pending game changes to be written to the game file")
+    @app_commands.default_permissions(manage_guild=True)
+    async def game_checkpoint(self,
+                              interaction: discord.Interaction):
+        log_interaction_call(interaction)
+
+        await gdm.flush_game()
+
+        await interaction.response.send_message(f'Game state checkpointed to {Conf.GAME_PATH}!', ephemeral=True)
+
+    @app_commands.command(name="game-migrate-storage",
+                          description="Copies the current game into a different storage backend")
+    @app_commands.default_permissions(manage_guild=True)
+    async def game_migrate_storage(self,
+                                   interaction: discord.Interaction,
+                                   target_backend: Literal['json', 'sqlite'],
+                                   target_file: str):
+        log_interaction_call(interaction)
+
+        target_path = f'{Conf.BASE_PATH}/{target_file}'
+        if os.path.abspath(target_path) == os.path.abspath(Conf.GAME_PATH):
+            await interaction.response.send_message(f'Target file must differ from the active game file!',
+                                                    ephemeral=True)
+            return
+
+        # Make sure journaled or write-behind changes are part of the copy
+        await gdm.flush_game()
+        game = await gdm.get_game(file_path=Conf.GAME_PATH)
+
+        target_storage = gdm.get_storage_backend(target_backend)
+        await gdm.game_store.run_io(target_storage.save_dump, target_storage.dump(game=game, file_path=target_path),
+                                    target_path)
+
+        await interaction.response.send_message(f'Copied game to {target_path} using the {target_backend} backend. '
+                                                f'Set GAME_FILE={target_file} and STORAGE_BACKEND={target_backend} '
+                                                f'and restart the bot to switch over.', ephemeral=True)
+
     @app_commands.command(name="clear-messages",
                           description="Clears up to 100 messages out of a discord channel")
     @app_commands.default_permissions(manage_guild=True)
@@ -1,11 +1,11 @@
 import discord
-import time
 from discord import app_commands
 from discord.ext import commands
 from bot.model.conf_vars import ConfVars as Conf
 import bot.model.data_model as gdm
 from bot.model.data_model import PersistentInteractableView
 from bot.botlogger.logging_manager import log_interaction_call, log_info
+from bot.utils.view_refresher import view_refresher, hash_view_pages
 from bot.utils.message_formatter import *
 import bot.utils.object_filtering_util as filter_util
 
@@ -35,25 +35,11 @@ class ItemViewButtons(discord.ui.View):
                                           guild: Guild, game: Game, items: list[Item], button: discord.ui.Button):
         formatted_responses: list[str] = await construct_item_display(guild=guild, game=game, items=items)
 
-        item_pi_view = game.get_pi_view(item_pi_view_name)
-        channel = await guild.fetch_channel(item_pi_view.channel_id)
-
-        i = 0
-        while i < len(item_pi_view.message_ids):
-            msg_id = item_pi_view.message_ids[i]
-            msg = await channel.fetch_message(msg_id)
-            time.sleep(1)
-            if i < len(formatted_responses):
-                await msg.edit(content=formatted_responses[i])
-            else:
-                await msg.edit(content=".")
-            time.sleep(1)
-            i += 1
+        await view_refresher.refresh_view(guild=guild, view_name=item_pi_view_name, pages=formatted_responses)
 
         for view_child in self.children:
             if type(view_child) == discord.ui.Button and view_child is not button:
                 view_child.disabled = False
-        time.sleep(2)
         await interaction.message.edit(content=initial_message_content, view=self)
         await interaction.followup.send("Update complete!")
 
@@ -151,12 +137,22 @@ class ItemPersistentInteractiveView(commands.Cog):
         button_message = await item_view_channel.send("Use the buttons below to filter the action list.",
                                                       view=ItemViewButtons())
 
-        game.pi_views.append(PersistentInteractableView(view_name=item_pi_view_name,
-                                                        channel_id=item_view_channel.id,
-                                                        message_ids=msg_channel_ids,
-                                                        button_msg_id=button_message.id))
-
-        await gdm.write_game(game=game)
+        # The messages are sent outside of the mutation, so the view name is checked again before it is recorded
+        async with gdm.mutate_game() as mutation:
+            view_created = mutation.game.get_pi_view(item_pi_view_name) is None
+            if view_created:
+                mutation.game.add_pi_view(PersistentInteractableView(view_name=item_pi_view_name,
+                                                                     channel_id=item_view_channel.id,
+                                                                     message_ids=msg_channel_ids,
+                                                                     button_msg_id=button_message.id,
+                                                                     message_hashes=hash_view_pages(
+                                                                         len(msg_channel_ids), formatted_responses)))
+
+        if not view_created:
+            await interaction.followup.send(f'Persistent View with name {item_pi_view_name} was created while this '
+                                            f'command ran! The messages just sent are not part of it.',
+                                            ephemeral=True)
+            return
 
         await interaction.followup.send(f'Created persistent view in channel {item_view_channel.name} for Items!')
 
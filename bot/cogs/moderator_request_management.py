@@ -7,12 +7,14 @@ from discord.ext import commands
 from bot.model.conf_vars import ConfVars as Conf
 import bot.model.data_model as gdm
 from bot.botlogger.logging_manager import log_interaction_call, log_info
+from bot.utils.rate_limiter import rate_limit
+from bot.utils.channel_resolver import channel_resolver
 from bot.utils.command_autocompletes import player_action_autocomplete, game_action_autocomplete
 from bot.utils.message_formatter import *
 
 
 async def send_message_to_moderator(message: str, guild: Guild):
-    mod_request_channel = await guild.fetch_channel(Conf.REQUEST_CHANNEL)
+    mod_request_channel = await channel_resolver.resolve_channel(guild, Conf.REQUEST_CHANNEL)
 
     formatted_request = f'<@&{Conf.MOD_ROLE_ID}>\n'
     formatted_request += f'{message}\n'
@@ -26,13 +28,13 @@ class ModRequestManager(commands.Cog):
 
     @app_commands.command(name="mod-request",
                           description="Send a request to the moderator through a private channel")
-    @app_commands.checks.cooldown(1, 5, key=lambda i: i.guild_id)
+    @rate_limit()
     async def moderator_request(self, interaction: discord.Interaction,
                                 request: str):
         log_interaction_call(interaction)
         game = await gdm.get_game(Conf.GAME_PATH)
 
-        mod_request_channel = await interaction.guild.fetch_channel(Conf.REQUEST_CHANNEL)
+        mod_request_channel = await channel_resolver.resolve_channel(interaction.guild, Conf.REQUEST_CHANNEL)
 
         requesting_player = game.get_player(interaction.user.id)
 
@@ -51,7 +53,7 @@ class ModRequestManager(commands.Cog):
 
     @app_commands.command(name="action-submission",
                           description="Submit an action to be performed to the moderator")
-    @app_commands.checks.cooldown(1, 5, key=lambda i: i.guild_id)
+    @rate_limit()
     @app_commands.describe(target1="Optional - First chosen target for action (free-form text field)")
     @app_commands.rename(target1="first-target")
     @app_commands.describe(target2="Optional - Second chosen target for action (free-form text field)")
@@ -72,7 +74,7 @@ class ModRequestManager(commands.Cog):
         game = await gdm.get_game(Conf.GAME_PATH)
         guild = interaction.guild
 
-        mod_request_channel = await interaction.guild.fetch_channel(Conf.REQUEST_CHANNEL)
+        mod_request_channel = await channel_resolver.resolve_channel(interaction.guild, Conf.REQUEST_CHANNEL)
 
         requesting_player = game.get_player(interaction.user.id)
 
@@ -83,48 +85,61 @@ class ModRequestManager(commands.Cog):
         elif requesting_player.is_dead:
             await interaction.followup.send(f'You are dead! Begone apparition!', ephemeral=True)
             return
+        elif requesting_player.get_action(action_name=action) is None:
+            await interaction.followup.send(f'You do not have the action {action}!', ephemeral=True)
+            return
         else:
-            # Here is where we deduct uses and pay costs automatically
-            player_action = requesting_player.get_action(action_name=action)
-
-            # Actions with -1 uses are unlimited
-            if player_action.action_uses != -1:
-                # Actions with non -1 value uses have limited uses; players must have remaining uses to submit the action
-                if player_action.action_uses > 0:
-                    player_action.action_uses = player_action.action_uses - 1
-                else:
-                    await interaction.followup.send(f'You do not have any remaining uses for this action!',
-                                                    ephemeral=True)
-                    return
-
-            # Actions with an empty costs list have no associated costs and can be used freely
-            if player_action.action_costs:
-                for action_cost in player_action.action_costs:
+            # Uses and costs are checked and deducted as one step, so concurrent submissions cannot both spend them
+            async with gdm.mutate_game() as mutation:
+                game = mutation.game
+                requesting_player = game.get_player(interaction.user.id)
+                # The action may have been taken away while this submission was waiting for the lock
+                player_action = requesting_player.get_action(action_name=action)
+                rejection = None
+                insufficient_resources = False
+
+                if player_action is None:
+                    rejection = f'You do not have the action {action}!'
+                # Actions with -1 uses are unlimited; limited actions need remaining uses to be submitted
+                elif player_action.action_uses != -1 and player_action.action_uses <= 0:
+                    rejection = f'You do not have any remaining uses for this action!'
+
+                # Actions with an empty costs list have no associated costs and can be used freely
+                for action_cost in player_action.action_costs if rejection is None else []:
                     player_resource = requesting_player.get_resource(action_cost.res_name)
                     if not player_resource:
-                        await interaction.followup.send(f'Could not find resource {action_cost.res_name} for '
-                                                        f'player! Please contact the game moderator!')
-                        return
-                    # First, verify the player can actually pay the costs
+                        rejection = f'Could not find resource {action_cost.res_name} for player! ' \
+                                    f'Please contact the game moderator!'
+                        break
+                    # If costs cannot be paid, the action submission is rejected with reasoning
                     if player_resource.resource_amt < action_cost.amount:
-                        # If costs cannot be paid, reject the action submission with reasoning
-                        ins_res_msg = await insufficient_resources_msg(action=player_action,
-                                                                       player=requesting_player,
-                                                                       game=game,
-                                                                       guild=guild)
-                        await interaction.followup.send(ins_res_msg)
-                        return
-                    else:
-                        # If costs can be paid, update player resources to the new value
+                        insufficient_resources = True
+                        break
+
+                if rejection is None and not insufficient_resources:
+                    if player_action.action_uses != -1:
+                        player_action.action_uses = player_action.action_uses - 1
+                    for action_cost in player_action.action_costs:
+                        player_resource = requesting_player.get_resource(action_cost.res_name)
                         player_resource.resource_amt = player_resource.resource_amt - action_cost.amount
 
-            await gdm.write_game(game)
+            if rejection is not None:
+                await interaction.followup.send(rejection, ephemeral=True)
+                return
+            if insufficient_resources:
+                ins_res_msg = await insufficient_resources_msg(action=player_action,
+                                                               player=requesting_player,
+                                                               game=game,
+                                                               guild=guild)
+                await interaction.followup.send(ins_res_msg)
+                return
 
             await interaction.followup.send(f'Submitted request for action **{action}** to the moderator!',
                                             ephemeral=True)
 
             # Inform the player of their new resource values:
-            player_moderator_channel = await guild.fetch_channel(requesting_player.player_mod_channel)
+            player_moderator_channel = await channel_resolver.resolve_channel(
+                guild, requesting_player.player_mod_channel)
             if player_moderator_channel:
                 if player_action.action_costs:
                     formatted_resources = await construct_player_resources_display(player=requesting_player, guild=guild, game=game)
@@ -147,7 +162,7 @@ class ModRequestManager(commands.Cog):
 
     @app_commands.command(name="level-up",
                           description="Submit level up requests to the moderator here.")
-    @app_commands.checks.cooldown(1, 5, key=lambda i: i.guild_id)
+    @rate_limit()
     @app_commands.autocomplete(action=game_action_autocomplete)
     async def level_up(self, interaction: discord.Interaction,
                        action: str,
@@ -157,7 +172,7 @@ class ModRequestManager(commands.Cog):
         log_interaction_call(interaction)
         game = await gdm.get_game(Conf.GAME_PATH)
 
-        mod_request_channel = await interaction.guild.fetch_channel(Conf.REQUEST_CHANNEL)
+        mod_request_channel = await channel_resolver.resolve_channel(interaction.guild, Conf.REQUEST_CHANNEL)
 
         requesting_player = game.get_player(interaction.user.id)
 
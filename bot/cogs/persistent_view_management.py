@@ -5,6 +5,7 @@ from bot.model.conf_vars import ConfVars as Conf
 import bot.model.data_model as gdm
 from bot.model.data_model import PersistentInteractableView
 from bot.botlogger.logging_manager import log_interaction_call, log_info
+from bot.utils.channel_resolver import channel_resolver
 from bot.utils.command_autocompletes import persistent_view_autocomplete
 
 
@@ -30,19 +31,18 @@ class PersistentViewManager(commands.Cog):
             interaction.response.send_message(f"No persistent view with name {view_name} could be found!")
             return
 
-        view_channel = await guild.fetch_channel(pi_view.channel_id)
+        view_channel = await channel_resolver.resolve_channel(guild, pi_view.channel_id)
         if not view_channel:
             interaction.response.send_message(f"Problem retrieving channel from guild with id {pi_view.channel_id}!")
             return
 
         for message_id in pi_view.message_ids:
-            msg = await view_channel.fetch_message(message_id)
-            if msg:
-                await msg.delete()
+            msg = await channel_resolver.resolve_message(guild, pi_view.channel_id, message_id)
+            await msg.delete()
 
         # Remove the persistent view from the game object by name
-        game.remove_pi_view(view_name)
-        await gdm.write_game(game)
+        async with gdm.mutate_game() as mutation:
+            mutation.game.remove_pi_view(view_name)
 
         await interaction.followup.send(f'Deleted persistent view {view_name}!')
 
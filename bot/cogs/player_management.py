@@ -8,7 +8,11 @@ from bot.model.conf_vars import ConfVars as Conf
 from bot.model.data_model import Game, Player, Round, Vote, Party, Dilemma
 from typing import Literal, Optional
 import bot.model.data_model as gdm
+from bot.model.game_journal import PlayerKilledEvent
 from bot.botlogger.logging_manager import log_interaction_call, log_info
+from bot.utils.rate_limiter import rate_limit
+from bot.utils.channel_resolver import channel_resolver
+from bot.utils.member_resolver import member_resolver
 from bot.utils.command_autocompletes import player_list_autocomplete, party_list_autocomplete
 from bot.cogs.moderator_request_management import send_message_to_moderator as modmsg
 import random
@@ -36,7 +40,7 @@ class PlayerManager(commands.Cog):
                 player: discord.PermissionOverwrite(read_messages=True)
             }
 
-            category_channel = await interaction.guild.fetch_channel(Conf.MOD_CATEGORY)
+            category_channel = await channel_resolver.resolve_channel(interaction.guild, Conf.MOD_CATEGORY)
             mod_channel = await interaction.guild.create_text_channel(name=channel_name, overwrites=overwrites,
                                                                       category=category_channel)
 
@@ -45,8 +49,16 @@ class PlayerManager(commands.Cog):
                                 player_mod_channel=mod_channel.id,
                                 player_attributes=[],
                                 player_actions=[])
-            game.add_player(new_player)
-            await gdm.write_game(game=game)
+            # The player is looked up again under the game lock, as it may have been added while the channel was created
+            async with gdm.mutate_game() as mutation:
+                already_added = mutation.game.get_player(player.id) is not None
+                if not already_added:
+                    mutation.game.add_player(new_player)
+
+            if already_added:
+                await interaction.response.send_message(
+                    f'Player {player.name} was added to the game while this command ran!', ephemeral=True)
+                return
             await interaction.response.send_message(f'Added player {player.name} to game!', ephemeral=True)
         else:
             await interaction.response.send_message(f'Failed to add {player.name} to game!', ephemeral=True)
@@ -60,16 +72,17 @@ class PlayerManager(commands.Cog):
                           player: str,
                           dead: Literal['True', 'False']):
         log_interaction_call(interaction)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
 
-        this_player = game.get_player(int(player))
+        async with gdm.mutate_game() as mutation:
+            this_player = mutation.game.get_player(int(player))
+            if this_player is not None:
+                this_player.is_dead = True if dead == 'True' else False
+                mutation.events.append(PlayerKilledEvent(player_id=this_player.player_id, is_dead=this_player.is_dead))
+
         if this_player is None:
             await interaction.response.send_message(f'The selected player is not currently defined in this game!',
                                                     ephemeral=True)
         else:
-            this_player.is_dead = True if dead == 'True' else False
-
-            await gdm.write_game(game=game)
             await interaction.response.send_message(f'Set alive status of {this_player.player_discord_name} to {dead}!',
                                                     ephemeral=True)
 
@@ -108,10 +121,9 @@ class PlayerManager(commands.Cog):
                            party_name: str,
                            party_max_size: int):
         log_interaction_call(interaction)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
 
         guild = interaction.guild
-        category_channel = await guild.fetch_channel(Conf.PRIVATE_CHAT_CATEGORY)
+        category_channel = await channel_resolver.resolve_channel(guild, Conf.PRIVATE_CHAT_CATEGORY)
 
         overwrites = {
             interaction.guild.default_role: discord.PermissionOverwrite(read_messages=False)
@@ -121,9 +133,9 @@ class PlayerManager(commands.Cog):
                                                         category=category_channel)
 
         party = Party(player_ids=set(), max_size=party_max_size, channel_id=party_channel.id, party_name=party_name)
-        game.add_party(party)
+        async with gdm.mutate_game() as mutation:
+            mutation.game.add_party(party)
 
-        await gdm.write_game(game=game)
         await interaction.response.send_message(f'Created new party {party_name}!', ephemeral=True)
 
     @app_commands.command(name="add-party-player",
@@ -148,30 +160,36 @@ class PlayerManager(commands.Cog):
             await interaction.response.send_message(f'Could not find a player with that identifier!', ephemeral=True)
             return
 
-        if game_party.max_size != -1 and len(game_party.player_ids) >= game_party.max_size:
+        async with gdm.mutate_game() as mutation:
+            game = mutation.game
+            game_party = game.get_party(int(party))
+            game_player = game.get_player(int(player))
+            party_full = game_party.max_size != -1 and len(game_party.player_ids) >= game_party.max_size
+            existing_party = game.get_player_party(game_player)
+
+            if not party_full:
+                if existing_party is not None:
+                    existing_party.remove_player(game_player)
+                game_party.add_player(game_player)
+
+        if party_full:
             await interaction.response.send_message(f'Party size is already at max size of {game_party.max_size}!',
                                                     ephemeral=True)
             return
 
         guild = interaction.guild
-        party_channel = await guild.fetch_channel(game_party.channel_id)
-        player_user = await guild.fetch_member(game_player.player_id)
-
-        existing_party = game.get_player_party(game_player)
+        party_channel = await channel_resolver.resolve_channel(guild, game_party.channel_id)
+        player_user = await member_resolver.resolve_member(guild, game_player.player_id, interaction)
 
         if existing_party is not None:
-            existing_party_channel = await guild.fetch_channel(existing_party.channel_id)
+            existing_party_channel = await channel_resolver.resolve_channel(guild, existing_party.channel_id)
             await existing_party_channel.set_permissions(player_user, read_messages=False, send_messages=False,
                                                          read_message_history=False)
             await existing_party_channel.send(f'**{game_player.player_discord_name}** has left {existing_party.party_name}!')
-            existing_party.remove_player(game_player)
-
-        game_party.add_player(game_player)
 
         await party_channel.set_permissions(player_user, read_messages=True, send_messages=True,
                                             read_message_history=True)
 
-        await gdm.write_game(game=game)
         await interaction.response.send_message(
             f'Added player {game_player.player_discord_name} to party {game_party.party_name}!', ephemeral=True)
         await party_channel.send(f'**{game_player.player_discord_name}** has joined {game_party.party_name}!')
@@ -191,7 +209,10 @@ class PlayerManager(commands.Cog):
             await interaction.response.send_message(f'Could not find a player with that identifier!', ephemeral=True)
             return
 
-        game_party = game.get_player_party(game_player)
+        async with gdm.mutate_game() as mutation:
+            game_party = mutation.game.get_player_party(game_player)
+            if game_party is not None:
+                game_party.remove_player(game_player)
 
         if game_party is None:
             await interaction.response.send_message(
@@ -199,22 +220,19 @@ class PlayerManager(commands.Cog):
             return
 
         guild = interaction.guild
-        party_channel = await guild.fetch_channel(game_party.channel_id)
-        player_user = await guild.fetch_member(game_player.player_id)
-
-        game_party.remove_player(game_player)
+        party_channel = await channel_resolver.resolve_channel(guild, game_party.channel_id)
+        player_user = await member_resolver.resolve_member(guild, game_player.player_id, interaction)
 
         await party_channel.set_permissions(player_user, read_messages=False, send_messages=False,
                                             read_message_history=False)
 
-        await gdm.write_game(game=game)
         await interaction.response.send_message(
             f'Removed player {game_player.player_discord_name} from party {game_party.party_name}!', ephemeral=True)
         await party_channel.send(f'**{game_player.player_discord_name}** has left {game_party.party_name}!')
 
     @app_commands.command(name="join-party",
                           description="Allows a player to join a party and manages text channel permissions")
-    @app_commands.checks.cooldown(1, 5, key=lambda i: i.guild_id)
+    @rate_limit()
     @app_commands.autocomplete(party=party_list_autocomplete)
     async def join_party(self, interaction: discord.Interaction,
                          party: str):
@@ -245,29 +263,37 @@ class PlayerManager(commands.Cog):
             await interaction.response.send_message(f'You are dead! Begone apparition!', ephemeral=True)
             return
 
-        if game_party.max_size != -1 and len(game_party.player_ids) >= game_party.max_size:
+        # The size check and the join happen under the game lock, so two players cannot both take the last slot
+        async with gdm.mutate_game() as mutation:
+            game = mutation.game
+            game_party = game.get_party(int(party))
+            game_player = game.get_player(interaction.user.id)
+            party_full = game_party.max_size != -1 and len(game_party.player_ids) >= game_party.max_size
+            existing_party = game.get_player_party(game_player)
+
+            if not party_full:
+                if existing_party is not None:
+                    existing_party.remove_player(game_player)
+                game_party.add_player(game_player)
+
+        if party_full:
             await interaction.response.send_message(f'Party size is already at max size of {game_party.max_size}!',
                                                     ephemeral=True)
             return
 
         guild = interaction.guild
-        party_channel = await guild.fetch_channel(game_party.channel_id)
-        player_user = await guild.fetch_member(game_player.player_id)
-        existing_party = game.get_player_party(game_player)
+        party_channel = await channel_resolver.resolve_channel(guild, game_party.channel_id)
+        player_user = await member_resolver.resolve_member(guild, game_player.player_id, interaction)
 
         if existing_party is not None:
-            existing_party_channel = await guild.fetch_channel(existing_party.channel_id)
+            existing_party_channel = await channel_resolver.resolve_channel(guild, existing_party.channel_id)
             await existing_party_channel.set_permissions(player_user, read_messages=False, send_messages=False,
                                                          read_message_history=False)
             await existing_party_channel.send(f'**{game_player.player_discord_name}** has left {existing_party.party_name}!')
-            existing_party.remove_player(game_player)
-
-        game_party.add_player(game_player)
 
         await party_channel.set_permissions(player_user, read_messages=True, send_messages=True,
                                             read_message_history=True)
 
-        await gdm.write_game(game=game)
         await interaction.response.send_message(f'You have joined {game_party.party_name}!', ephemeral=True)
         await party_channel.send(f'**{game_player.player_discord_name}** has joined {game_party.party_name}!')
 
@@ -276,7 +302,7 @@ class PlayerManager(commands.Cog):
 
     @app_commands.command(name="leave-party",
                           description="Allows a player to leave a party and manages text channel permissions")
-    @app_commands.checks.cooldown(1, 5, key=lambda i: i.guild_id)
+    @rate_limit()
     async def leave_party(self, interaction: discord.Interaction):
         log_interaction_call(interaction)
         game = await gdm.get_game(file_path=Conf.GAME_PATH)
@@ -304,16 +330,23 @@ class PlayerManager(commands.Cog):
             await interaction.response.send_message(f'You are not currently a member of any party!')
             return
 
-        guild = interaction.guild
-        party_channel = await guild.fetch_channel(game_party.channel_id)
-        player_user = await guild.fetch_member(game_player.player_id)
+        # Membership is looked up again under the game lock, in case a moderator moved the player in the meantime
+        async with gdm.mutate_game() as mutation:
+            game_party = mutation.game.get_player_party(game_player)
+            if game_party is not None:
+                game_party.remove_player(game_player)
 
-        game_party.remove_player(game_player)
+        if game_party is None:
+            await interaction.response.send_message(f'You are not currently a member of any party!')
+            return
+
+        guild = interaction.guild
+        party_channel = await channel_resolver.resolve_channel(guild, game_party.channel_id)
+        player_user = await member_resolver.resolve_member(guild, game_player.player_id, interaction)
 
         await party_channel.set_permissions(player_user, read_messages=False, send_messages=False,
                                             read_message_history=False)
 
-        await gdm.write_game(game=game)
         await interaction.response.send_message(f'You have left {game_party.party_name}!')
         await party_channel.send(f'**{game_player.player_discord_name}** has left {game_party.party_name}!')
 
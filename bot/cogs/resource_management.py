@@ -6,7 +6,9 @@ from discord import app_commands
 from discord.ext import commands
 from bot.model.conf_vars import ConfVars as Conf
 import bot.model.data_model as gdm
+from bot.model.game_journal import ResourceDeltaEvent
 from bot.botlogger.logging_manager import log_interaction_call, log_info
+from bot.utils.channel_resolver import channel_resolver
 from bot.utils.command_autocompletes import player_list_autocomplete, resource_type_autocomplete
 from bot.utils.message_formatter import *
 
@@ -22,46 +24,43 @@ class ResourceManager(commands.Cog):
                                              interaction: discord.Interaction):
         log_interaction_call(interaction)
         await interaction.response.defer(ephemeral=True, thinking=True)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
         guild = interaction.guild
 
-        game_players = game.players
-
-        for game_player in game_players:
-            player_moderation_channel = await guild.fetch_channel(game_player.player_mod_channel)
-            for player_resource in game_player.player_resources:
-                if player_resource.is_perishable:
-                    if player_resource.resource_amt > 0:
-                        # notify player how much of a resource they lost due to expiration
-                        expiration_responses = await construct_resource_modified_display(action='expired',
-                                                                                         player_resource=player_resource,
-                                                                                         res_change_amt=player_resource.resource_amt,
-                                                                                         game=game,
-                                                                                         guild=guild)
-                        if player_moderation_channel:
-                            for expiration_response in expiration_responses:
-                                await player_moderation_channel.send(expiration_response)
-
-                    player_resource.resource_amt = 0
-                if player_resource.resource_income and player_resource.resource_income > 0:
-                    player_resource.resource_amt += player_resource.resource_income
-                    if player_resource.resource_amt > player_resource.resource_max:
-                        player_resource.resource_amt = player_resource.resource_max
-                    income_responses = await construct_resource_modified_display(action='income',
-                                                                                 player_resource=player_resource,
-                                                                                 res_change_amt=player_resource.resource_income,
-                                                                                 game=game,
-                                                                                 guild=guild)
-                    if player_moderation_channel:
-                        for income_response in income_responses:
-                            await player_moderation_channel.send(income_response)
-
-        # save game information
-        await gdm.write_game(game)
+        # Every change is made in one mutation; the notices go out once it is committed, each showing the resource
+        # as it stood right after its own change
+        resource_notices = []
+        async with gdm.mutate_game() as mutation:
+            game = mutation.game
+            for game_player in game.players:
+                for player_resource in game_player.player_resources:
+                    if player_resource.is_perishable:
+                        if player_resource.resource_amt > 0:
+                            # notify player how much of a resource they lost due to expiration
+                            resource_notices.append((game_player, 'expired', player_resource.model_copy(),
+                                                     player_resource.resource_amt))
+
+                        player_resource.resource_amt = 0
+                    if player_resource.resource_income and player_resource.resource_income > 0:
+                        player_resource.resource_amt += player_resource.resource_income
+                        if player_resource.resource_amt > player_resource.resource_max:
+                            player_resource.resource_amt = player_resource.resource_max
+                        resource_notices.append((game_player, 'income', player_resource.model_copy(),
+                                                 player_resource.resource_income))
+
+        for game_player, action, player_resource, res_change_amt in resource_notices:
+            player_moderation_channel = await channel_resolver.resolve_channel(guild, game_player.player_mod_channel)
+            notice_responses = await construct_resource_modified_display(action=action,
+                                                                         player_resource=player_resource,
+                                                                         res_change_amt=res_change_amt,
+                                                                         game=game,
+                                                                         guild=guild)
+            if player_moderation_channel:
+                for notice_response in notice_responses:
+                    await player_moderation_channel.send(notice_response)
 
         # Notify player of new resource totals
-        for game_player in game_players:
-            player_moderation_channel = await guild.fetch_channel(game_player.player_mod_channel)
+        for game_player in game.players:
+            player_moderation_channel = await channel_resolver.resolve_channel(guild, game_player.player_mod_channel)
             if player_moderation_channel:
                 display_responses = await construct_player_resources_display(player=game_player,
                                                                              game=game,
@@ -146,11 +145,17 @@ class ResourceManager(commands.Cog):
                                   resource_amt: app_commands.Range[int, 1, 100]):
         log_interaction_call(interaction)
         await interaction.response.defer(ephemeral=True, thinking=True)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
         guild = interaction.guild
 
-        game_player = game.get_player(int(player))
-        resource_to_modify = game_player.get_resource(resource_type)
+        async with gdm.mutate_game() as mutation:
+            game = mutation.game
+            game_player = game.get_player(int(player))
+            resource_to_modify = game_player.get_resource(resource_type)
+
+            if resource_to_modify is not None:
+                game_player.modify_resource(resource_name=resource_type, amt=resource_amt)
+                mutation.events.append(ResourceDeltaEvent(player_id=game_player.player_id,
+                                                           resource_name=resource_type, amount=resource_amt))
 
         if resource_to_modify is None:
             await interaction.followup.send(
@@ -158,15 +163,11 @@ class ResourceManager(commands.Cog):
                 ephemeral=True)
             return
 
-        game_player.modify_resource(resource_name=resource_type, amt=resource_amt)
-
-        await gdm.write_game(game=game)
-
         await interaction.followup.send(f'Added {resource_amt} of resource {resource_type} to player '
                                         f'{game_player.player_discord_name}!', ephemeral=True)
 
-        game_player_mod_channel = await interaction.guild.fetch_channel(
-            game_player.player_mod_channel) if game_player.player_mod_channel is not None else None
+        game_player_mod_channel = await channel_resolver.resolve_channel(
+            interaction.guild, game_player.player_mod_channel)
 
         resource_modified_response = await construct_resource_modified_display(action='gained',
                                                                                player_resource=resource_to_modify,
@@ -190,11 +191,17 @@ class ResourceManager(commands.Cog):
                                      resource_amt: app_commands.Range[int, 1, 100]):
         log_interaction_call(interaction)
         await interaction.response.defer(ephemeral=True, thinking=True)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
         guild = interaction.guild
 
-        game_player = game.get_player(int(player))
-        resource_to_modify = game_player.get_resource(resource_type)
+        async with gdm.mutate_game() as mutation:
+            game = mutation.game
+            game_player = game.get_player(int(player))
+            resource_to_modify = game_player.get_resource(resource_type)
+
+            if resource_to_modify is not None:
+                game_player.modify_resource(resource_name=resource_type, amt=-resource_amt)
+                mutation.events.append(ResourceDeltaEvent(player_id=game_player.player_id,
+                                                           resource_name=resource_type, amount=-resource_amt))
 
         if resource_to_modify is None:
             await interaction.followup.send(
@@ -202,15 +209,11 @@ class ResourceManager(commands.Cog):
                 ephemeral=True)
             return
 
-        game_player.modify_resource(resource_name=resource_type, amt=-resource_amt)
-
-        await gdm.write_game(game=game)
-
         await interaction.followup.send(f'Removed {resource_amt} of resource {resource_type} from player '
                                         f'{game_player.player_discord_name}!', ephemeral=True)
 
-        game_player_mod_channel = await interaction.guild.fetch_channel(
-            game_player.player_mod_channel) if game_player.player_mod_channel is not None else None
+        game_player_mod_channel = await channel_resolver.resolve_channel(
+            interaction.guild, game_player.player_mod_channel)
 
         resource_modified_response = await construct_resource_modified_display(action='lost',
                                                                                player_resource=resource_to_modify,
@@ -236,48 +239,50 @@ class ResourceManager(commands.Cog):
                                        resource_amt: app_commands.Range[int, 1, 100]):
         log_interaction_call(interaction)
         await interaction.response.defer(ephemeral=True, thinking=True)
-        game = await gdm.get_game(file_path=Conf.GAME_PATH)
         guild = interaction.guild
 
-        sending_player = game.get_player(int(player))
-        receiving_player = game.get_player(int(recipient_player))
-
-        resource_to_send = sending_player.get_resource(resource_type)
-
-        if resource_to_send is None:
-            await interaction.followup.send(
-                f'Resource {resource_type} not defined for player {sending_player.player_discord_name}!',
-                ephemeral=True)
-            return
-        if not resource_to_send.is_commodity:
-            await interaction.followup.send(f'Resource {resource_type} is not defined as a commodity! Cannot transfer '
-                                            f'non-commodity resources!', ephemeral=True)
-            return
-        if resource_amt > resource_to_send.resource_amt:
-            await interaction.followup.send(
-                f'Resource Amount {resource_amt} exceeds available amount of {resource_to_send.resource_amt} for player '
-                f'{sending_player.player_discord_name}!', ephemeral=True)
-            return
-        if receiving_player is None:
-            await interaction.followup.send(f'Recipient player was not a valid choice!', ephemeral=True)
+        async with gdm.mutate_game() as mutation:
+            game = mutation.game
+            sending_player = game.get_player(int(player))
+            receiving_player = game.get_player(int(recipient_player))
+
+            resource_to_send = sending_player.get_resource(resource_type)
+
+            if resource_to_send is None:
+                rejection = f'Resource {resource_type} not defined for player {sending_player.player_discord_name}!'
+            elif not resource_to_send.is_commodity:
+                rejection = f'Resource {resource_type} is not defined as a commodity! Cannot transfer ' \
+                            f'non-commodity resources!'
+            elif resource_amt > resource_to_send.resource_amt:
+                rejection = f'Resource Amount {resource_amt} exceeds available amount of ' \
+                            f'{resource_to_send.resource_amt} for player {sending_player.player_discord_name}!'
+            elif receiving_player is None:
+                rejection = f'Recipient player was not a valid choice!'
+            else:
+                rejection = None
+                sending_player.modify_resource(resource_name=resource_type, amt=-resource_amt)
+                receiving_player.modify_resource(resource_name=resource_type, amt=resource_amt)
+                mutation.events.extend([
+                    ResourceDeltaEvent(player_id=sending_player.player_id, resource_name=resource_type,
+                                       amount=-resource_amt),
+                    ResourceDeltaEvent(player_id=receiving_player.player_id, resource_name=resource_type,
+                                       amount=resource_amt)])
+
+        if rejection is not None:
+            await interaction.followup.send(rejection, ephemeral=True)
             return
 
-        sending_player.modify_resource(resource_name=resource_type, amt=-resource_amt)
-        receiving_player.modify_resource(resource_name=resource_type, amt=resource_amt)
-
         sent_resource = sending_player.get_resource(resource_name=resource_type)
         received_resource = receiving_player.get_resource(resource_name=resource_type)
 
-        await gdm.write_game(game=game)
-
         await interaction.followup.send(f'Sent {resource_amt} of resource {resource_type} from player '
                                         f'{sending_player.player_discord_name} to player '
                                         f'{receiving_player.player_discord_name}!', ephemeral=True)
 
-        sending_player_mod_channel = await interaction.guild.fetch_channel(
-            sending_player.player_mod_channel) if sending_player.player_mod_channel is not None else None
-        receiving_player_mod_channel = await interaction.guild.fetch_channel(
-            receiving_player.player_mod_channel) if receiving_player.player_mod_channel is not None else None
+        sending_player_mod_channel = await channel_resolver.resolve_channel(
+            interaction.guild, sending_player.player_mod_channel)
+        receiving_player_mod_channel = await channel_resolver.resolve_channel(
+            interaction.guild, receiving_player.player_mod_channel)
 
         resource_sent_formatted_responses = await construct_resource_modified_display(action='sent',
                                                                                       player_resource=sent_resource,
@@ -320,52 +325,52 @@ class ResourceManager(commands.Cog):
             await interaction.followup.send(f'The game moderator has locked resource transferring at this time!')
             return
 
-        sending_player = game.get_player(int(interaction.user.id))
-        receiving_player = game.get_player(int(recipient_player))
-
-        if not sending_player:
-            await interaction.followup.send(f'You are not a registered player for this game!')
-            return
-        if sending_player.is_dead:
-            await interaction.followup.send(f'You are currently dead and cannot transfer resources!')
+        # The balance check and the deduction must not interleave with another transfer from the same player
+        async with gdm.mutate_game() as mutation:
+            game = mutation.game
+            sending_player = game.get_player(int(interaction.user.id))
+            receiving_player = game.get_player(int(recipient_player))
+            resource_to_send = sending_player.get_resource(resource_type) if sending_player else None
+
+            if not sending_player:
+                rejection = f'You are not a registered player for this game!'
+            elif sending_player.is_dead:
+                rejection = f'You are currently dead and cannot transfer resources!'
+            elif resource_to_send is None:
+                rejection = f'Resource {resource_type} not defined for player {sending_player.player_discord_name}!'
+            elif not resource_to_send.is_commodity:
+                rejection = f'Resource {resource_type} is not defined as a commodity! Cannot transfer ' \
+                            f'non-commodity resources!'
+            elif resource_amt > resource_to_send.resource_amt:
+                rejection = f'Resource Amount {resource_amt} exceeds available amount of ' \
+                            f'{resource_to_send.resource_amt} for player {sending_player.player_discord_name}!'
+            elif receiving_player is None:
+                rejection = f'Recipient player was not a valid choice!'
+            else:
+                rejection = None
+                sending_player.modify_resource(resource_name=resource_type, amt=-resource_amt)
+                receiving_player.modify_resource(resource_name=resource_type, amt=resource_amt)
+                mutation.events.extend([
+                    ResourceDeltaEvent(player_id=sending_player.player_id, resource_name=resource_type,
+                                       amount=-resource_amt),
+                    ResourceDeltaEvent(player_id=receiving_player.player_id, resource_name=resource_type,
+                                       amount=resource_amt)])
+
+        if rejection is not None:
+            await interaction.followup.send(rejection, ephemeral=True)
             return
 
-        resource_to_send = sending_player.get_resource(resource_type)
-
-        if resource_to_send is None:
-            await interaction.followup.send(
-                f'Resource {resource_type} not defined for player {sending_player.player_discord_name}!',
-                ephemeral=True)
-            return
-        if not resource_to_send.is_commodity:
-            await interaction.followup.send(f'Resource {resource_type} is not defined as a commodity! Cannot transfer '
-                                            f'non-commodity resources!', ephemeral=True)
-            return
-        if resource_amt > resource_to_send.resource_amt:
-            await interaction.followup.send(
-                f'Resource Amount {resource_amt} exceeds available amount of {resource_to_send.resource_amt} for player '
-                f'{sending_player.player_discord_name}!', ephemeral=True)
-            return
-        if receiving_player is None:
-            await interaction.followup.send(f'Recipient player was not a valid choice!', ephemeral=True)
-            return
-
-        sending_player.modify_resource(resource_name=resource_type, amt=-resource_amt)
-        receiving_player.modify_resource(resource_name=resource_type, amt=resource_amt)
-
         sent_resource = sending_player.get_resource(resource_name=resource_type)
         received_resource = receiving_player.get_resource(resource_name=resource_type)
 
-        await gdm.write_game(game=game)
-
         await interaction.followup.send(f'Sent {resource_amt} of resource {resource_type} from player '
                                         f'{sending_player.player_discord_name} to player '
                                         f'{receiving_player.player_discord_name}!', ephemeral=True)
 
-        sending_player_mod_channel = await interaction.guild.fetch_channel(
-            sending_player.player_mod_channel) if sending_player.player_mod_channel is not None else None
-        receiving_player_mod_channel = await interaction.guild.fetch_channel(
-            receiving_player.player_mod_channel) if receiving_player.player_mod_channel is not None else None
+        sending_player_mod_channel = await channel_resolver.resolve_channel(
+            interaction.guild, sending_player.player_mod_channel)
+        receiving_player_mod_channel = await channel_resolver.resolve_channel(
+            interaction.guild, receiving_player.player_mod_channel)
 
         resource_sent_formatted_responses = await construct_resource_modified_display(action='sent',
                                                                                       player_resource=sent_resource,
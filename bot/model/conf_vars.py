@@ -43,3 +43,36 @@ class ConfVars:
     CHAR_SHEET_FILE = os.getenv('CHAR_SHEET_FILE')
     CHAR_SHEET_PATH = f'{BASE_PATH}/{CHAR_SHEET_FILE}' if CHAR_SHEET_FILE else None
 
+    # Optional Arguments - Persistence tuning
+    # Storage backend for GAME_FILE: 'json' (default) or 'sqlite'
+    STORAGE_BACKEND = os.getenv('STORAGE_BACKEND') if os.getenv('STORAGE_BACKEND') else 'json'
+    # Seconds between coalesced game file flushes; unset writes the game file synchronously on every change
+    WRITE_BEHIND_INTERVAL = float(os.getenv('WRITE_BEHIND_INTERVAL')) if os.getenv('WRITE_BEHIND_INTERVAL') else None
+    # Number of journaled events between full game snapshots; unset disables the event journal
+    JOURNAL_SNAPSHOT_EVERY = int(os.getenv('JOURNAL_SNAPSHOT_EVERY')) if os.getenv('JOURNAL_SNAPSHOT_EVERY') else None
+    # Separate file for the static catalog (actions, items, skills, ...) so that the JSON game file only holds state
+    GAME_CATALOG_FILE = os.getenv('GAME_CATALOG_FILE')
+    GAME_CATALOG_PATH = f'{BASE_PATH}/{GAME_CATALOG_FILE}' if GAME_CATALOG_FILE else None
+    # Minimum seconds between edits of the same pinned vote report; votes in between are coalesced into one edit
+    REPORT_REFRESH_WINDOW = float(os.getenv('REPORT_REFRESH_WINDOW')) if os.getenv('REPORT_REFRESH_WINDOW') else 2.0
+
+    # Optional Arguments - Command rate limiting
+    # Commands each user may run per second once their burst is used up, per command
+    RATE_LIMIT_RATE = float(os.getenv('RATE_LIMIT_RATE')) if os.getenv('RATE_LIMIT_RATE') else 0.5
+    # Commands each user may run back to back before the rate applies
+    RATE_LIMIT_BURST = int(os.getenv('RATE_LIMIT_BURST')) if os.getenv('RATE_LIMIT_BURST') else 3
+    # Ceiling across all users and rate limited commands, keeping the bot clear of Discord's global API limits
+    RATE_LIMIT_GLOBAL_RATE = float(os.getenv('RATE_LIMIT_GLOBAL_RATE')) if os.getenv('RATE_LIMIT_GLOBAL_RATE') else 10.0
+    RATE_LIMIT_GLOBAL_BURST = int(os.getenv('RATE_LIMIT_GLOBAL_BURST')) if os.getenv('RATE_LIMIT_GLOBAL_BURST') else 20
+
+    # Optional Arguments - Discord caches
+    # Seconds a member fetched over REST (i.e. missing from the gateway cache) is reused before fetching it again
+    MEMBER_CACHE_TTL = float(os.getenv('MEMBER_CACHE_TTL')) if os.getenv('MEMBER_CACHE_TTL') else 300.0
+    # Request all guild members when connecting, so member lookups are served from the gateway cache
+    CHUNK_MEMBERS_AT_STARTUP = os.getenv('CHUNK_MEMBERS_AT_STARTUP', 'true').lower() != 'false'
+    # Seconds an autocomplete result is reused for identical requests; any game change invalidates it sooner
+    AUTOCOMPLETE_CACHE_TTL = float(os.getenv('AUTOCOMPLETE_CACHE_TTL')) if os.getenv('AUTOCOMPLETE_CACHE_TTL') else 30.0
+
+    # Optional Arguments - Message rendering
+    # Approximate memory budget, in bytes, for rendered action/item/resource text reused across displays
+    FRAGMENT_CACHE_BYTES = int(os.getenv('FRAGMENT_CACHE_BYTES')) if os.getenv('FRAGMENT_CACHE_BYTES') else 4_000_000
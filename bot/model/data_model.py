@@ -1,40 +1,130 @@
 #! data_model.py
 # Pydantic data models for managing game state
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Set
+from typing import Any, Optional, List, Dict, Set, ClassVar
 from bot.botlogger.logging_manager import logger
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextlib
 import csv
+import functools
+import hashlib
 import json
 import os
+import re
+import shutil
 import time
 import traceback
 from bot.model.conf_vars import ConfVars as Conf
 
 
-class PersistentInteractableView(BaseModel):
+def _bind_tree(value, game: Optional['Game'], section: Optional[str]):
+    if isinstance(value, TrackedModel):
+        value.bind(game=game, section=section)
+    elif isinstance(value, (list, set, tuple)):
+        for element in value:
+            if isinstance(element, TrackedModel):
+                element.bind(game=game, section=section)
+
+
+# Key field of the entries of each indexed Game section
+INDEX_KEY_FIELDS: Dict[str, str] = {
+    'players': 'player_id',
+    'rounds': 'round_number',
+    'parties': 'channel_id',
+    'actions': 'action_name',
+    'items': 'item_name',
+    'pi_views': 'view_name',
+    'item_type_definitions': 'item_type',
+    'attribute_definitions': 'attribute_name',
+    'resource_definitions': 'resource_name',
+    'action_type_definitions': 'action_type',
+}
+INDEX_KEYS: Set[str] = set(INDEX_KEY_FIELDS.values()) | {'player_ids'}
+
+
+class TrackedModel(BaseModel):
+    # Reports real changes to the top-level Game section that owns the model, so unchanged games are never rewritten.
+    # Kept in a slot rather than a private attribute so that it does not take part in model equality.
+    __slots__ = ('_tracker', '_content_hash')
+
+    def __setattr__(self, name, value):
+        if name not in type(self).model_fields:
+            super().__setattr__(name, value)
+            return
+        changed = getattr(self, name) != value
+        super().__setattr__(name, value)
+        if changed:
+            if name in INDEX_KEYS:
+                self._invalidate_game_index()
+            self._field_changed(name)
+            self._adopt(value)
+
+    def _field_changed(self, name: str):
+        pass
+
+    def bind(self, game: Optional['Game'], section: Optional[str]):
+        object.__setattr__(self, '_tracker', (game, section))
+        object.__setattr__(self, '_content_hash', None)
+        for field_name in type(self).model_fields:
+            _bind_tree(getattr(self, field_name), game, section)
+
+    def touch(self):
+        game, section = getattr(self, '_tracker', (None, None))
+        if game is not None:
+            game.mark_section_dirty(section)
+
+    def content_hash(self) -> bytes:
+        # Digest of the model's contents; reused until the Game section that owns the model changes
+        game, section = getattr(self, '_tracker', (None, None))
+        if game is None:
+            return hashlib.blake2b(self.model_dump_json().encode(), digest_size=16).digest()
+        version = (section, game.get_version(section))
+        cached = self._content_hash
+        if cached is not None and cached[0] is game and cached[1] == version:
+            return cached[2]
+        digest = hashlib.blake2b(self.model_dump_json().encode(), digest_size=16).digest()
+        object.__setattr__(self, '_content_hash', (game, version, digest))
+        return digest
+
+    def _invalidate_game_index(self):
+        game, section = getattr(self, '_tracker', (None, None))
+        if game is not None:
+            game.invalidate_index(section)
+
+    def _adopt(self, value):
+        # Binds newly attached children to this model's section and records the change
+        game, section = getattr(self, '_tracker', (None, None))
+        _bind_tree(value, game, section)
+        self.touch()
+
+
+class PersistentInteractableView(TrackedModel):
     view_name: str
     channel_id: int
     message_ids: List[int]
     button_msg_id: int
+    # Hash of the content last written to each message, in message_ids order; empty for views created before hashing
+    message_hashes: List[str] = Field(default_factory=list)
 
 
-class AttributeModifier(BaseModel):
+class AttributeModifier(TrackedModel):
     att_name: str
     modification: int
 
 
-class Attribute(BaseModel):
+class Attribute(TrackedModel):
     name: str
     level: int
     max_level: Optional[int] = -1
 
 
-class ResourceCost(BaseModel):
+class ResourceCost(TrackedModel):
     res_name: str
     amount: int
 
 
-class Resource(BaseModel):
+class Resource(TrackedModel):
     resource_type: str
     resource_amt: int
     resource_income: Optional[int] = 0
@@ -43,7 +133,7 @@ class Resource(BaseModel):
     is_perishable: bool = False
 
 
-class Skill(BaseModel):
+class Skill(TrackedModel):
     skill_name: str
     skill_req: Optional[str] = None
     skill_restrict: Optional[str] = None
@@ -51,7 +141,7 @@ class Skill(BaseModel):
     modifies_attributes: List[AttributeModifier] = Field(default_factory=list)
 
 
-class StatusModifier(BaseModel):
+class StatusModifier(TrackedModel):
     modifier_type: str
     modifier_name: str
     modifier_desc: Optional[str] = None
@@ -60,7 +150,7 @@ class StatusModifier(BaseModel):
     modifies_attributes: List[AttributeModifier] = Field(default_factory=list)
 
 
-class Action(BaseModel):
+class Action(TrackedModel):
     action_name: str
     action_type: Optional[str] = None
     action_timing: Optional[str] = None
@@ -72,7 +162,7 @@ class Action(BaseModel):
     action_desc: str
 
 
-class Item(BaseModel):
+class Item(TrackedModel):
     item_name: str
     item_type: str
     item_subtype: Optional[str] = None
@@ -83,7 +173,7 @@ class Item(BaseModel):
     item_action: Optional[Action] = None
 
 
-class Player(BaseModel):
+class Player(TrackedModel):
     player_id: int
     player_discord_name: str
     player_mod_channel: Optional[int] = None
@@ -108,9 +198,11 @@ class Player(BaseModel):
 
     def add_action(self, action: Action):
         self.player_actions.append(action)
+        self._adopt(action)
 
     def remove_action(self, action: Action):
         self.player_actions.remove(action)
+        self.touch()
 
     def get_item(self, item_name: str) -> Optional[Item]:
         specific_item: Optional[Item] = None
@@ -121,9 +213,11 @@ class Player(BaseModel):
 
     def add_item(self, item: Item):
         self.player_items.append(item)
+        self._adopt(item)
 
     def remove_item(self, item: Item):
         self.player_items.remove(item)
+        self.touch()
 
     def get_item_actions(self) -> list[(str, Action)]:
         item_actions: list[(str, Action)] = []
@@ -170,13 +264,84 @@ class Player(BaseModel):
             logger.warn(f"Attempted to modify {attribute_name} of player, but player does not have this attribute!")
 
 
-class Vote(BaseModel):
+class Vote(TrackedModel):
     player_id: int
     choice: str
     timestamp: int
 
 
-class Dilemma(BaseModel):
+class VoteTally:
+    # Incrementally maintained view of a vote list: each player's current vote and, per choice, its voters in
+    # timestamp order. Rebuilt from the persisted vote list on first use.
+    def __init__(self, votes: List[Vote]):
+        self.player_votes: Dict[int, Vote] = {}
+        self.choice_voters: Dict[str, Dict[int, Vote]] = {}
+        for vote in sorted(votes, key=lambda v: v.timestamp):
+            self.remove(self.player_votes.get(vote.player_id))
+            self.add(vote)
+
+    def add(self, vote: Vote):
+        self.player_votes[vote.player_id] = vote
+        self.choice_voters.setdefault(vote.choice, {})[vote.player_id] = vote
+
+    def remove(self, vote: Optional[Vote]):
+        if vote is None or self.player_votes.get(vote.player_id) is not vote:
+            return
+        del self.player_votes[vote.player_id]
+        voters = self.choice_voters[vote.choice]
+        del voters[vote.player_id]
+        if not voters:
+            del self.choice_voters[vote.choice]
+
+    def ranked_choices(self) -> List[tuple[str, List[int]]]:
+        # Most votes first; ties keep the order in which choices first received their current votes
+        return [(choice, list(voters)) for choice, voters in
+                sorted(self.choice_voters.items(), key=lambda e: len(e[1]), reverse=True)]
+
+
+class VotingModel(TrackedModel):
+    # Shared vote handling for Round and Dilemma; _votes_field names the persisted vote list
+    __slots__ = ('_tally',)
+    _votes_field: ClassVar[str]
+
+    def _votes(self) -> List[Vote]:
+        return getattr(self, self._votes_field)
+
+    def _field_changed(self, name: str):
+        if name == self._votes_field:
+            object.__setattr__(self, '_tally', None)
+
+    def get_tally(self) -> VoteTally:
+        tally = getattr(self, '_tally', None)
+        if tally is None:
+            tally = VoteTally(self._votes())
+            object.__setattr__(self, '_tally', tally)
+        return tally
+
+    def get_player_vote(self, player_id: int) -> Optional[Vote]:
+        return self.get_tally().player_votes.get(player_id)
+
+    def add_vote(self, vote: Vote):
+        tally = self.get_tally()
+        tally.remove(tally.player_votes.get(vote.player_id))
+        self._votes().append(vote)
+        tally.add(vote)
+        self._adopt(vote)
+
+    def remove_vote(self, vote: Vote):
+        self._votes().remove(vote)
+        self.get_tally().remove(vote)
+        self.touch()
+
+    def change_vote(self, vote: Vote, choice: str, timestamp: int):
+        tally = self.get_tally()
+        tally.remove(vote)
+        vote.choice = choice
+        vote.timestamp = timestamp
+        tally.add(vote)
+
+
+class Dilemma(VotingModel):
     dilemma_votes: List[Vote] = Field(default_factory=list)
     dilemma_name: str
     dilemma_channel_id: int
@@ -184,56 +349,57 @@ class Dilemma(BaseModel):
     dilemma_player_ids: Set[int] = Field(default_factory=set)
     dilemma_choices: Set[str] = Field(default_factory=set)
     is_active_dilemma: bool
-
-    def get_player_vote(self, player_id: int) -> Optional[Vote]:
-        player_vote = None
-        for vote in self.dilemma_votes:
-            if vote.player_id == player_id:
-                player_vote = vote
-        return player_vote
-
-    def add_vote(self, vote: Vote):
-        self.dilemma_votes.append(vote)
-
-    def remove_vote(self, vote: Vote):
-        self.dilemma_votes.remove(vote)
+    _votes_field: ClassVar[str] = 'dilemma_votes'
 
     def add_player(self, player: Player):
-        self.dilemma_player_ids.add(player.player_id)
+        if player.player_id not in self.dilemma_player_ids:
+            self.dilemma_player_ids.add(player.player_id)
+            self.touch()
 
     def remove_player(self, player: Player):
         self.dilemma_player_ids.remove(player.player_id)
+        self.touch()
 
     def add_choice(self, choice: str):
-        self.dilemma_choices.add(choice)
+        if choice not in self.dilemma_choices:
+            self.dilemma_choices.add(choice)
+            self.touch()
 
     def remove_choice(self, choice: str):
         self.dilemma_choices.remove(choice)
+        self.touch()
 
 
-class Party(BaseModel):
+class Party(TrackedModel):
     player_ids: Set[int] = Field(default_factory=set)
     party_name: str
     max_size: int
     channel_id: int
 
     def add_player(self, player: Player):
-        self.player_ids.add(player.player_id)
+        if player.player_id not in self.player_ids:
+            self.player_ids.add(player.player_id)
+            self._invalidate_game_index()
+            self.touch()
 
     def remove_player(self, player: Player):
         self.player_ids.remove(player.player_id)
+        self._invalidate_game_index()
+        self.touch()
 
 
-class Round(BaseModel):
+class Round(VotingModel):
     votes: List[Vote] = Field(default_factory=list)
     round_channel_id: int
     round_message_id: int
     round_number: int
     round_dilemmas: List[Dilemma] = Field(default_factory=list)
     is_active_round: bool
+    _votes_field: ClassVar[str] = 'votes'
 
     def add_dilemma(self, dilemma: Dilemma):
         self.round_dilemmas.append(dilemma)
+        self._adopt(dilemma)
 
     def close_dilemmas(self):
         for dilemma in self.round_dilemmas:
@@ -249,27 +415,14 @@ class Round(BaseModel):
                 player_dilemma = a_dilemma
         return player_dilemma
 
-    def get_player_vote(self, player_id: int) -> Optional[Vote]:
-        player_vote = None
-        for vote in self.votes:
-            if vote.player_id == player_id:
-                player_vote = vote
-        return player_vote
-
-    def add_vote(self, vote: Vote):
-        self.votes.append(vote)
-
-    def remove_vote(self, vote: Vote):
-        self.votes.remove(vote)
-
 
-class AttributeDefinition(BaseModel):
+class AttributeDefinition(TrackedModel):
     attribute_name: str
     attribute_max: int = -1
     emoji_text: Optional[str] = None
 
 
-class ResourceDefinition(BaseModel):
+class ResourceDefinition(TrackedModel):
     resource_name: str
     resource_max: int = -1
     is_commodity: bool
@@ -277,21 +430,24 @@ class ResourceDefinition(BaseModel):
     emoji_text: Optional[str] = None
 
 
-class ItemTypeDefinition(BaseModel):
+class ItemTypeDefinition(TrackedModel):
     item_type: str
     is_equippable: bool
     max_equippable: int
     emoji_text: Optional[str] = None
 
 
-class ActionTypeDefinition(BaseModel):
+class ActionTypeDefinition(TrackedModel):
     action_type: str
     emoji_text: Optional[str] = None
 
 
 class Game(BaseModel):
     model_config = {'populate_by_name': True}
-    
+    # Top-level fields changed since the game was last loaded or saved, per-section change counters, and lazily built
+    # lookup indexes
+    __slots__ = ('_dirty_sections', '_section_versions', '_indexes')
+
     is_active: bool
     parties_locked: bool
     voting_locked: bool
@@ -309,16 +465,99 @@ class Game(BaseModel):
     actions: List[Action] = Field(default_factory=list)
     items: List[Item] = Field(default_factory=list)
     pi_views: List[PersistentInteractableView] = Field(default_factory=list)
+    # Sequence number of the last journaled event included in this snapshot
+    journal_seq: int = 0
+
+    def model_post_init(self, __context):
+        for field_name in type(self).model_fields:
+            _bind_tree(getattr(self, field_name), self, field_name)
+        # A game that was just built has never been saved
+        object.__setattr__(self, '_dirty_sections', set(type(self).model_fields))
+        object.__setattr__(self, '_section_versions', {})
+        object.__setattr__(self, '_indexes', {})
+
+    def __setattr__(self, name, value):
+        if name not in type(self).model_fields:
+            super().__setattr__(name, value)
+            return
+        changed = getattr(self, name) != value
+        super().__setattr__(name, value)
+        if changed:
+            _bind_tree(value, self, name)
+            self.invalidate_index(name)
+            self.mark_section_dirty(name)
+
+    def mark_section_dirty(self, section: str):
+        self._dirty_sections.add(section)
+        self._section_versions[section] = self._section_versions.get(section, 0) + 1
+
+    def get_version(self, *sections: str) -> int:
+        # Grows with every change to the given sections (all sections when none are given); unlike the dirty
+        # sections it is never reset, so derived data can be cached against it
+        if not sections:
+            return sum(self._section_versions.values())
+        return sum(self._section_versions.get(section, 0) for section in sections)
+
+    def get_dirty_sections(self) -> Set[str]:
+        return set(self._dirty_sections)
+
+    def take_dirty_sections(self) -> Set[str]:
+        # Returns the dirty sections and marks the game clean; pass them to restore_dirty_sections if the save fails
+        dirty_sections = self._dirty_sections
+        object.__setattr__(self, '_dirty_sections', set())
+        return dirty_sections
+
+    def restore_dirty_sections(self, sections: Set[str]):
+        self._dirty_sections.update(sections)
+
+    def rollback(self, snapshot: Dict):
+        # Puts back every section that differs from an earlier model_dump() of this game, in place, so the other
+        # holders of this instance and its unsaved changes from before the snapshot are kept
+        current = self.model_dump()
+        changed_sections = [name for name in type(self).model_fields if current[name] != snapshot[name]]
+        if not changed_sections:
+            return
+        restored = type(self).model_validate(snapshot)
+        for name in changed_sections:
+            setattr(self, name, getattr(restored, name))
+
+    def _index(self, section: str) -> Dict:
+        # Lookup indexes are built on first use and dropped whenever the list behind them (or a key field in it) changes
+        index = self._indexes.get(section)
+        if index is None:
+            index = {}
+            if section == 'party_members':
+                for a_party in self.parties:
+                    for player_id in a_party.player_ids:
+                        index.setdefault(player_id, a_party)
+            else:
+                key_field = INDEX_KEY_FIELDS[section]
+                for entry in getattr(self, section):
+                    index.setdefault(getattr(entry, key_field), entry)
+            self._indexes[section] = index
+        return index
+
+    def invalidate_index(self, section: str):
+        self._indexes.pop(section, None)
+        if section == 'parties':
+            self._indexes.pop('party_members', None)
+        elif section == 'rounds':
+            self._indexes.pop('latest_round', None)
+
+    def _append_entry(self, section: str, entry: BaseModel):
+        getattr(self, section).append(entry)
+        _bind_tree(entry, self, section)
+        index = self._indexes.get(section)
+        if index is not None:
+            index.setdefault(getattr(entry, INDEX_KEY_FIELDS[section]), entry)
+        self.mark_section_dirty(section)
 
     def get_player(self, player_id: int | str) -> Optional[Player]:
         player_int_id = player_id if isinstance(player_id, int) else int(player_id)
-        for player in self.players:
-            if player.player_id == player_int_id:
-                return player
-        return None
+        return self._index('players').get(player_int_id)
 
     def add_player(self, player: Player):
-        self.players.append(player)
+        self._append_entry('players', player)
 
     def get_living_player_ids(self) -> List[str]:
         game_player_ids = []
@@ -327,61 +566,46 @@ class Game(BaseModel):
         return game_player_ids
 
     def add_round(self, a_round: Round):
-        self.rounds.append(a_round)
+        self._append_entry('rounds', a_round)
+        latest_round = self._indexes.get('latest_round')
+        if latest_round is not None and a_round.round_number > latest_round.round_number:
+            self._indexes['latest_round'] = a_round
 
     def get_round(self, round_num: int) -> Optional[Round]:
-        for a_round in self.rounds:
-            if a_round.round_number == round_num:
-                return a_round
-        return None
+        return self._index('rounds').get(round_num)
 
     def get_latest_round(self) -> Optional[Round]:
-        latest_round = None
-        previous_round_num = 0
-        for a_round in self.rounds:
-            if a_round.round_number > previous_round_num:
-                previous_round_num = a_round.round_number
-                latest_round = a_round
-        return latest_round
+        if 'latest_round' not in self._indexes:
+            latest_round = None
+            previous_round_num = 0
+            for a_round in self.rounds:
+                if a_round.round_number > previous_round_num:
+                    previous_round_num = a_round.round_number
+                    latest_round = a_round
+            self._indexes['latest_round'] = latest_round
+        return self._indexes['latest_round']
 
     def add_party(self, a_party: Party):
-        self.parties.append(a_party)
+        self._append_entry('parties', a_party)
+        self._indexes.pop('party_members', None)
 
     def get_party(self, channel_id: int):
-        for a_party in self.parties:
-            if a_party.channel_id == channel_id:
-                return a_party
-        return None
+        return self._index('parties').get(channel_id)
 
     def get_player_party(self, player: Player):
-        for a_party in self.parties:
-            if player.player_id in a_party.player_ids:
-                return a_party
-        return None
+        return self._index('party_members').get(player.player_id)
 
     def get_action(self, action_name: str) -> Optional[Action]:
-        for action in self.actions:
-            if action.action_name == action_name:
-                return action
-        return None
+        return self._index('actions').get(action_name)
 
     def get_action_map(self) -> Dict[str, Action]:
-        action_dict: Dict[str, Action] = {}
-        for action in self.actions:
-            action_dict[action.action_name] = action
-        return action_dict
+        return dict(self._index('actions'))
 
     def get_item(self, item_name: str) -> Optional[Item]:
-        for item in self.items:
-            if item.item_name == item_name:
-                return item
-        return None
+        return self._index('items').get(item_name)
 
     def get_item_map(self) -> Dict[str, Item]:
-        item_dict: Dict[str, Item] = {}
-        for item in self.items:
-            item_dict[item.item_name] = item
-        return item_dict
+        return dict(self._index('items'))
 
     def get_item_actions(self) -> list[(str, Action)]:
         item_actions: list[(str, Action)] = []
@@ -392,85 +616,153 @@ class Game(BaseModel):
         return item_actions
 
     def get_item_type_definitions(self) -> Dict[str, ItemTypeDefinition]:
-        item_type_def_dict: Dict[str, ItemTypeDefinition] = {}
-        for item_type_def in self.item_type_definitions:
-            item_type_def_dict[item_type_def.item_type] = item_type_def
-        return item_type_def_dict
+        return dict(self._index('item_type_definitions'))
 
     def get_attribute_definitions(self) -> Dict[str, AttributeDefinition]:
-        att_def_dict: Dict[str, AttributeDefinition] = {}
-        for att_def in self.attribute_definitions:
-            att_def_dict[att_def.attribute_name] = att_def
-        return att_def_dict
+        return dict(self._index('attribute_definitions'))
 
     def get_attribute_definition_by_name(self, attribute_name: str) -> Optional[AttributeDefinition]:
-        for att_def in self.attribute_definitions:
-            if att_def.attribute_name == attribute_name:
-                return att_def
-        return None
+        return self._index('attribute_definitions').get(attribute_name)
 
     def get_resource_definitions(self) -> Dict[str, ResourceDefinition]:
-        res_def_dict: Dict[str, ResourceDefinition] = {}
-        for res_def in self.resource_definitions:
-            res_def_dict[res_def.resource_name] = res_def
-        return res_def_dict
+        return dict(self._index('resource_definitions'))
 
     def get_resource_definition_by_name(self, resource_name: str) -> Optional[ResourceDefinition]:
-        for res_def in self.resource_definitions:
-            if res_def.resource_name == resource_name:
-                return res_def
-        return None
+        return self._index('resource_definitions').get(resource_name)
 
     def get_action_type_definitions(self) -> Dict[str, ActionTypeDefinition]:
-        action_type_def_dict: Dict[str, ActionTypeDefinition] = {}
-        for action_type_def in self.action_type_definitions:
-            action_type_def_dict[action_type_def.action_type] = action_type_def
-        return action_type_def_dict
+        return dict(self._index('action_type_definitions'))
 
     def get_action_type_definition_by_name(self, action_type: str) -> Optional[ActionTypeDefinition]:
-        for action_type_def in self.action_type_definitions:
-            if action_type_def.action_type == action_type:
-                return action_type_def
-        return None
+        return self._index('action_type_definitions').get(action_type)
 
     def get_pi_view(self, view_name: str) -> Optional[PersistentInteractableView]:
-        for pi_view in self.pi_views:
-            if pi_view.view_name == view_name:
-                return pi_view
-        return None
+        return self._index('pi_views').get(view_name)
+
+    def add_pi_view(self, pi_view: PersistentInteractableView):
+        self._append_entry('pi_views', pi_view)
 
     def remove_pi_view(self, view_name: str):
-        for pi_view in self.pi_views:
-            if pi_view.view_name == view_name:
-                self.pi_views.remove(pi_view)
+        pi_view = self.get_pi_view(view_name)
+        if pi_view is not None:
+            self.pi_views.remove(pi_view)
+            self.invalidate_index('pi_views')
+            self.mark_section_dirty('pi_views')
 
 
 # Legacy mapping functions - replaced by Pydantic models in Game class methods
 
 
-def read_json_to_dom(filepath: str) -> Game:
+# Bumped whenever the snapshot layout changes, so older snapshots take the fully validated load path once
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def snapshot_meta_path(filepath: str) -> str:
+    return f'{filepath}.meta'
+
+
+def snapshot_checksum(json_data: bytes) -> str:
+    return hashlib.sha256(json_data).hexdigest()
+
+
+def is_trusted_snapshot(json_data: bytes, filepath: str) -> bool:
+    # True when the file is byte-for-byte what the bot wrote, according to the meta file written alongside it
+    try:
+        with open(snapshot_meta_path(filepath), 'r', encoding="utf8") as metafile:
+            meta = json.load(metafile)
+    except (OSError, ValueError):
+        return False
+    return meta.get('format_version') == SNAPSHOT_FORMAT_VERSION and meta.get('sha256') == snapshot_checksum(json_data)
+
+
+def read_json_to_dom(filepath: str, catalog: Optional['GameCatalog'] = None) -> Game:
     try:
-        with open(filepath, 'r', encoding="utf8") as openfile:
-            json_data = json.load(openfile)
-            return Game.model_validate(json_data)
+        with open(filepath, 'rb') as openfile:
+            json_data = openfile.read()
+
+        if is_trusted_snapshot(json_data=json_data, filepath=filepath):
+            # Bot-written snapshot: parse and validate straight from JSON in a single pass
+            game = Game.model_validate_json(json_data)
+            if catalog is not None:
+                for field_name in CATALOG_FIELDS:
+                    setattr(game, field_name, getattr(catalog, field_name))
+            return game
+
+        logger.info(f'Game file {filepath} does not match its snapshot checksum; running full validation')
+        game_data = json.loads(json_data)
+        if catalog is not None:
+            # Already validated catalog models pass through validation as-is
+            game_data.update({field_name: getattr(catalog, field_name) for field_name in CATALOG_FIELDS})
+        return Game.model_validate(game_data)
     except Exception as e:
         logger.error(f'Error while reading game file from {filepath}: {e}')
         raise
 
 
-def write_dom_to_json(game: Game):
+def game_to_json(game: Game, exclude: Optional[Set[str]] = None) -> str:
+    return game.model_dump_json(indent=2, by_alias=True, exclude=exclude)
+
+
+def write_dom_to_json(game: Game, filepath: Optional[str] = None, exclude: Optional[Set[str]] = None):
+    write_snapshot_json(json_data=game_to_json(game=game, exclude=exclude), filepath=filepath)
+
+
+def write_snapshot_json(json_data: str, filepath: Optional[str] = None):
+    filepath_final = filepath if filepath else f'{Conf.BASE_PATH}/{Conf.GAME_FILE}'
+    write_json_file(json_data=json_data, filepath=filepath_final)
+    # Written after the snapshot: a crash in between only costs one fully validated load
+    meta = {'format_version': SNAPSHOT_FORMAT_VERSION, 'sha256': snapshot_checksum(json_data.encode('utf8'))}
+    write_json_file(json_data=json.dumps(meta), filepath=snapshot_meta_path(filepath_final), backup=False,
+                    durable=False)
+
+
+def backup_path(filepath: str) -> str:
+    return f'{filepath}.bak'
+
+
+def _temp_file_pattern(filepath: str) -> re.Pattern:
+    # Matches write_json_file temps for the file itself, its backup link and its snapshot meta file
+    return re.compile(rf'^(\d+)_{re.escape(os.path.basename(filepath))}(\.bak|\.meta)?$')
+
+
+def _fsync_directory(directory: str):
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        # Not supported on every platform (e.g. Windows); the rename itself is still atomic there
+        return
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def write_json_file(json_data: str, filepath: str, backup: bool = True, durable: bool = True):
+    # The previous version stays readable at every point: the new data is fsynced under a temp name, the old file is
+    # kept as a hardlinked .bak generation, and os.replace swaps the new file in atomically
     millis_prefix = round(time.time() * 1000)
-    filepath_final = f'{Conf.BASE_PATH}/{Conf.GAME_FILE}'
-    filepath_temp = f'{Conf.BASE_PATH}/{millis_prefix}_{Conf.GAME_FILE}'
+    filepath_final = filepath
+    directory = os.path.dirname(filepath_final) or '.'
+    filepath_temp = os.path.join(directory, f'{millis_prefix}_{os.path.basename(filepath_final)}')
 
     try:
         with open(filepath_temp, 'w', encoding="utf8") as outfile:
-            json_data = game.model_dump_json(indent=2, by_alias=True)
             outfile.write(json_data)
-
-        if os.path.isfile(filepath_final):
-            os.remove(filepath_final)
-        os.rename(filepath_temp, filepath_final)
+            if durable:
+                outfile.flush()
+                os.fsync(outfile.fileno())
+
+        if backup and os.path.isfile(filepath_final):
+            backup_temp = f'{filepath_temp}.bak'
+            try:
+                os.link(filepath_final, backup_temp)
+            except OSError:
+                shutil.copy2(filepath_final, backup_temp)
+            os.replace(backup_temp, backup_path(filepath_final))
+
+        os.replace(filepath_temp, filepath_final)
+        if durable:
+            _fsync_directory(directory)
 
         logger.info(f'Wrote game data to {filepath_final}')
     except Exception as e:
@@ -478,13 +770,508 @@ def write_dom_to_json(game: Game):
         raise
 
 
+def recover_json_file(filepath: str, model: type[BaseModel]) -> Optional[str]:
+    # Restores a missing or unreadable file from the newest valid leftover temp file or its .bak generation, and
+    # removes leftover temp files. Returns the path the file was restored from, if any.
+    directory = os.path.dirname(filepath) or '.'
+    if not os.path.isdir(directory):
+        return None
+
+    temp_file_pattern = _temp_file_pattern(filepath)
+    temp_files = sorted(((int(match.group(1)), match.group(2) is None, os.path.join(directory, file_name))
+                         for file_name in os.listdir(directory)
+                         if (match := temp_file_pattern.match(file_name))), reverse=True)
+
+    def is_valid(candidate_path: str) -> bool:
+        try:
+            with open(candidate_path, 'rb') as candidate_file:
+                json_data = candidate_file.read()
+            # A snapshot matching its checksum is validated when it is loaded; parsing it here would do it twice
+            if candidate_path == filepath and is_trusted_snapshot(json_data=json_data, filepath=filepath):
+                return True
+            model.model_validate_json(json_data)
+            return True
+        except (OSError, ValueError):
+            return False
+
+    restored_from = None
+    if not is_valid(filepath):
+        candidate_paths = [temp_path for _, is_data_file, temp_path in temp_files if is_data_file]
+        for candidate_path in candidate_paths + [backup_path(filepath)]:
+            if not is_valid(candidate_path):
+                continue
+            if os.path.exists(filepath):
+                corrupt_path = f'{filepath}.corrupt'
+                os.replace(filepath, corrupt_path)
+                logger.warning(f'Moved unreadable {filepath} to {corrupt_path}')
+            if candidate_path == backup_path(filepath):
+                shutil.copy2(candidate_path, filepath)
+            else:
+                os.replace(candidate_path, filepath)
+            restored_from = candidate_path
+            logger.warning(f'Recovered {filepath} from {candidate_path}')
+            break
+        else:
+            if os.path.exists(filepath):
+                logger.error(f'{filepath} is unreadable and no valid temp or backup file was found to recover from!')
+
+    for _, _, temp_path in temp_files:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+            logger.info(f'Removed leftover temp file {temp_path}')
+    _fsync_directory(directory)
+    return restored_from
+
+
+class GameCatalog(BaseModel):
+    # The static part of a Game, persisted as its own segment when Conf.GAME_CATALOG_FILE is set
+    model_config = {'populate_by_name': True}
+
+    action_type_definitions: List[ActionTypeDefinition] = Field(default_factory=list, alias='action_type_defs')
+    item_type_definitions: List[ItemTypeDefinition] = Field(default_factory=list, alias='item_type_defs')
+    resource_definitions: List[ResourceDefinition] = Field(default_factory=list, alias='resource_defs')
+    attribute_definitions: List[AttributeDefinition] = Field(default_factory=list, alias='attribute_defs')
+    skills: List[Skill] = Field(default_factory=list)
+    status_modifiers: List[StatusModifier] = Field(default_factory=list, alias='status_mods')
+    actions: List[Action] = Field(default_factory=list)
+    items: List[Item] = Field(default_factory=list)
+
+
+CATALOG_FIELDS: Set[str] = set(GameCatalog.model_fields)
+
+
+def stat_file_key(file_path: str) -> Optional[tuple[int, int, int]]:
+    try:
+        file_stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino
+
+
+class GameStorageBackend:
+    """
+    Interface for the storage behind get_game/write_game. file_path is the configured game location (Conf.GAME_PATH);
+    cache_key (by default its mtime/size/inode) is what GameStore uses to decide whether the resident game is stale.
+    """
+    name: str = ''
+    # Whether save_events can persist journal events without a full save
+    supports_events: bool = False
+
+    def cache_key(self, file_path: str) -> Optional[tuple]:
+        return stat_file_key(file_path)
+
+    def load(self, file_path: str) -> Game:
+        raise NotImplementedError
+
+    def dump(self, game: Game, file_path: str, include_catalog: bool = True) -> Any:
+        # Everything save_dump writes, captured from the game on the event loop: the storage worker never reads the
+        # live game, which commands keep mutating while a write is in flight.
+        # include_catalog=False allows backends that store the catalog separately to leave it untouched
+        raise NotImplementedError
+
+    def save_dump(self, dump: Any, file_path: str):
+        raise NotImplementedError
+
+    def save(self, game: Game, file_path: str, include_catalog: bool = True):
+        self.save_dump(dump=self.dump(game=game, file_path=file_path, include_catalog=include_catalog),
+                       file_path=file_path)
+
+    def dump_events(self, game: Game, events: list) -> Any:
+        # The rows touched by already-applied journal events, captured on the event loop like dump
+        return None
+
+    def save_event_dump(self, dump: Any, file_path: str) -> bool:
+        # False means a full save is required
+        return False
+
+    def save_events(self, game: Game, events: list, file_path: str) -> bool:
+        return self.save_event_dump(dump=self.dump_events(game=game, events=events), file_path=file_path)
+
+
+class JsonGameStorage(GameStorageBackend):
+    name = 'json'
+
+    def __init__(self, catalog_path: Optional[str] = None):
+        # With a catalog path the game file only holds the mutable state; the catalog is stitched in on load
+        self.catalog_path: Optional[str] = catalog_path
+        self._catalog: Optional[GameCatalog] = None
+        self._catalog_key: Optional[tuple[int, int, int]] = None
+
+    def cache_key(self, file_path: str) -> Optional[tuple]:
+        if not self.catalog_path:
+            return stat_file_key(file_path)
+        return stat_file_key(file_path), stat_file_key(self.catalog_path)
+
+    def _load_catalog(self) -> Optional[GameCatalog]:
+        catalog_key = stat_file_key(self.catalog_path)
+        if catalog_key is None:
+            return None
+        if self._catalog is None or catalog_key != self._catalog_key:
+            logger.info(f'Loading game catalog from {self.catalog_path}')
+            with open(self.catalog_path, 'r', encoding="utf8") as openfile:
+                self._catalog = GameCatalog.model_validate_json(openfile.read())
+            self._catalog_key = catalog_key
+        return self._catalog
+
+    def load(self, file_path: str) -> Game:
+        if not self.catalog_path:
+            return read_json_to_dom(filepath=file_path)
+
+        catalog = self._load_catalog()
+        if catalog is None:
+            # Not split yet; the game file still carries the catalog and the next save writes the segment
+            return read_json_to_dom(filepath=file_path)
+
+        return read_json_to_dom(filepath=file_path, catalog=catalog)
+
+    def dump(self, game: Game, file_path: str,
+             include_catalog: bool = True) -> tuple[str, Optional[GameCatalog], Optional[str]]:
+        # (game JSON, catalog, catalog JSON); the catalog is only dumped when its segment is to be rewritten
+        if not self.catalog_path:
+            return game_to_json(game=game), None, None
+
+        if include_catalog or not os.path.isfile(self.catalog_path):
+            catalog = GameCatalog.model_validate({field_name: getattr(game, field_name) for field_name in CATALOG_FIELDS})
+            return game_to_json(game=game, exclude=CATALOG_FIELDS), catalog, catalog.model_dump_json(indent=2,
+                                                                                                    by_alias=True)
+        return game_to_json(game=game, exclude=CATALOG_FIELDS), None, None
+
+    def save_dump(self, dump: tuple[str, Optional[GameCatalog], Optional[str]], file_path: str):
+        game_json, catalog, catalog_json = dump
+        if catalog_json is not None:
+            write_json_file(json_data=catalog_json, filepath=self.catalog_path)
+            self._catalog = catalog
+            self._catalog_key = stat_file_key(self.catalog_path)
+        write_snapshot_json(json_data=game_json, filepath=file_path)
+
+
+def recover_game_files():
+    # SQLite recovers through its own journal; only the JSON files need checking on startup
+    if Conf.STORAGE_BACKEND != 'json':
+        return
+    recover_json_file(filepath=Conf.GAME_PATH, model=Game)
+    if Conf.GAME_CATALOG_PATH:
+        recover_json_file(filepath=Conf.GAME_CATALOG_PATH, model=GameCatalog)
+
+
+def get_storage_backend(backend_name: Optional[str] = None) -> GameStorageBackend:
+    backend_name = backend_name if backend_name else Conf.STORAGE_BACKEND
+    if backend_name == 'sqlite':
+        from bot.model.sqlite_storage import SqliteGameStorage
+        return SqliteGameStorage()
+    elif backend_name == 'json':
+        return JsonGameStorage(catalog_path=Conf.GAME_CATALOG_PATH)
+    raise ValueError(f'Unknown game storage backend {backend_name}!')
+
+
+class GameStore:
+    """
+    Process-wide cache of the validated Game. The resident game is only reloaded when the backing file's
+    mtime, size or inode changes on disk (e.g. after a manual edit), so repeated reads are effectively free.
+
+    When Conf.WRITE_BEHIND_INTERVAL is set, write_game only marks the resident game dirty and a background task
+    flushes it at most once per interval. Durability in that mode:
+      - a change is on disk no later than WRITE_BEHIND_INTERVAL seconds after write_game returns;
+      - flush_game forces the write immediately (used on shutdown, round-end and /game-checkpoint);
+      - a hard crash loses at most the changes made since the last completed flush;
+      - while the game is dirty the resident copy wins: on-disk edits made in that window are overwritten.
+
+    Storage itself is delegated to a GameStorageBackend (Conf.STORAGE_BACKEND): the JSON file, or SQLite, which can
+    persist journal events as single-row updates instead of rewriting the whole game. The static catalog is only
+    rewritten by writes flagged catalog_changed, for backends that keep it apart (SQLite, or JSON with
+    Conf.GAME_CATALOG_FILE set).
+
+    When Conf.JOURNAL_SNAPSHOT_EVERY is set, writes that describe themselves with journal events only append those
+    events to the game journal; a full snapshot is written every JOURNAL_SNAPSHOT_EVERY events, on any write
+    without events, and on flush_game. The journal is replayed on top of the snapshot whenever the game is loaded.
+
+    Blocking load/save work (file I/O, fsync, parsing, validation) runs on a single dedicated worker thread, so it
+    never stalls the event loop. Saves are serialized on the loop first (GameStorageBackend.dump), so the worker
+    never reads the live game while commands mutate it; the loop stalls for one serialization per save. One worker
+    keeps writes in submission order; while any are in flight the resident game is authoritative, since the file on
+    disk is mid-replacement by our own write.
+    """
+
+    def __init__(self, backend: Optional[GameStorageBackend] = None):
+        self.backend: GameStorageBackend = backend if backend else get_storage_backend()
+        self._game: Optional[Game] = None
+        self._file_path: Optional[str] = None
+        self._file_key: Optional[tuple] = None
+        self._dirty: bool = False
+        self._catalog_dirty: bool = False
+        self._flush_task: Optional[asyncio.Task] = None
+        self._last_flush: float = 0.0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.flushes: int = 0
+        self.coalesced_writes: int = 0
+        self.journal_pending: int = 0
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='game-io')
+        self._load_lock: asyncio.Lock = asyncio.Lock()
+        # Single writer for the resident game. Reads never take it and see the resident game as it is, which may
+        # include a mutation whose write is still in flight; commands re-check their preconditions under the lock
+        self.mutation_lock: asyncio.Lock = asyncio.Lock()
+        self.mutations: int = 0
+        self.contended_mutations: int = 0
+        self._pending_io: int = 0
+
+    async def run_io(self, func, *args, **kwargs):
+        self._pending_io += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor,
+                                                                    functools.partial(func, *args, **kwargs))
+        finally:
+            self._pending_io -= 1
+
+    def _cached(self, file_path: str) -> Optional[Game]:
+        if self._game is None or file_path != self._file_path:
+            return None
+        if self._dirty or self._pending_io or self.backend.cache_key(file_path) == self._file_key:
+            return self._game
+        return None
+
+    def _load(self, file_path: str) -> tuple[Game, int, Optional[tuple]]:
+        import bot.model.game_journal as journal
+
+        file_key = self.backend.cache_key(file_path)
+        game = self.backend.load(file_path=file_path)
+        replayed = journal.replay_journal(game=game, game_path=file_path)
+        return game, replayed, file_key
+
+    async def get(self, file_path: str) -> Game:
+        game = self._cached(file_path)
+        if game is not None:
+            self.hits += 1
+            return game
+
+        # Concurrent misses must share one load, otherwise commands would mutate different Game instances
+        async with self._load_lock:
+            game = self._cached(file_path)
+            if game is not None:
+                self.hits += 1
+                return game
+
+            self.misses += 1
+            logger.info(f'Game cache miss; loading game info from {file_path}')
+            game, self.journal_pending, file_key = await self.run_io(self._load, file_path)
+            game.take_dirty_sections()
+            self._game = game
+            self._file_path = file_path
+            self._file_key = file_key
+            return self._game
+
+    def put(self, game: Game, file_path: str):
+        self._game = game
+        self._file_path = file_path
+        self._file_key = self.backend.cache_key(file_path)
+
+    def has_unsaved_changes(self) -> bool:
+        # Pending write-behind changes, or changes whose save failed, exist only in the resident game
+        return self._dirty or (self._game is not None and bool(self._game.get_dirty_sections()))
+
+    def invalidate(self):
+        if self._dirty:
+            logger.warning(f'Dropping cached game with unflushed changes for {self._file_path}')
+            self._cancel_flush_task()
+            self._dirty = False
+        self._game = None
+        self._file_path = None
+        self._file_key = None
+
+    def mark_dirty(self, game: Game, file_path: str, interval: float):
+        if self._dirty:
+            self.coalesced_writes += 1
+        self._game = game
+        self._file_path = file_path
+        self._dirty = True
+
+        if self._flush_task is None or self._flush_task.done():
+            delay = max(0.0, self._last_flush + interval - time.monotonic())
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later(delay))
+
+    async def _flush_later(self, delay: float):
+        await asyncio.sleep(delay)
+        try:
+            await self._flush()
+        except Exception as e:
+            logger.error(f'Background flush of game file failed, will retry: {e}')
+            self._flush_task = None
+            if self._dirty and Conf.WRITE_BEHIND_INTERVAL:
+                self.mark_dirty(self._game, self._file_path, Conf.WRITE_BEHIND_INTERVAL)
+
+    def _cancel_flush_task(self):
+        if self._flush_task is not None and not self._flush_task.done() \
+                and self._flush_task is not asyncio.current_task():
+            self._flush_task.cancel()
+        self._flush_task = None
+
+    async def append_events(self, game: Game, events: list, file_path: str):
+        import bot.model.game_journal as journal
+
+        # Sequence numbers are assigned here on the loop, so any snapshot serialized later agrees with the journal
+        records = journal.build_records(game=game, events=events)
+        dirty_sections = game.take_dirty_sections()
+        self._game = game
+        self._file_path = file_path
+        self.journal_pending += len(events)
+        try:
+            await self.run_io(journal.write_records, records=records, game_path=file_path)
+        except Exception:
+            game.restore_dirty_sections(dirty_sections)
+            raise
+
+    async def save_events(self, game: Game, events: list, file_path: str) -> bool:
+        if not self.backend.supports_events:
+            return False
+        dirty_sections = game.take_dirty_sections()
+        try:
+            dump = self.backend.dump_events(game=game, events=events)
+            saved = await self.run_io(self.backend.save_event_dump, dump=dump, file_path=file_path)
+        except Exception:
+            game.restore_dirty_sections(dirty_sections)
+            raise
+        if not saved:
+            game.restore_dirty_sections(dirty_sections)
+            return False
+        self.put(game=game, file_path=file_path)
+        return True
+
+    def mark_catalog_changed(self):
+        self._catalog_dirty = True
+
+    def _save(self, dump: Any, file_path: str, snapshot_seq: int):
+        import bot.model.game_journal as journal
+
+        self.backend.save_dump(dump=dump, file_path=file_path)
+        journal.compact_journal(game_path=file_path, snapshot_seq=snapshot_seq)
+
+    async def save(self, game: Game, file_path: str):
+        self._game = game
+        self._file_path = file_path
+        journal_pending = self.journal_pending
+        include_catalog = self._catalog_dirty
+        self._catalog_dirty = False
+        # Taken before the write is queued: changes made while it is in flight stay dirty for the next save
+        dirty_sections = game.take_dirty_sections()
+        try:
+            # Serialized here on the loop, together with the journal position it covers; the worker only writes
+            # the result out, so mutations made while the write is in flight can never leak into the snapshot
+            dump = self.backend.dump(game=game, file_path=file_path, include_catalog=include_catalog)
+            await self.run_io(self._save, dump=dump, file_path=file_path, snapshot_seq=game.journal_seq)
+        except Exception:
+            self._catalog_dirty = self._catalog_dirty or include_catalog
+            game.restore_dirty_sections(dirty_sections)
+            raise
+        self.put(game=game, file_path=file_path)
+        # Events journaled while the snapshot was being written are still pending
+        self.journal_pending = max(0, self.journal_pending - journal_pending)
+
+    async def _flush(self):
+        if not self._dirty and not self.journal_pending:
+            return
+        self._dirty = False
+        try:
+            await self.save(game=self._game, file_path=self._file_path)
+        except Exception:
+            self._dirty = True
+            raise
+        self._last_flush = time.monotonic()
+        self.flushes += 1
+
+    async def flush(self):
+        self._cancel_flush_task()
+        await self._flush()
+
+    async def close(self):
+        # Final flush on shutdown; the storage worker is stopped once it has finished every queued write
+        await self.flush()
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'flushes': self.flushes,
+                'coalesced_writes': self.coalesced_writes, 'mutations': self.mutations,
+                'contended_mutations': self.contended_mutations}
+
+
+game_store = GameStore()
+
+
 async def get_game(file_path: str) -> Game:
-    logger.info(f'Grabbing game info from {file_path}')
-    return read_json_to_dom(filepath=file_path)
+    return await game_store.get(file_path=file_path)
+
+
+async def write_game(game: Game, events: Optional[list] = None, catalog_changed: bool = False):
+    # events, when given, must fully describe the mutation made to game (see bot.model.game_journal)
+    # catalog_changed must be set when actions, items, skills, status modifiers or definitions were replaced
+    dirty_sections = game.get_dirty_sections()
+    if not dirty_sections and not catalog_changed:
+        logger.info(f'Skipping game write; nothing changed since the last save')
+        return
+    logger.info(f'Writing game; dirty sections: {", ".join(sorted(dirty_sections))}')
+    if catalog_changed:
+        game_store.mark_catalog_changed()
+    if events and await game_store.save_events(game=game, events=events, file_path=Conf.GAME_PATH):
+        return
+    if events and Conf.JOURNAL_SNAPSHOT_EVERY:
+        await game_store.append_events(game=game, events=events, file_path=Conf.GAME_PATH)
+        if game_store.journal_pending < Conf.JOURNAL_SNAPSHOT_EVERY:
+            return
+    if Conf.WRITE_BEHIND_INTERVAL:
+        game_store.mark_dirty(game=game, file_path=Conf.GAME_PATH, interval=Conf.WRITE_BEHIND_INTERVAL)
+        return
+    await game_store.save(game=game, file_path=Conf.GAME_PATH)
+
+
+async def write_new_game(game: Game):
+    # The new game's journal sequence starts over, so a journal left by the game it replaces would be replayed onto it
+    import bot.model.game_journal as journal
+
+    await game_store.run_io(journal.discard_journal, game_path=Conf.GAME_PATH)
+    await write_game(game=game, catalog_changed=True)
+
+
+class GameMutation:
+    # Handed out by mutate_game; commands record their journal events and catalog changes on it
+    def __init__(self, game: Game):
+        self.game: Game = game
+        self.events: list = []
+        self.catalog_changed: bool = False
+
+
+@contextlib.asynccontextmanager
+async def mutate_game(file_path: str = Conf.GAME_PATH):
+    # Serializes read-modify-write commands against the resident game and commits them on exit, so no two commands
+    # interleave between validating and writing. Keep Discord calls outside of the block; they would hold the lock.
+    if game_store.mutation_lock.locked():
+        game_store.contended_mutations += 1
+    async with game_store.mutation_lock:
+        game_store.mutations += 1
+        mutation = GameMutation(game=await get_game(file_path=file_path))
+        # A failed block is undone by reloading from disk, unless the resident game holds changes that are not on
+        # disk yet; those would be lost by a reload, so the game is snapshotted and only the block's changes undone
+        snapshot = mutation.game.model_dump() if game_store.has_unsaved_changes() else None
+        try:
+            yield mutation
+        except BaseException:
+            if snapshot is None:
+                logger.error(f'Game mutation failed; reloading game from {file_path}')
+                game_store.invalidate()
+            else:
+                logger.error(f'Game mutation failed; rolling back its changes to the resident game')
+                mutation.game.rollback(snapshot)
+            raise
+        await write_game(game=mutation.game, events=mutation.events if mutation.events else None,
+                         catalog_changed=mutation.catalog_changed)
+
+
+async def flush_game():
+    # Forces pending write-behind changes and journaled events into a full snapshot; a no-op when nothing is pending
+    await game_store.flush()
 
 
-async def write_game(game: Game):
-    write_dom_to_json(game=game)
+async def close_game():
+    # Flushes like flush_game, then stops the storage worker; the game cannot be loaded or saved afterwards
+    await game_store.close()
 
 
 async def read_players_file(file_path: str, game_attribute_definitions: Dict[str, AttributeDefinition] = None,
@@ -564,25 +1351,25 @@ async def read_players_file(file_path: str, game_attribute_definitions: Dict[str
             player_skills_list = list(filter(None, player_skills_str.split(';')))
             for player_skill_name in player_skills_list:
                 if player_skill_name in game_skills:
-                    player_skills.append(game_skills[player_skill_name])
+                    player_skills.append(game_skills[player_skill_name].model_copy(deep=True))
 
         if player_status_modifiers_str is not None:
             player_status_modifiers_list = list(filter(None, player_status_modifiers_str.split(';')))
             for player_status_modifier_name in player_status_modifiers_list:
                 if player_status_modifier_name in game_status_modifiers:
-                    player_status_modifiers.append(game_status_modifiers[player_status_modifier_name])
+                    player_status_modifiers.append(game_status_modifiers[player_status_modifier_name].model_copy(deep=True))
 
         if player_actions_str is not None:
             player_action_name_list = list(filter(None, player_actions_str.split(';')))
             for player_action_name in player_action_name_list:
                 if player_action_name in game_actions:
-                    player_actions.append(game_actions[player_action_name])
+                    player_actions.append(game_actions[player_action_name].model_copy(deep=True))
 
         if player_items_str is not None:
             player_item_name_list = list(filter(None, player_items_str.split(';')))
             for player_item_name in player_item_name_list:
                 if player_item_name in game_items:
-                    player_items.append(game_items[player_item_name])
+                    player_items.append(game_items[player_item_name].model_copy(deep=True))
 
         players.append(Player(player_id=player_id,
                               player_discord_name=player_discord_name,
@@ -762,7 +1549,7 @@ async def read_items_file(file_path: str, game_actions: Dict[str, Action] = None
         # Handle item action lookup if action_name is provided
         item_action = None
         if cleaned_row.get('action_name') and cleaned_row['action_name'] in game_actions:
-            item_action = game_actions[cleaned_row['action_name']]
+            item_action = game_actions[cleaned_row['action_name']].model_copy(deep=True)
         cleaned_row['item_action'] = item_action
         
         # Remove action_name from cleaned_row as it's not part of the Item model
@@ -0,0 +1,172 @@
+#! game_journal.py
+# Append-only journal of small game mutations, replayed on top of the last full game snapshot
+
+from pydantic import BaseModel, Field, ValidationError
+from typing import Optional, List, Literal, Union, Annotated
+from bot.botlogger.logging_manager import logger
+from bot.model.data_model import Game, Round, Dilemma, Vote, _fsync_directory
+import os
+
+
+class RoundVoteEvent(BaseModel):
+    event_type: Literal['round_vote'] = 'round_vote'
+    round_number: int
+    player_id: int
+    # None removes the player's vote (Unvote)
+    choice: Optional[str] = None
+    timestamp: int
+
+
+class DilemmaVoteEvent(BaseModel):
+    event_type: Literal['dilemma_vote'] = 'dilemma_vote'
+    round_number: int
+    dilemma_name: str
+    player_id: int
+    # None removes the player's vote (Unvote)
+    choice: Optional[str] = None
+    timestamp: int
+
+
+class ResourceDeltaEvent(BaseModel):
+    event_type: Literal['resource_delta'] = 'resource_delta'
+    player_id: int
+    resource_name: str
+    amount: int
+
+
+class ItemMovedEvent(BaseModel):
+    event_type: Literal['item_moved'] = 'item_moved'
+    item_name: str
+    # None means the item came from the game item catalog
+    from_player_id: Optional[int] = None
+    # None means the item was removed from the game
+    to_player_id: Optional[int] = None
+
+
+class PlayerKilledEvent(BaseModel):
+    event_type: Literal['player_killed'] = 'player_killed'
+    player_id: int
+    is_dead: bool
+
+
+GameEvent = Annotated[Union[RoundVoteEvent, DilemmaVoteEvent, ResourceDeltaEvent, ItemMovedEvent, PlayerKilledEvent],
+                      Field(discriminator='event_type')]
+
+
+class JournalRecord(BaseModel):
+    seq: int
+    event: GameEvent
+
+
+def journal_path(game_path: str) -> str:
+    return f'{game_path}.journal'
+
+
+def _apply_vote(voting: Union[Round, Dilemma], player_id: int, choice: Optional[str], timestamp: int):
+    current_vote = voting.get_player_vote(player_id)
+
+    if choice is None:
+        if current_vote is not None:
+            voting.remove_vote(current_vote)
+    elif current_vote is None:
+        voting.add_vote(Vote(player_id=player_id, choice=choice, timestamp=timestamp))
+    else:
+        voting.change_vote(current_vote, choice=choice, timestamp=timestamp)
+
+
+def apply_event(game: Game, event: GameEvent):
+    if isinstance(event, RoundVoteEvent):
+        game_round = game.get_round(event.round_number)
+        _apply_vote(game_round, event.player_id, event.choice, event.timestamp)
+    elif isinstance(event, DilemmaVoteEvent):
+        dilemma = game.get_round(event.round_number).get_dilemma(event.dilemma_name)
+        _apply_vote(dilemma, event.player_id, event.choice, event.timestamp)
+    elif isinstance(event, ResourceDeltaEvent):
+        game.get_player(event.player_id).modify_resource(resource_name=event.resource_name, amt=event.amount)
+    elif isinstance(event, ItemMovedEvent):
+        item = None
+        if event.from_player_id is not None:
+            from_player = game.get_player(event.from_player_id)
+            item = from_player.get_item(event.item_name)
+            from_player.remove_item(item)
+        if event.to_player_id is not None:
+            if item is None:
+                # Copied like the live command does, so a replayed game matches the one that wrote the journal
+                item = game.get_item(event.item_name).model_copy(deep=True)
+            game.get_player(event.to_player_id).add_item(item)
+    elif isinstance(event, PlayerKilledEvent):
+        game.get_player(event.player_id).is_dead = event.is_dead
+
+
+def build_records(game: Game, events: List[GameEvent]) -> str:
+    lines = []
+    for event in events:
+        game.journal_seq += 1
+        lines.append(JournalRecord(seq=game.journal_seq, event=event).model_dump_json() + '\n')
+    return ''.join(lines)
+
+
+def write_records(records: str, game_path: str):
+    # Records are durable once this returns; a torn trailing line from a crash is skipped on replay
+    with open(journal_path(game_path), 'a', encoding='utf8') as journal_file:
+        journal_file.write(records)
+        journal_file.flush()
+        os.fsync(journal_file.fileno())
+
+
+def read_records(game_path: str) -> List[JournalRecord]:
+    records = []
+    try:
+        with open(journal_path(game_path), 'r', encoding='utf8') as journal_file:
+            for line_num, line in enumerate(journal_file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append(JournalRecord.model_validate_json(line))
+                except ValidationError as e:
+                    logger.warning(f'Skipping unreadable journal record on line {line_num} of '
+                                   f'{journal_path(game_path)}: {e}')
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def replay_journal(game: Game, game_path: str) -> int:
+    replayed = 0
+    for record in read_records(game_path):
+        if record.seq <= game.journal_seq:
+            continue
+        apply_event(game, record.event)
+        game.journal_seq = record.seq
+        replayed += 1
+    if replayed:
+        logger.info(f'Replayed {replayed} journal record(s) onto game snapshot {game_path}')
+    return replayed
+
+
+def compact_journal(game_path: str, snapshot_seq: int):
+    # Called after a snapshot containing every record up to snapshot_seq has been written
+    path = journal_path(game_path)
+    if not os.path.isfile(path) or os.path.getsize(path) == 0:
+        return
+
+    remaining = [record for record in read_records(game_path) if record.seq > snapshot_seq]
+    # Swapped in like write_json_file does, so a crash mid-compaction leaves the old journal whole; records it still
+    # holds that the snapshot already covers are skipped on replay. A fixed temp name is simply overwritten next time.
+    compact_path = f'{path}.compact'
+    with open(compact_path, 'w', encoding='utf8') as journal_file:
+        journal_file.write(''.join(record.model_dump_json() + '\n' for record in remaining))
+        journal_file.flush()
+        os.fsync(journal_file.fileno())
+    os.replace(compact_path, path)
+    _fsync_directory(os.path.dirname(path) or '.')
+
+
+def discard_journal(game_path: str):
+    # Used when a new game replaces the one the journal belongs to
+    path = journal_path(game_path)
+    for stale_path in (path, f'{path}.compact'):
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+            logger.info(f'Discarded journal {stale_path} left from a previous game')
+    _fsync_directory(os.path.dirname(path) or '.')
@@ -0,0 +1,455 @@
+#! sqlite_storage.py
+# SQLite storage backend for Game, using normalized tables so that single mutations touch single rows
+
+import functools
+import json
+import sqlite3
+from typing import Callable, List, Dict, Optional
+from bot.botlogger.logging_manager import logger
+from bot.model.data_model import Game, Player, Vote, GameStorageBackend, CATALOG_FIELDS
+from bot.model.game_journal import RoundVoteEvent, DilemmaVoteEvent, ResourceDeltaEvent, ItemMovedEvent, \
+    PlayerKilledEvent
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS game (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    is_active INTEGER NOT NULL,
+    parties_locked INTEGER NOT NULL,
+    voting_locked INTEGER NOT NULL,
+    items_locked INTEGER NOT NULL,
+    resources_locked INTEGER NOT NULL,
+    journal_seq INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS players (
+    player_id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    player_discord_name TEXT NOT NULL,
+    player_mod_channel INTEGER,
+    is_dead INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_players_name ON players (player_discord_name);
+CREATE TABLE IF NOT EXISTS player_resources (
+    player_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    resource_type TEXT NOT NULL,
+    resource_amt INTEGER NOT NULL,
+    resource_income INTEGER,
+    resource_max INTEGER,
+    is_commodity INTEGER NOT NULL,
+    is_perishable INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_player_resources ON player_resources (player_id, resource_type);
+CREATE TABLE IF NOT EXISTS player_attributes (
+    player_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    max_level INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_player_attributes ON player_attributes (player_id, name);
+CREATE TABLE IF NOT EXISTS player_skills (player_id INTEGER NOT NULL, position INTEGER NOT NULL, name TEXT NOT NULL,
+                                          data TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_player_skills ON player_skills (player_id, name);
+CREATE TABLE IF NOT EXISTS player_status_mods (player_id INTEGER NOT NULL, position INTEGER NOT NULL,
+                                               name TEXT NOT NULL, data TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_player_status_mods ON player_status_mods (player_id, name);
+CREATE TABLE IF NOT EXISTS player_actions (player_id INTEGER NOT NULL, position INTEGER NOT NULL, name TEXT NOT NULL,
+                                           data TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_player_actions ON player_actions (player_id, name);
+CREATE TABLE IF NOT EXISTS player_items (player_id INTEGER NOT NULL, position INTEGER NOT NULL, name TEXT NOT NULL,
+                                         data TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_player_items ON player_items (player_id, name);
+CREATE TABLE IF NOT EXISTS parties (
+    channel_id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    party_name TEXT NOT NULL,
+    max_size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_parties_name ON parties (party_name);
+CREATE TABLE IF NOT EXISTS party_members (channel_id INTEGER NOT NULL, player_id INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_party_members_player ON party_members (player_id);
+CREATE TABLE IF NOT EXISTS rounds (
+    round_number INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    round_channel_id INTEGER NOT NULL,
+    round_message_id INTEGER NOT NULL,
+    is_active_round INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS round_votes (
+    round_number INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    choice TEXT NOT NULL,
+    timestamp INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_round_votes ON round_votes (round_number, player_id);
+CREATE TABLE IF NOT EXISTS dilemmas (
+    round_number INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    dilemma_name TEXT NOT NULL,
+    dilemma_channel_id INTEGER NOT NULL,
+    dilemma_message_id INTEGER NOT NULL,
+    is_active_dilemma INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_dilemmas ON dilemmas (round_number, dilemma_name);
+CREATE TABLE IF NOT EXISTS dilemma_votes (
+    round_number INTEGER NOT NULL,
+    dilemma_name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    choice TEXT NOT NULL,
+    timestamp INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_dilemma_votes ON dilemma_votes (round_number, dilemma_name, player_id);
+CREATE TABLE IF NOT EXISTS dilemma_players (round_number INTEGER NOT NULL, dilemma_name TEXT NOT NULL,
+                                            player_id INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_dilemma_players ON dilemma_players (round_number, dilemma_name);
+CREATE TABLE IF NOT EXISTS dilemma_choices (round_number INTEGER NOT NULL, dilemma_name TEXT NOT NULL,
+                                            choice TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_dilemma_choices ON dilemma_choices (round_number, dilemma_name);
+"""
+
+# Catalog sections and pi_views, stored whole per entry as (position, name, data)
+CATALOG_TABLES: Dict[str, str] = {
+    'action_type_definitions': 'action_type',
+    'item_type_definitions': 'item_type',
+    'resource_definitions': 'resource_name',
+    'attribute_definitions': 'attribute_name',
+    'skills': 'skill_name',
+    'status_modifiers': 'modifier_name',
+    'actions': 'action_name',
+    'items': 'item_name',
+    'pi_views': 'view_name',
+}
+
+# Player sub-lists stored per entry as (player_id, position, name, data)
+PLAYER_ENTRY_TABLES: Dict[str, tuple[str, str]] = {
+    'player_skills': ('player_skills', 'skill_name'),
+    'player_status_mods': ('player_status_mods', 'modifier_name'),
+    'player_actions': ('player_actions', 'action_name'),
+    'player_items': ('player_items', 'item_name'),
+}
+
+STATE_TABLES = ['game', 'players', 'player_resources', 'player_attributes', 'parties', 'party_members', 'rounds',
+                'round_votes', 'dilemmas', 'dilemma_votes', 'dilemma_players', 'dilemma_choices']
+
+
+def _connect(file_path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(file_path)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(SCHEMA)
+    for table in CATALOG_TABLES:
+        connection.execute(f'CREATE TABLE IF NOT EXISTS {table} (position INTEGER NOT NULL, name TEXT NOT NULL, '
+                           f'data TEXT NOT NULL)')
+        connection.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_name ON {table} (name)')
+    return connection
+
+
+def _insert_player_rows(connection: sqlite3.Connection, player: Player, position: int):
+    connection.execute('INSERT INTO players VALUES (?, ?, ?, ?, ?)',
+                       (player.player_id, position, player.player_discord_name, player.player_mod_channel,
+                        player.is_dead))
+    _insert_player_resources(connection, player)
+    connection.executemany('INSERT INTO player_attributes VALUES (?, ?, ?, ?, ?)',
+                           [(player.player_id, i, att.name, att.level, att.max_level)
+                            for i, att in enumerate(player.player_attributes)])
+    for table in PLAYER_ENTRY_TABLES:
+        _insert_player_entries(connection, player, table)
+
+
+def _player_resource_rows(player: Player) -> List[tuple]:
+    return [(player.player_id, i, res.resource_type, res.resource_amt, res.resource_income, res.resource_max,
+             res.is_commodity, res.is_perishable) for i, res in enumerate(player.player_resources)]
+
+
+def _insert_player_resources(connection: sqlite3.Connection, player: Player):
+    connection.executemany('INSERT INTO player_resources VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                           _player_resource_rows(player))
+
+
+def _player_entry_rows(player: Player, table: str) -> List[tuple]:
+    field_name, name_field = PLAYER_ENTRY_TABLES[table]
+    return [(player.player_id, i, getattr(entry, name_field), entry.model_dump_json())
+            for i, entry in enumerate(getattr(player, field_name))]
+
+
+def _insert_player_entries(connection: sqlite3.Connection, player: Player, table: str):
+    connection.executemany(f'INSERT INTO {table} VALUES (?, ?, ?, ?)', _player_entry_rows(player, table))
+
+
+def _replace_player_rows(connection: sqlite3.Connection, table: str, player_id: int, rows: List[tuple]):
+    connection.execute(f'DELETE FROM {table} WHERE player_id = ?', (player_id,))
+    if rows:
+        connection.executemany(f'INSERT INTO {table} VALUES ({", ".join("?" * len(rows[0]))})', rows)
+
+
+def _update_resource_amount(connection: sqlite3.Connection, player_id: int, resource_name: str,
+                            resource_amt: Optional[int], resource_rows: List[tuple]):
+    updated_rows = 0
+    if resource_amt is not None:
+        updated_rows = connection.execute('UPDATE player_resources SET resource_amt = ? WHERE player_id = ? AND '
+                                          'resource_type = ?', (resource_amt, player_id, resource_name)).rowcount
+    if updated_rows != 1:
+        # A transfer recipient may not hold the resource, which leaves the model unchanged; rewriting the player's
+        # rows from the model keeps them in line whatever the table held
+        _replace_player_rows(connection, 'player_resources', player_id, resource_rows)
+
+
+def _set_player_dead(connection: sqlite3.Connection, player_id: int, is_dead: bool):
+    connection.execute('UPDATE players SET is_dead = ? WHERE player_id = ?', (is_dead, player_id))
+
+
+def _upsert_vote_row(connection: sqlite3.Connection, table: str, key_sql: str, key_params: tuple, vote_columns: str,
+                     vote: Optional[Vote]) -> None:
+    if vote is None:
+        connection.execute(f'DELETE FROM {table} WHERE {key_sql}', key_params)
+        return
+
+    cursor = connection.execute(f'UPDATE {table} SET choice = ?, timestamp = ? WHERE {key_sql}',
+                                (vote.choice, vote.timestamp) + key_params)
+    if cursor.rowcount == 0:
+        # Appended votes go after every existing row, matching list.append on the model
+        owner_sql = key_sql.rsplit(' AND ', 1)[0]
+        next_position = connection.execute(f'SELECT COALESCE(MAX(position) + 1, 0) FROM {table} WHERE {owner_sql}',
+                                           key_params[:-1]).fetchone()[0]
+        connection.execute(f'INSERT INTO {table} ({vote_columns}) VALUES ({", ".join("?" * (len(key_params) + 3))})',
+                           key_params[:-1] + (next_position, vote.player_id, vote.choice, vote.timestamp))
+
+
+class SqliteGameStorage(GameStorageBackend):
+    name = 'sqlite'
+    supports_events = True
+
+    def __init__(self):
+        # Databases this backend has loaded a game from or saved one to
+        self._game_paths: set[str] = set()
+
+    def load(self, file_path: str) -> Game:
+        connection = _connect(file_path)
+        try:
+            game = Game.model_validate(self._read_game_dict(connection))
+            self._game_paths.add(file_path)
+            return game
+        except Exception as e:
+            logger.error(f'Error while reading game database from {file_path}: {e}')
+            raise
+        finally:
+            connection.close()
+
+    def dump(self, game: Game, file_path: str, include_catalog: bool = True) -> tuple[str, bool]:
+        # A database not yet known to hold a game gets the catalog too
+        include_catalog = include_catalog or file_path not in self._game_paths
+        return game.model_dump_json(by_alias=True, exclude=None if include_catalog else CATALOG_FIELDS), include_catalog
+
+    def save_dump(self, dump: tuple[str, bool], file_path: str):
+        game_json, include_catalog = dump
+        connection = _connect(file_path)
+        try:
+            if not include_catalog and connection.execute('SELECT COUNT(*) FROM game').fetchone()[0] == 0:
+                self._game_paths.discard(file_path)
+                raise ValueError(f'Game database {file_path} was emptied; the next save rewrites the catalog')
+            # Rows are written across many statements from a private copy of the game
+            game = Game.model_validate_json(game_json)
+            tables = [table for table in CATALOG_TABLES if include_catalog or table not in CATALOG_FIELDS]
+            with connection:
+                for table in STATE_TABLES + tables + list(PLAYER_ENTRY_TABLES):
+                    connection.execute(f'DELETE FROM {table}')
+                self._write_game_rows(connection, game, tables)
+            self._game_paths.add(file_path)
+            logger.info(f'Wrote game data to {file_path}')
+        except Exception as e:
+            logger.error(f'Error writing game database to {file_path}: {e}')
+            raise
+        finally:
+            connection.close()
+
+    def dump_events(self, game: Game, events: list) -> tuple[List[Callable[[sqlite3.Connection], None]], int]:
+        return [row_write for event in events for row_write in self._event_row_writes(game, event)], game.journal_seq
+
+    def save_event_dump(self, dump: tuple[List[Callable[[sqlite3.Connection], None]], int], file_path: str) -> bool:
+        row_writes, journal_seq = dump
+        connection = _connect(file_path)
+        try:
+            with connection:
+                for row_write in row_writes:
+                    row_write(connection)
+                connection.execute('UPDATE game SET journal_seq = ?', (journal_seq,))
+            logger.info(f'Wrote {len(row_writes)} game row update(s) to {file_path}')
+        except Exception as e:
+            logger.error(f'Error writing game events to {file_path}: {e}')
+            raise
+        finally:
+            connection.close()
+        return True
+
+    @staticmethod
+    def _event_row_writes(game: Game, event) -> List[Callable[[sqlite3.Connection], None]]:
+        # Events have already been applied to game; the rows are brought in line with the resulting model state. Every
+        # value is read from game here, so the returned writes no longer depend on it.
+        if isinstance(event, RoundVoteEvent):
+            vote = game.get_round(event.round_number).get_player_vote(event.player_id)
+            return [functools.partial(_upsert_vote_row, table='round_votes',
+                                      key_sql='round_number = ? AND player_id = ?',
+                                      key_params=(event.round_number, event.player_id),
+                                      vote_columns='round_number, position, player_id, choice, timestamp',
+                                      vote=vote.model_copy() if vote else None)]
+        elif isinstance(event, DilemmaVoteEvent):
+            dilemma = game.get_round(event.round_number).get_dilemma(event.dilemma_name)
+            vote = dilemma.get_player_vote(event.player_id)
+            return [functools.partial(_upsert_vote_row, table='dilemma_votes',
+                                      key_sql='round_number = ? AND dilemma_name = ? AND player_id = ?',
+                                      key_params=(event.round_number, event.dilemma_name, event.player_id),
+                                      vote_columns='round_number, dilemma_name, position, player_id, choice, timestamp',
+                                      vote=vote.model_copy() if vote else None)]
+        elif isinstance(event, ResourceDeltaEvent):
+            player = game.get_player(event.player_id)
+            resource = player.get_resource(event.resource_name)
+            return [functools.partial(_update_resource_amount, player_id=event.player_id,
+                                      resource_name=event.resource_name,
+                                      resource_amt=resource.resource_amt if resource else None,
+                                      resource_rows=_player_resource_rows(player))]
+        elif isinstance(event, ItemMovedEvent):
+            return [functools.partial(_replace_player_rows, table='player_items', player_id=player_id,
+                                      rows=_player_entry_rows(game.get_player(player_id), 'player_items'))
+                    for player_id in (event.from_player_id, event.to_player_id) if player_id is not None]
+        elif isinstance(event, PlayerKilledEvent):
+            return [functools.partial(_set_player_dead, player_id=event.player_id, is_dead=event.is_dead)]
+        return []
+
+    @staticmethod
+    def _write_game_rows(connection: sqlite3.Connection, game: Game, catalog_tables: List[str]):
+        connection.execute('INSERT INTO game VALUES (1, ?, ?, ?, ?, ?, ?)',
+                           (game.is_active, game.parties_locked, game.voting_locked, game.items_locked,
+                            game.resources_locked, game.journal_seq))
+
+        for position, player in enumerate(game.players):
+            _insert_player_rows(connection, player, position)
+
+        for position, party in enumerate(game.parties):
+            connection.execute('INSERT INTO parties VALUES (?, ?, ?, ?)',
+                               (party.channel_id, position, party.party_name, party.max_size))
+            connection.executemany('INSERT INTO party_members VALUES (?, ?)',
+                                   [(party.channel_id, player_id) for player_id in party.player_ids])
+
+        for position, game_round in enumerate(game.rounds):
+            connection.execute('INSERT INTO rounds VALUES (?, ?, ?, ?, ?)',
+                               (game_round.round_number, position, game_round.round_channel_id,
+                                game_round.round_message_id, game_round.is_active_round))
+            connection.executemany('INSERT INTO round_votes VALUES (?, ?, ?, ?, ?)',
+                                   [(game_round.round_number, i, vote.player_id, vote.choice, vote.timestamp)
+                                    for i, vote in enumerate(game_round.votes)])
+            for dilemma_position, dilemma in enumerate(game_round.round_dilemmas):
+                dilemma_key = (game_round.round_number, dilemma.dilemma_name)
+                connection.execute('INSERT INTO dilemmas VALUES (?, ?, ?, ?, ?, ?)',
+                                   (game_round.round_number, dilemma_position, dilemma.dilemma_name,
+                                    dilemma.dilemma_channel_id, dilemma.dilemma_message_id,
+                                    dilemma.is_active_dilemma))
+                connection.executemany('INSERT INTO dilemma_votes VALUES (?, ?, ?, ?, ?, ?)',
+                                       [dilemma_key + (i, vote.player_id, vote.choice, vote.timestamp)
+                                        for i, vote in enumerate(dilemma.dilemma_votes)])
+                connection.executemany('INSERT INTO dilemma_players VALUES (?, ?, ?)',
+                                       [dilemma_key + (player_id,) for player_id in dilemma.dilemma_player_ids])
+                connection.executemany('INSERT INTO dilemma_choices VALUES (?, ?, ?)',
+                                       [dilemma_key + (choice,) for choice in dilemma.dilemma_choices])
+
+        for table in catalog_tables:
+            name_field = CATALOG_TABLES[table]
+            connection.executemany(f'INSERT INTO {table} VALUES (?, ?, ?)',
+                                   [(i, getattr(entry, name_field), entry.model_dump_json(by_alias=True))
+                                    for i, entry in enumerate(getattr(game, table))])
+
+    @staticmethod
+    def _read_game_dict(connection: sqlite3.Connection) -> Dict:
+        game_row = connection.execute('SELECT * FROM game WHERE id = 1').fetchone()
+        if game_row is None:
+            raise ValueError('Game database does not contain a game!')
+
+        def rows(sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+            return connection.execute(sql, params).fetchall()
+
+        def grouped(table: str, key: str) -> Dict[int, List[sqlite3.Row]]:
+            groups: Dict[int, List[sqlite3.Row]] = {}
+            for row in rows(f'SELECT * FROM {table} ORDER BY position'):
+                groups.setdefault(row[key], []).append(row)
+            return groups
+
+        resources = grouped('player_resources', 'player_id')
+        attributes = grouped('player_attributes', 'player_id')
+        entries = {table: grouped(table, 'player_id') for table in PLAYER_ENTRY_TABLES}
+
+        players = []
+        for row in rows('SELECT * FROM players ORDER BY position'):
+            player_id = row['player_id']
+            player = {
+                'player_id': player_id,
+                'player_discord_name': row['player_discord_name'],
+                'player_mod_channel': row['player_mod_channel'],
+                'is_dead': bool(row['is_dead']),
+                'player_resources': [{'resource_type': res['resource_type'],
+                                      'resource_amt': res['resource_amt'],
+                                      'resource_income': res['resource_income'],
+                                      'resource_max': res['resource_max'],
+                                      'is_commodity': bool(res['is_commodity']),
+                                      'is_perishable': bool(res['is_perishable'])}
+                                     for res in resources.get(player_id, [])],
+                'player_attributes': [{'name': att['name'], 'level': att['level'], 'max_level': att['max_level']}
+                                      for att in attributes.get(player_id, [])],
+            }
+            for table, (field_name, _) in PLAYER_ENTRY_TABLES.items():
+                player[field_name] = [json.loads(entry['data']) for entry in entries[table].get(player_id, [])]
+            players.append(player)
+
+        party_members: Dict[int, List[int]] = {}
+        for row in rows('SELECT * FROM party_members'):
+            party_members.setdefault(row['channel_id'], []).append(row['player_id'])
+        parties = [{'channel_id': row['channel_id'], 'party_name': row['party_name'], 'max_size': row['max_size'],
+                    'player_ids': party_members.get(row['channel_id'], [])}
+                   for row in rows('SELECT * FROM parties ORDER BY position')]
+
+        round_votes = grouped('round_votes', 'round_number')
+        rounds = []
+        for row in rows('SELECT * FROM rounds ORDER BY position'):
+            round_number = row['round_number']
+            dilemmas = []
+            for dilemma in rows('SELECT * FROM dilemmas WHERE round_number = ? ORDER BY position', (round_number,)):
+                dilemma_key = (round_number, dilemma['dilemma_name'])
+                dilemmas.append({
+                    'dilemma_name': dilemma['dilemma_name'],
+                    'dilemma_channel_id': dilemma['dilemma_channel_id'],
+                    'dilemma_message_id': dilemma['dilemma_message_id'],
+                    'is_active_dilemma': bool(dilemma['is_active_dilemma']),
+                    'dilemma_votes': [{'player_id': vote['player_id'], 'choice': vote['choice'],
+                                       'timestamp': vote['timestamp']}
+                                      for vote in rows('SELECT * FROM dilemma_votes WHERE round_number = ? AND '
+                                                       'dilemma_name = ? ORDER BY position', dilemma_key)],
+                    'dilemma_player_ids': [player['player_id'] for player in
+                                           rows('SELECT player_id FROM dilemma_players WHERE round_number = ? AND '
+                                                'dilemma_name = ?', dilemma_key)],
+                    'dilemma_choices': [choice['choice'] for choice in
+                                        rows('SELECT choice FROM dilemma_choices WHERE round_number = ? AND '
+                                             'dilemma_name = ?', dilemma_key)],
+                })
+            rounds.append({
+                'round_number': round_number,
+                'round_channel_id': row['round_channel_id'],
+                'round_message_id': row['round_message_id'],
+                'is_active_round': bool(row['is_active_round']),
+                'votes': [{'player_id': vote['player_id'], 'choice': vote['choice'], 'timestamp': vote['timestamp']}
+                          for vote in round_votes.get(round_number, [])],
+                'round_dilemmas': dilemmas,
+            })
+
+        game_dict = {
+            'is_active': bool(game_row['is_active']),
+            'parties_locked': bool(game_row['parties_locked']),
+            'voting_locked': bool(game_row['voting_locked']),
+            'items_locked': bool(game_row['items_locked']),
+            'resources_locked': bool(game_row['resources_locked']),
+            'journal_seq': game_row['journal_seq'],
+            'players': players,
+            'parties': parties,
+            'rounds': rounds,
+        }
+        for table in CATALOG_TABLES:
+            game_dict[table] = [json.loads(row['data']) for row in rows(f'SELECT data FROM {table} ORDER BY position')]
+        return game_dict
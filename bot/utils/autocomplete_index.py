@@ -0,0 +1,232 @@
+#! autocomplete_index.py
+# Precomputed name indexes for autocompletes: names are normalized and sorted once per game change, and each
+# keystroke is answered by a prefix range lookup, a trigram-narrowed substring scan and, only when those find nothing,
+# typo tolerant fuzzy matching
+
+import heapq
+import re
+from collections import Counter
+from bisect import bisect_left
+from enum import IntEnum
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+from bot.model.data_model import Game
+
+# Discord shows at most 25 autocomplete choices
+MAX_CHOICES = 25
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+class MatchTier(IntEnum):
+    # Lower tiers rank first
+    EXACT = 0
+    PREFIX = 1
+    WORD_PREFIX = 2
+    SUBSTRING = 3
+    SUBSEQUENCE = 4
+    TYPO = 5
+
+
+# Queries shorter than this only match by prefix or substring; fuzzy matches of one or two letters are noise
+MIN_FUZZY_LENGTH = 3
+
+# Most typos tolerated in any query
+MAX_TYPOS = 2
+
+# Offsets from each word start covered by the anchored letter index; the typo filter checks the query letters that
+# fall within it
+ANCHORED_OFFSETS = 8
+
+
+def max_typos(query: str) -> int:
+    return 1 if len(query) < 6 else MAX_TYPOS
+
+
+def bounded_prefix_edit_distance(query: str, target: str, bound: int) -> Optional[int]:
+    # Smallest edit distance between the query and any prefix of target, counting an adjacent swap as one typo
+    # (optimal string alignment). Only cells within bound of the diagonal can stay within bound, so only those are
+    # computed, and the search is abandoned as soon as every cell of a row exceeds the bound.
+    if len(target) < len(query) - bound:
+        return None
+    over_bound = bound + 1
+    before_previous_row = None
+    previous_row = [j if j <= bound else over_bound for j in range(len(target) + 1)]
+    for i, query_char in enumerate(query, 1):
+        current_row = [over_bound] * (len(target) + 1)
+        if i <= bound:
+            current_row[0] = i
+        for j in range(max(1, i - bound), min(len(target), i + bound) + 1):
+            target_char = target[j - 1]
+            distance = min(previous_row[j] + 1, current_row[j - 1] + 1,
+                           previous_row[j - 1] + (query_char != target_char))
+            if i > 1 and j > 1 and query_char == target[j - 2] and query[i - 2] == target_char:
+                distance = min(distance, before_previous_row[j - 2] + 1)
+            current_row[j] = min(distance, over_bound)
+        if min(current_row) > bound:
+            return None
+        before_previous_row, previous_row = previous_row, current_row
+    distance = min(previous_row[max(0, len(query) - bound):])
+    return distance if distance <= bound else None
+
+
+def near_letters_match(query: str, word: str, checked_letters: int, bound: int) -> bool:
+    # Whether all but bound of the query's leading letters occur within bound letters of their place in word
+    missing = 0
+    for offset in range(checked_letters):
+        if query[offset] not in word[max(0, offset - bound):offset + bound + 1]:
+            missing += 1
+            if missing > bound:
+                return False
+    return True
+
+
+def subsequence_span(query: str, name: str) -> Optional[int]:
+    # Length of the stretch of name the query's letters were found in, in order; None when they are not all there
+    position = name.find(query[0])
+    if position == -1:
+        return None
+    first_position = position
+    for query_char in query[1:]:
+        position = name.find(query_char, position + 1)
+        if position == -1:
+            return None
+    return position - first_position + 1
+
+
+class NameIndex:
+    __slots__ = ('names', 'values', '_word_starts', '_trigrams', '_letter_positions', '_anchored_letters')
+
+    def __init__(self, entries: Iterable[tuple[str, Any]]):
+        ordered_entries = sorted(((name.lower(), value) for name, value in entries), key=lambda e: e[0])
+        self.names: List[str] = [name for name, _ in ordered_entries]
+        self.values: List[Any] = [value for _, value in ordered_entries]
+        # Offsets where a word begins inside each name, after the first one
+        self._word_starts: List[tuple[int, ...]] = [tuple(match.start() for match in WORD_PATTERN.finditer(name)
+                                                          if match.start() > 0) for name in self.names]
+        # Positions of the names containing each trigram, in ascending (alphabetical) order
+        self._trigrams: Dict[str, List[int]] = {}
+        for position, name in enumerate(self.names):
+            for trigram in {name[i:i + 3] for i in range(len(name) - 2)}:
+                self._trigrams.setdefault(trigram, []).append(position)
+        # Positions of the names containing each letter
+        self._letter_positions: Dict[str, set] = {}
+        for position, name in enumerate(self.names):
+            for letter in set(name):
+                self._letter_positions.setdefault(letter, set()).add(position)
+        # Positions of the names having a letter at an offset from the start of the name or of one of its words
+        self._anchored_letters: Dict[tuple[int, str], set] = {}
+        for position, name in enumerate(self.names):
+            for word_start in (0, *self._word_starts[position]):
+                for offset, letter in enumerate(name[word_start:word_start + ANCHORED_OFFSETS]):
+                    self._anchored_letters.setdefault((offset, letter), set()).add(position)
+
+    def search(self, text: Optional[str], limit: int = MAX_CHOICES,
+               accept: Optional[Callable[[Any], bool]] = None) -> List[Any]:
+        # Ranked by match tier, then by how tight the match is, then alphabetically; the top results are picked
+        # with a heap, and the fuzzy tiers are only scored for queries that match no name by prefix or substring
+        query = text.lower() if text else ''
+        ranked: List[tuple[int, int, int]] = []
+        scored_positions = set()
+
+        position = bisect_left(self.names, query)
+        while position < len(self.names) and self.names[position].startswith(query):
+            scored_positions.add(position)
+            if accept is None or accept(self.values[position]):
+                tier = MatchTier.EXACT if self.names[position] == query else MatchTier.PREFIX
+                ranked.append((tier, 0, position))
+                # Prefix matches outrank everything else and arrive in order, so a full page ends the search
+                if len(ranked) >= limit:
+                    return [self.values[position] for _, _, position in ranked]
+            position += 1
+
+        if not query:
+            return [self.values[position] for _, _, position in ranked]
+
+        for position in self._substring_candidates(query):
+            if position in scored_positions:
+                continue
+            offset = self.names[position].find(query)
+            if offset == -1:
+                continue
+            scored_positions.add(position)
+            if accept is None or accept(self.values[position]):
+                tier = MatchTier.WORD_PREFIX if offset in self._word_starts[position] else MatchTier.SUBSTRING
+                ranked.append((tier, offset, position))
+
+        if not scored_positions and len(query) >= MIN_FUZZY_LENGTH:
+            for position in self._subsequence_candidates(query):
+                span = subsequence_span(query, self.names[position])
+                if span is None:
+                    continue
+                scored_positions.add(position)
+                if accept is None or accept(self.values[position]):
+                    ranked.append((MatchTier.SUBSEQUENCE, span - len(query), position))
+
+            bound = max_typos(query)
+            for position in self._typo_candidates(query, bound) - scored_positions:
+                if accept is not None and not accept(self.values[position]):
+                    continue
+                distance = self._typo_distance(query, position, bound)
+                if distance is not None:
+                    ranked.append((MatchTier.TYPO, distance, position))
+
+        return [self.values[position] for _, _, position in heapq.nsmallest(limit, ranked)]
+
+    def _subsequence_candidates(self, query: str) -> set:
+        # Names containing every letter of the query, smallest posting first
+        postings = [self._letter_positions.get(letter) for letter in set(query)]
+        if any(posting is None for posting in postings):
+            return set()
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
+
+    def _typo_candidates(self, query: str, bound: int) -> set:
+        # Within bound typos, all but bound of the query's letters are kept or swapped, which leaves each of them no
+        # more than bound letters from its place in the query, counted from the word start the match begins at.
+        # Names with too few of the leading letters near their places (at any word start) cannot match.
+        checked_letters = min(len(query), ANCHORED_OFFSETS - bound)
+        near_counts = Counter()
+        for query_offset in range(checked_letters):
+            near_counts.update(set().union(*(self._anchored_letters.get((word_offset, query[query_offset]), ())
+                                             for word_offset in range(max(0, query_offset - bound),
+                                                                      query_offset + bound + 1))))
+        return {position for position, near_count in near_counts.items() if near_count >= checked_letters - bound}
+
+    def _typo_distance(self, query: str, position: int, bound: int) -> Optional[int]:
+        # Typos are compared against the start of the name and of each word in it, the way names are typed
+        name = self.names[position]
+        checked_letters = min(len(query), ANCHORED_OFFSETS - bound)
+        best_distance = None
+        for word_start in (0, *self._word_starts[position]):
+            word = name[word_start:word_start + len(query) + bound]
+            if not near_letters_match(query, word, checked_letters, bound):
+                continue
+            distance = bounded_prefix_edit_distance(query, word, bound)
+            if distance is not None and (best_distance is None or distance < best_distance):
+                best_distance = distance
+                bound = distance
+        return best_distance
+
+    def _substring_candidates(self, query: str) -> Iterable[int]:
+        if len(query) < 3:
+            return range(len(self.names))
+        # Every match contains all trigrams of the query, so the rarest one bounds the candidates
+        postings = [self._trigrams.get(query[i:i + 3]) for i in range(len(query) - 2)]
+        if any(posting is None for posting in postings):
+            return []
+        return min(postings, key=len)
+
+
+# Index per key, together with the game instance and section version it was built from
+_name_indexes: Dict[Hashable, tuple[Game, int, NameIndex]] = {}
+
+
+def get_name_index(game: Game, key: Hashable, sections: tuple[str, ...],
+                   entries: Callable[[], Iterable[tuple[str, Any]]]) -> NameIndex:
+    # Rebuilt only when the game is reloaded or one of the sections the entries come from has changed
+    version = game.get_version(*sections)
+    cached = _name_indexes.get(key)
+    if cached is not None and cached[0] is game and cached[1] == version:
+        return cached[2]
+    name_index = NameIndex(entries())
+    _name_indexes[key] = (game, version, name_index)
+    return name_index
@@ -0,0 +1,51 @@
+#! channel_resolver.py
+# Resolves channels and messages from the gateway cache, falling back to a REST fetch only on a cache miss
+
+import discord
+from discord import Guild
+from typing import Dict, Optional
+
+
+class ChannelResolver:
+    def __init__(self):
+        # Channels the gateway cache did not have (e.g. right after startup); dropped on channel delete/update
+        self._channels: Dict[int, discord.abc.GuildChannel] = {}
+        self._messages: Dict[int, discord.PartialMessage] = {}
+        self.cache_hits: int = 0
+        self.rest_fetches: int = 0
+
+    async def resolve_channel(self, guild: Guild, channel_id: Optional[int]) -> Optional[discord.abc.GuildChannel]:
+        if channel_id is None:
+            return None
+        channel = guild.get_channel(channel_id) or self._channels.get(channel_id)
+        if channel is not None:
+            self.cache_hits += 1
+            return channel
+        self.rest_fetches += 1
+        channel = await guild.fetch_channel(channel_id)
+        self._channels[channel_id] = channel
+        return channel
+
+    async def resolve_message(self, guild: Guild, channel_id: int, message_id: int) -> discord.PartialMessage:
+        # A partial message supports edit and delete without first fetching the message over REST
+        message = self._messages.get(message_id)
+        if message is None:
+            channel = await self.resolve_channel(guild, channel_id)
+            message = channel.get_partial_message(message_id)
+            self._messages[message_id] = message
+        return message
+
+    def invalidate_channel(self, channel_id: int):
+        self._channels.pop(channel_id, None)
+        for message_id, message in list(self._messages.items()):
+            if message.channel.id == channel_id:
+                del self._messages[message_id]
+
+    def invalidate_message(self, message_id: int):
+        self._messages.pop(message_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {'cache_hits': self.cache_hits, 'rest_fetches': self.rest_fetches}
+
+
+channel_resolver = ChannelResolver()
@@ -2,38 +2,62 @@
 # Utility class for managing autocomplete functionality
 
 import discord
+import functools
 from discord import app_commands, Member, Guild, User
-from typing import List, Optional, Literal, Dict
+from typing import Callable, List, Optional, Literal, Dict
 import bot.model.data_model as gdm
 from bot.model.data_model import Game, Player, Round, Vote, Party, Dilemma
 from bot.model.conf_vars import ConfVars as Conf
 from bot.utils.string_decorator import emojify
+from bot.utils.member_resolver import member_resolver
+from bot.utils.autocomplete_index import get_name_index
+from bot.utils.single_flight import SingleFlight
 
+autocomplete_flights = SingleFlight(ttl=Conf.AUTOCOMPLETE_CACHE_TTL, max_entries=1024)
 
+
+def single_flight(key_args: Callable[[discord.Interaction], tuple] = lambda interaction: ()):
+    # Concurrent identical autocompletes share one computation, and its result is reused until the game changes;
+    # key_args picks out whatever else (invoking user, other options) the choices depend on
+    def decorator(autocomplete):
+        @functools.wraps(autocomplete)
+        async def shared_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice]:
+            game = await gdm.get_game(file_path=Conf.GAME_PATH)
+            key = (autocomplete.__name__, key_args(interaction), current, game.get_version())
+            return await autocomplete_flights.run(key, lambda: autocomplete(interaction, current), generation=game)
+
+        return shared_autocomplete
+
+    return decorator
+
+
+def namespace_player(interaction: discord.Interaction) -> tuple:
+    return (interaction.namespace.player if interaction.namespace.player is not None else interaction.user.id,)
+
+
+@single_flight()
 async def player_list_autocomplete(interaction: discord.Interaction,
                                    current: str) -> List[app_commands.Choice[str]]:
     game = await gdm.get_game(file_path=Conf.GAME_PATH)
-    players = await get_valid_players(current, game.players)
+    players = await get_valid_players(current, game)
     return [
         app_commands.Choice(name=player.player_discord_name, value=str(player.player_id))
         for player in players
     ]
 
 
-async def get_valid_players(substr: str, players: List[Player]) -> List[Player]:
-    player_list = []
-    for player in sorted(players, key=lambda e: e.player_discord_name.lower()):
-        if substr and substr.lower() not in player.player_discord_name.lower():
-            continue
-        if not player.is_dead:
-            player_list.append(player)
-    return player_list[:25]
+async def get_valid_players(substr: str, game: Game) -> List[Player]:
+    living_player_index = get_name_index(game, 'living_players', ('players',),
+                                         lambda: ((player.player_discord_name, player) for player in game.players
+                                                  if not player.is_dead))
+    return living_player_index.search(substr)
 
 
+@single_flight()
 async def party_list_autocomplete(interaction: discord.Interaction,
                                   current: str) -> List[app_commands.Choice[str]]:
     game = await gdm.get_game(file_path=Conf.GAME_PATH)
-    parties = await get_valid_parties(current, game.parties)
+    parties = await get_valid_parties(current, game)
     return [
         app_commands.Choice(name=f'{party.party_name} ({len(party.player_ids)}/{party.max_size})',
                             value=str(party.channel_id))
@@ -41,19 +65,17 @@ async def party_list_autocomplete(interaction: discord.Interaction,
     ]
 
 
-async def get_valid_parties(substr: str, parties: List[Party]) -> List[Party]:
-    party_list = []
-    for party in sorted(parties, key=lambda e: e.party_name.lower()):
-        if substr and substr.lower() not in party.party_name.lower():
-            continue
-        party_list.append(party)
-    return party_list[:25]
+async def get_valid_parties(substr: str, game: Game) -> List[Party]:
+    party_index = get_name_index(game, 'parties', ('parties',),
+                                 lambda: ((party.party_name, party) for party in game.parties))
+    return party_index.search(substr)
 
 
+@single_flight(lambda interaction: (interaction.user.id,))
 async def dilemma_name_autocomplete(interaction: discord.Interaction,
                                     current: str) -> List[app_commands.Choice[str]]:
     game = await gdm.get_game(file_path=Conf.GAME_PATH)
-    guild_member = await interaction.guild.fetch_member(interaction.user.id)
+    guild_member = await member_resolver.resolve_member(interaction.guild, interaction.user.id, interaction)
     dilemma_names = await get_valid_dilemma_names(current, game, guild_member)
     return [
         app_commands.Choice(name=dilemma_name, value=dilemma_name)
@@ -62,23 +84,19 @@ async def dilemma_name_autocomplete(interaction: discord.Interaction,
 
 
 async def get_valid_dilemma_names(substr: str, game: Game, member: Member) -> List[str]:
-    name_list = []
-    dilemma_list = []
     game_round = game.get_latest_round()
-    if game_round is not None:
-        if member.guild_permissions.manage_guild:
-            dilemma_list.extend(game_round.round_dilemmas)
-        else:
-            for round_dilemma in game_round.round_dilemmas:
-                if member.id in round_dilemma.dilemma_player_ids:
-                    dilemma_list.append(round_dilemma)
-        for a_dilemma in dilemma_list:
-            if substr and substr.lower() not in a_dilemma.dilemma_name.lower():
-                continue
-            name_list.append(a_dilemma.dilemma_name)
-    return name_list[:25]
-
-
+    if game_round is None:
+        return []
+    dilemma_index = get_name_index(game, 'dilemmas', ('rounds',),
+                                   lambda: ((dilemma.dilemma_name, dilemma) for dilemma in game_round.round_dilemmas))
+    # Moderators see every dilemma of the round, players only the ones they take part in
+    is_moderator = member.guild_permissions.manage_guild
+    dilemmas = dilemma_index.search(substr, accept=lambda dilemma: is_moderator
+                                    or member.id in dilemma.dilemma_player_ids)
+    return [dilemma.dilemma_name for dilemma in dilemmas]
+
+
+@single_flight(lambda interaction: (interaction.namespace.dilemma_name,))
 async def dilemma_choice_autocomplete(interaction: discord.Interaction,
                                       current: str) -> List[app_commands.Choice[str]]:
     game = await gdm.get_game(file_path=Conf.GAME_PATH)
@@ -91,39 +109,35 @@ async def dilemma_choice_autocomplete(interaction: discord.Interaction,
 
 
 async def get_valid_dilemma_choices(substr: str, game: Game, dilemma_name: str) -> List[str]:
-    choice_list = []
     game_round = game.get_latest_round()
-    if game_round is not None:
-        dilemma = game_round.get_dilemma(dilemma_name)
-        for dilemma_choice in sorted(dilemma.dilemma_choices, key=lambda e: e.lower()):
-            if substr and substr.lower() not in dilemma_choice.lower():
-                continue
-            choice_list.append(dilemma_choice)
-    return choice_list[:25]
+    if game_round is None:
+        return []
+    dilemma = game_round.get_dilemma(dilemma_name)
+    choice_index = get_name_index(game, ('dilemma_choices', dilemma_name), ('rounds',),
+                                  lambda: ((choice, choice) for choice in dilemma.dilemma_choices))
+    return choice_index.search(substr)
 
 
+@single_flight(namespace_player)
 async def player_item_autocomplete(interaction: discord.Interaction,
                                    current: str) -> List[app_commands.Choice[str]]:
     game = await gdm.get_game(file_path=Conf.GAME_PATH)
     player_id = interaction.namespace.player if interaction.namespace.player is not None else interaction.user.id
     game_player = game.get_player(player_id)
-    item_choices = await get_player_item_choices(current, game_player)
+    item_choices = await get_player_item_choices(current, game, game_player)
     return [
         app_commands.Choice(name=choice, value=choice)
         for choice in item_choices
     ]
 
 
-async def get_player_item_choices(substr: str, player: Player) -> List[str]:
-    choice_list = []
-
-    for item in sorted(player.player_items, key=lambda e: e.item_name.lower()):
-        if substr and substr.lower() not in item.item_name.lower():
-            continue
-        choice_list.append(item.item_name)
-    return choice_list[:25]
+async def get_player_item_choices(substr: str, game: Game, player: Player) -> List[str]:
+    item_index = get_name_index(game, ('player_items', player.player_id), ('players',),
+                                lambda: ((item.item_name, item.item_name) for item in player.player_items))
+    return item_index.search(substr)
 
 
+@single_flight()
 async def game_item_autocomplete(interaction: discord.Interaction,
                                  current: str) -> List[app_commands.Choice[str]]:
     game = await gdm.get_game(file_path=Conf.GAME_PATH)
@@ -135,46 +149,41 @@ async def game_item_autocomplete(interaction: discord.Interaction,
 
 
 async def get_game_item_choices(substr: str, game: Game) -> List[str]:
-    choice_list = []
-
-    for item in sorted(game.items, key=lambda e: e.item_name.lower()):
-        if substr and substr.lower() not in item.item_name.lower():
-            continue
-        choice_list.append(item.item_name)
-    return choice_list[:25]
+    item_index = get_name_index(game, 'items', ('items',),
+                                lambda: ((item.item_name, item.item_name) for item in game.items))
+    return item_index.search(substr)
 
 
+@single_flight(namespace_player)
 async def player_action_autocomplete(interaction: discord.Interaction,
                                      current: str) -> List[app_commands.Choice[str]]:
     game = await gdm.get_game(file_path=Conf.GAME_PATH)
     player_id = interaction.namespace.player if interaction.namespace.player is not None else interaction.user.id
     game_player = game.get_player(player_id)
-    action_choices = await get_player_action_choices(current, game_player)
+    action_choices = await get_player_action_choices(current, game, game_player)
     return [
         app_commands.Choice(name=choice, value=choice)
         for choice in action_choices
     ]
 
 
-async def get_player_action_choices(substr: str, player: Player) -> List[str]:
-    choice_list = []
+async def get_player_action_choices(substr: str, game: Game, player: Player) -> List[str]:
+    action_index = get_name_index(game, ('player_actions', player.player_id), ('players',),
+                                  lambda: player_action_entries(player))
+    return action_index.search(substr)
+
 
-    for action in sorted(player.player_actions, key=lambda e: e.action_name.lower()):
-        if substr and substr.lower() not in action.action_name.lower():
-            continue
-        choice_list.append(action.action_name)
+def player_action_entries(player: Player) -> List[tuple[str, str]]:
+    action_entries = [(action.action_name, action.action_name) for action in player.player_actions]
 
-    # Also include item actions, where they are defined
-    for item in sorted(player.player_items, key=lambda e: e.item_name.lower()):
-        if item.item_action is not None:
-            item_action = item.item_action
-            if item_action.action_name is not None:
-                if substr and substr.lower() not in item.item_name.lower():
-                    continue
-                choice_list.append(item_action.action_name)
-    return choice_list[:25]
+    # Also include item actions, where they are defined; these are matched by the name of their item
+    for item in player.player_items:
+        if item.item_action is not None and item.item_action.action_name is not None:
+            action_entries.append((item.item_name, item.item_action.action_name))
+    return action_entries
 
 
+@single_flight()
 async def game_action_autocomplete(interaction: discord.Interaction,
                                    current: str) -> List[app_commands.Choice[str]]:
     game = await gdm.get_game(file_path=Conf.GAME_PATH)
@@ -187,16 +196,12 @@ async def game_action_autocomplete(interaction: discord.Interaction,
 
 
 async def get_game_action_choices(substr: str, game: Game) -> List[str]:
-    choice_list = []
-
-    for action in sorted(game.actions, key=lambda e: e.action_name.lower()):
-        if substr and substr.lower() not in action.action_name.lower():
-            continue
-        choice_list.append(action.action_name)
-
-    return choice_list[:25]
+    action_index = get_name_index(game, 'actions', ('actions',),
+                                  lambda: ((action.action_name, action.action_name) for action in game.actions))
+    return action_index.search(substr)
 
 
+@single_flight()
 async def attribute_type_autocomplete(interaction: discord.Interaction,
                                       current: str) -> List[app_commands.Choice[str]]:
     game = await gdm.get_game(file_path=Conf.GAME_PATH)
@@ -209,17 +214,14 @@ async def attribute_type_autocomplete(interaction: discord.Interaction,
 
 
 async def get_attribute_type_names(substr: str, game: Game) -> list[str]:
-    choice_list: list[str] = []
-
-    for attribute_definition in sorted(game.attribute_definitions, key=lambda e: e.attribute_name.lower()):
-        if substr and substr.lower() not in attribute_definition.attribute_name.lower():
-            continue
-        display_value = attribute_definition.attribute_name
-        choice_list.append(display_value)
-
-    return choice_list[:25]
+    attribute_type_index = get_name_index(game, 'attribute_types', ('attribute_definitions',),
+                                          lambda: ((attribute_definition.attribute_name,
+                                                    attribute_definition.attribute_name)
+                                                   for attribute_definition in game.attribute_definitions))
+    return attribute_type_index.search(substr)
 
 
+@single_flight()
 async def resource_type_autocomplete(interaction: discord.Interaction,
                                      current: str) -> List[app_commands.Choice[str]]:
     game = await gdm.get_game(file_path=Conf.GAME_PATH)
@@ -232,17 +234,14 @@ async def resource_type_autocomplete(interaction: discord.Interaction,
 
 
 async def get_resource_type_names(substr: str, game: Game) -> list[str]:
-    choice_list: list[str] = []
-
-    for resource_definition in sorted(game.resource_definitions, key=lambda e: e.resource_name.lower()):
-        if substr and substr.lower() not in resource_definition.resource_name.lower():
-            continue
-        display_value = resource_definition.resource_name
-        choice_list.append(display_value)
-
-    return choice_list[:25]
+    resource_type_index = get_name_index(game, 'resource_types', ('resource_definitions',),
+                                         lambda: ((resource_definition.resource_name,
+                                                   resource_definition.resource_name)
+                                                  for resource_definition in game.resource_definitions))
+    return resource_type_index.search(substr)
 
 
+@single_flight()
 async def persistent_view_autocomplete(interaction: discord.Interaction,
                                        current: str) -> List[app_commands.Choice[str]]:
     game = await gdm.get_game(file_path=Conf.GAME_PATH)
@@ -255,11 +254,6 @@ async def persistent_view_autocomplete(interaction: discord.Interaction,
 
 
 async def get_persistent_view_names(substr: str, game: Game) -> List[str]:
-    choice_list = []
-
-    for pi_view in game.pi_views:
-        if substr and substr.lower() not in pi_view.view_name.lower():
-            continue
-        choice_list.append(pi_view.view_name)
-
-    return choice_list[:25]
+    view_index = get_name_index(game, 'pi_views', ('pi_views',),
+                                lambda: ((pi_view.view_name, pi_view.view_name) for pi_view in game.pi_views))
+    return view_index.search(substr)
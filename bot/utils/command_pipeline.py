@@ -0,0 +1,76 @@
+#! command_pipeline.py
+# Acknowledge-first flow for slash commands: defer right away, commit state, then run slow Discord side effects as
+# tracked background tasks, with per-stage timings logged for every invocation
+
+import asyncio
+import contextlib
+import time
+import discord
+from typing import Awaitable, List, Set
+from bot.botlogger.logging_manager import logger, log_info
+
+# Strong references to running side effects; the event loop only keeps weak ones
+_background_tasks: Set[asyncio.Task] = set()
+
+
+class CommandPipeline:
+    def __init__(self, interaction: discord.Interaction, ephemeral: bool = True):
+        self.interaction: discord.Interaction = interaction
+        self.ephemeral: bool = ephemeral
+        self.command_name: str = interaction.command.name if interaction.command else 'unknown'
+        self.timings: List[tuple[str, float]] = []
+        self._started: float = time.perf_counter()
+
+    async def defer(self):
+        # Acknowledges the interaction within Discord's 3 second window; replies then go out as followups
+        async with self.stage('defer'):
+            if not self.interaction.response.is_done():
+                await self.interaction.response.defer(ephemeral=self.ephemeral, thinking=True)
+
+    @contextlib.asynccontextmanager
+    async def stage(self, name: str):
+        stage_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((name, time.perf_counter() - stage_start))
+
+    async def respond(self, content: str, ephemeral: bool = True):
+        if self.interaction.response.is_done():
+            await self.interaction.followup.send(content, ephemeral=ephemeral)
+        else:
+            await self.interaction.response.send_message(content, ephemeral=ephemeral)
+
+    def background(self, name: str, side_effect: Awaitable):
+        # Runs a side effect after the command has answered; failures are logged and reported to the invoking user
+        async def run_side_effect():
+            stage_start = time.perf_counter()
+            try:
+                await side_effect
+            except Exception as e:
+                logger.error(f'Background step {name} of command {self.command_name} failed: {e}')
+                with contextlib.suppress(discord.HTTPException):
+                    await self.interaction.followup.send(f'Your command went through, but {name} failed. '
+                                                         f'Please let a moderator know.', ephemeral=True)
+            finally:
+                log_info(f'Command {self.command_name} background step {name} took '
+                         f'{(time.perf_counter() - stage_start) * 1000:.0f}ms')
+
+        background_task = asyncio.get_running_loop().create_task(run_side_effect())
+        _background_tasks.add(background_task)
+        background_task.add_done_callback(_background_tasks.discard)
+
+    def finish(self):
+        formatted_timings = ', '.join(f'{name} {duration * 1000:.0f}ms' for name, duration in self.timings)
+        log_info(f'Command {self.command_name} answered in {(time.perf_counter() - self._started) * 1000:.0f}ms '
+                 f'({formatted_timings})')
+
+
+def pending_background_tasks() -> int:
+    return len(_background_tasks)
+
+
+async def drain_background_tasks():
+    # Waits for in-flight side effects (used on shutdown)
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
@@ -0,0 +1,57 @@
+#! fragment_cache.py
+# Bounded LRU cache of rendered, emojified message fragments, evicted by an approximate memory budget
+
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+from bot.model.conf_vars import ConfVars as Conf
+
+
+class FragmentCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes: int = max_bytes
+        # Fragments with their approximate size, least recently used first
+        self._fragments: OrderedDict[Hashable, tuple[str, int]] = OrderedDict()
+        self._size: int = 0
+        # Fragments are only valid for the object they were rendered from (e.g. the loaded game instance)
+        self._generation: Optional[Any] = None
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, key: Hashable, generation: Optional[Any] = None) -> Optional[str]:
+        if generation is not self._generation:
+            self.clear()
+            self._generation = generation
+        cached = self._fragments.get(key)
+        if cached is None:
+            self.misses += 1
+            return None
+        self._fragments.move_to_end(key)
+        self.hits += 1
+        return cached[0]
+
+    def put(self, key: Hashable, fragment: str):
+        size = sys.getsizeof(fragment) + sys.getsizeof(key)
+        if size > self.max_bytes:
+            return
+        previous = self._fragments.pop(key, None)
+        if previous is not None:
+            self._size -= previous[1]
+        self._fragments[key] = (fragment, size)
+        self._size += size
+        while self._size > self.max_bytes:
+            _, (_, evicted_size) = self._fragments.popitem(last=False)
+            self._size -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        self._fragments.clear()
+        self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(self._fragments), 'bytes': self._size}
+
+
+fragment_cache = FragmentCache(max_bytes=Conf.FRAGMENT_CACHE_BYTES)
@@ -0,0 +1,84 @@
+#! member_resolver.py
+# Resolves guild members from the interaction payload and gateway cache, with a TTL'd REST fallback
+
+import time
+import discord
+from discord import Guild, Member
+from typing import Dict, Iterable, Optional
+from bot.botlogger.logging_manager import logger
+from bot.model.conf_vars import ConfVars as Conf
+
+# Discord accepts at most 100 user ids per gateway member query
+QUERY_MEMBERS_LIMIT = 100
+
+
+class MemberResolver:
+    def __init__(self, ttl: float):
+        self.ttl: float = ttl
+        # Members fetched over REST because the gateway cache did not have them, with the time they expire
+        self._members: Dict[int, tuple[Member, float]] = {}
+        self.cache_hits: int = 0
+        self.rest_fetches: int = 0
+
+    def _cached(self, guild: Guild, member_id: int, interaction: Optional[discord.Interaction]) -> Optional[Member]:
+        # The invoking member arrives with the interaction payload, permissions included
+        if interaction is not None and interaction.user.id == member_id and isinstance(interaction.user, Member):
+            return interaction.user
+        member = guild.get_member(member_id)
+        if member is not None:
+            return member
+        cached = self._members.get(member_id)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        return None
+
+    def _remember(self, member: Member):
+        self._members[member.id] = (member, time.monotonic() + self.ttl)
+
+    async def resolve_member(self, guild: Guild, member_id: int,
+                             interaction: Optional[discord.Interaction] = None) -> Member:
+        member = self._cached(guild, member_id, interaction)
+        if member is not None:
+            self.cache_hits += 1
+            return member
+        self.rest_fetches += 1
+        member = await guild.fetch_member(member_id)
+        self._remember(member)
+        return member
+
+    async def resolve_members(self, guild: Guild, member_ids: Iterable[int]) -> Dict[int, Member]:
+        # Bulk lookup: cache misses are requested over the gateway in batches instead of one REST call each
+        members: Dict[int, Member] = {}
+        missing_ids = []
+        for member_id in member_ids:
+            member = self._cached(guild, member_id, None)
+            if member is not None:
+                self.cache_hits += 1
+                members[member_id] = member
+            elif member_id not in missing_ids:
+                missing_ids.append(member_id)
+
+        for batch_start in range(0, len(missing_ids), QUERY_MEMBERS_LIMIT):
+            batch_ids = missing_ids[batch_start:batch_start + QUERY_MEMBERS_LIMIT]
+            try:
+                queried_members = await guild.query_members(user_ids=batch_ids, limit=len(batch_ids), cache=True)
+            except (discord.ClientException, TimeoutError) as e:
+                logger.warning(f'Gateway member query failed, falling back to REST: {e}')
+                queried_members = []
+            for member in queried_members:
+                self._remember(member)
+                members[member.id] = member
+
+        for member_id in missing_ids:
+            if member_id not in members:
+                members[member_id] = await self.resolve_member(guild, member_id)
+        return members
+
+    def invalidate_member(self, member_id: int):
+        self._members.pop(member_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {'cache_hits': self.cache_hits, 'rest_fetches': self.rest_fetches}
+
+
+member_resolver = MemberResolver(ttl=Conf.MEMBER_CACHE_TTL)
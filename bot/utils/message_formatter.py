@@ -1,9 +1,11 @@
 import time
-from typing import Optional, List, Literal
+from typing import Optional, List, Literal, Hashable, Callable, Awaitable
 from discord import Guild
 from bot.model.data_model import Player, Action, Item, Game, ResourceDefinition, ResourceCost, Resource, AttributeDefinition, \
     Attribute
-import bot.utils.string_decorator as sdec
+from bot.utils.fragment_cache import fragment_cache
+from bot.utils.message_paginator import MessagePaginator
+from bot.utils.render_context import RenderContext
 
 uses_to_emoji_map = {0: ":uses_zero:",
                      1: ":uses_one:",
@@ -12,6 +14,11 @@ uses_to_emoji_map = {0: ":uses_zero:",
                      4: ":uses_four:",
                      5: ":uses_five:"}
 
+# Game sections whose definitions each kind of fragment is rendered with
+ACTION_DEFINITION_SECTIONS = ('action_type_definitions', 'resource_definitions')
+ITEM_DEFINITION_SECTIONS = ('item_type_definitions', 'resource_definitions')
+RESOURCE_DEFINITION_SECTIONS = ('resource_definitions',)
+
 
 async def convert_uses_to_emoji(uses: int) -> str:
     if uses < 0:
@@ -23,6 +30,37 @@ async def convert_uses_to_emoji(uses: int) -> str:
         return ":uses_five:+"
 
 
+async def render_cached(fragment_key: Hashable, sections: tuple[str, ...], context: RenderContext,
+                        render: Callable[[], Awaitable[str]]) -> str:
+    # Fully formatted and emojified text, reused until the content, the definitions it uses or the guild emojis change
+    game = context.game
+    key = (fragment_key, game.get_version(*sections), context.emoji_version)
+    fragment = fragment_cache.get(key, generation=game)
+    if fragment is None:
+        fragment = await context.format_text(await render())
+        fragment_cache.put(key, fragment)
+    return fragment
+
+
+async def render_action(action: Action, context: RenderContext, item_name: Optional[str] = None) -> str:
+    return await render_cached(('action', action.content_hash(), item_name), ACTION_DEFINITION_SECTIONS, context,
+                               lambda: format_action(action=action, context=context, item_name=item_name))
+
+
+async def render_item(item: Item, context: RenderContext) -> str:
+    return await render_cached(('item', item.content_hash()), ITEM_DEFINITION_SECTIONS, context,
+                               lambda: format_item(item=item, context=context))
+
+
+async def render_resource_line(resource_amt: int, resource_type: str, context: RenderContext) -> str:
+    async def render():
+        res_def: ResourceDefinition = context.resource_defs.get(resource_type)
+        return await format_resource(resource_amt=resource_amt, resource_definition=res_def) + "\n"
+
+    return await render_cached(('resource', resource_type, resource_amt), RESOURCE_DEFINITION_SECTIONS, context,
+                               render)
+
+
 async def construct_action_display(guild: Guild, game: Game, player: Optional[Player] = None,
                                    actions: Optional[list[Action]] = None,
                                    item_actions: Optional[list[(str, Action)]] = None,
@@ -32,7 +70,8 @@ async def construct_action_display(guild: Guild, game: Game, player: Optional[Pl
     if item_actions is None:
         item_actions: list[(str, Action)] = []
 
-    formatted_responses = []
+    context = await RenderContext.build(guild=guild, game=game)
+    paginator = MessagePaginator(context=context)
     formatted_action_header = ""
 
     if from_spellbook:
@@ -41,7 +80,7 @@ async def construct_action_display(guild: Guild, game: Game, player: Optional[Pl
         formatted_action_header += f'**Player {player.player_discord_name} Actions as of <t:{int(time.time())}>**\n'
     else:
         formatted_action_header += f'**Actions as of <t:{int(time.time())}>**\n'
-    formatted_responses.append(await sdec.format_text(text=formatted_action_header, guild=guild))
+    await paginator.add_page(formatted_action_header)
 
     if actions is None and player is not None:
         actions = player.player_actions
@@ -49,36 +88,18 @@ async def construct_action_display(guild: Guild, game: Game, player: Optional[Pl
     if item_actions is None and player is not None:
         item_actions = player.get_item_actions()
 
-    if actions:
-        formatted_actions = ""
-        for action in actions:
-            this_formatted_action = await format_action(action, game=game)
-            if len(await sdec.format_text(text=formatted_actions, guild=guild)) + len(
-                    await sdec.format_text(text=this_formatted_action, guild=guild)) <= 1750:
-                formatted_actions += this_formatted_action
-            else:
-                formatted_responses.append(await sdec.format_text(text=formatted_actions, guild=guild))
-                formatted_actions = ""
-                formatted_actions += this_formatted_action
-        formatted_responses.append(await sdec.format_text(text=formatted_actions, guild=guild))
-
-    if item_actions:
-        formatted_item_actions = ""
-        for item_name, item_action in item_actions:
-            this_formatted_item_action = await format_action(action=item_action, item_name=item_name, game=game)
-            if len(await sdec.format_text(text=formatted_item_actions, guild=guild)) + len(
-                    await sdec.format_text(text=this_formatted_item_action, guild=guild)) <= 1750:
-                formatted_item_actions += this_formatted_item_action
-            else:
-                formatted_responses.append(await sdec.format_text(text=formatted_item_actions, guild=guild))
-                formatted_item_actions = ""
-                formatted_item_actions += this_formatted_item_action
-        formatted_responses.append(await sdec.format_text(text=formatted_item_actions, guild=guild))
+    for action in actions:
+        paginator.add_formatted(await render_action(action, context=context))
+
+    # Item actions start on a page of their own
+    paginator.break_page()
+    for item_name, item_action in item_actions:
+        paginator.add_formatted(await render_action(action=item_action, item_name=item_name, context=context))
 
     if not actions and not item_actions:
-        formatted_responses.append(await sdec.format_text(text=f'*<No Actions!>*', guild=guild))
+        await paginator.add(f'*<No Actions!>*')
 
-    return formatted_responses
+    return paginator.finish()
 
 
 async def construct_action_change_display(guild: Guild,
@@ -86,27 +107,39 @@ async def construct_action_change_display(guild: Guild,
                                           action: Action,
                                           game: Game,
                                           uses_changed: Optional[int] = 0) -> List[str]:
-    formatted_responses = []
+    context = await RenderContext.build(guild=guild, game=game)
+    paginator = MessagePaginator(context=context)
     formatted_action_change = ""
 
     if status == 'uses_increment':
         formatted_action_change += f'Your action **{action.action_name}** has gained {uses_changed} use(s)!\n'
-        formatted_action_change += await format_action(action, game=game)
+        formatted_action_change += await format_action(action, context=context)
     elif status == 'uses_decrement':
         formatted_action_change += f'Yor action **{action.action_name}** has lost {uses_changed} use(s)!\n'
-        formatted_action_change += await format_action(action, game=game)
+        formatted_action_change += await format_action(action, context=context)
     elif status == 'gained':
         formatted_action_change += f'You have been **granted** the action **{action.action_name}**:\n'
-        formatted_action_change += await format_action(action, game=game)
+        formatted_action_change += await format_action(action, context=context)
     else:
         formatted_action_change += f'You have **lost** the action **{action.action_name}**!\n'
 
-    formatted_responses.append(await sdec.format_text(text=formatted_action_change, guild=guild))
+    await paginator.add(formatted_action_change)
 
-    return formatted_responses
+    return paginator.finish()
+
+
+async def format_costs(costs: list[ResourceCost], context: RenderContext) -> str:
+    formatted_costs = []
+    for cost in costs:
+        if cost.res_name in context.resource_defs:
+            res_def_display_name = context.resource_defs[cost.res_name].emoji_text
+        else:
+            res_def_display_name = cost.res_name
+        formatted_costs.append(f'{cost.amount} {res_def_display_name}')
+    return ' + '.join(formatted_costs) + " "
 
 
-async def format_action(action: Action, game: Game, item_name: Optional[str] = None) -> str:
+async def format_action(action: Action, context: RenderContext, item_name: Optional[str] = None) -> str:
     formatted_action = ""
     # TODO: Implement action classes
     # if action.action_classes and action.action_classes is not None:
@@ -119,9 +152,8 @@ async def format_action(action: Action, game: Game, item_name: Optional[str] = N
     #         formatted_action += f' {action_class_def_str}'
     # Add action type display (following format_item pattern from lines 200-207)
     if action.action_type is not None:
-        game_action_type_defs = game.get_action_type_definitions()
-        if action.action_type in game_action_type_defs:
-            action_type_def_str = game_action_type_defs[action.action_type].emoji_text
+        if action.action_type in context.action_type_defs:
+            action_type_def_str = context.action_type_defs[action.action_type].emoji_text
         else:
             action_type_def_str = action.action_type
         formatted_action += f' {action_type_def_str}'
@@ -132,15 +164,7 @@ async def format_action(action: Action, game: Game, item_name: Optional[str] = N
         formatted_action += f' {action.action_timing} '
     if action.action_costs:
         formatted_action += f'- Cost: '
-        costs = []
-        for cost in action.action_costs:
-            game_res_defs = game.get_resource_definitions()
-            if cost.res_name in game_res_defs:
-                res_def_display_name = game_res_defs[cost.res_name].emoji_text
-            else:
-                res_def_display_name = cost.res_name
-            costs.append(f'{cost.amount} {res_def_display_name}')
-        formatted_action += ' + '.join(costs) + " "
+        formatted_action += await format_costs(action.action_costs, context=context)
     if action.action_uses >= 0:
         uses_emoji = await convert_uses_to_emoji(action.action_uses)
         formatted_action += f'- {uses_emoji} '
@@ -155,7 +179,8 @@ async def construct_item_display(guild: Guild, game: Game, player: Optional[Play
     if items is None:
         items = []
 
-    formatted_responses = []
+    context = await RenderContext.build(guild=guild, game=game)
+    paginator = MessagePaginator(context=context)
     formatted_item_header = ""
 
     if from_spellbook:
@@ -164,58 +189,49 @@ async def construct_item_display(guild: Guild, game: Game, player: Optional[Play
         formatted_item_header += f'**Player {player.player_discord_name} Inventory as of <t:{int(time.time())}>**\n'
     else:
         formatted_item_header += f'**Inventory as of <t:{int(time.time())}>**\n'
-    formatted_responses.append(await sdec.format_text(text=formatted_item_header, guild=guild))
+    await paginator.add_page(formatted_item_header)
 
     if items is None and player is not None:
         items = player.player_items
 
     if items:
-        formatted_items = ""
         for item in items:
-            this_formatted_item = await format_item(item, game=game)
-            if len(await sdec.format_text(text=formatted_items, guild=guild)) + len(
-                    await sdec.format_text(text=this_formatted_item, guild=guild)) <= 1750:
-                formatted_items += this_formatted_item
-            else:
-                formatted_responses.append(await sdec.format_text(text=formatted_items, guild=guild))
-                formatted_items = ""
-                formatted_items += this_formatted_item
-        formatted_responses.append(await sdec.format_text(text=formatted_items, guild=guild))
+            paginator.add_formatted(await render_item(item, context=context))
     else:
-        formatted_responses.append(await sdec.format_text(text=f'*<No items!>*', guild=guild))
+        await paginator.add(f'*<No items!>*')
 
-    return formatted_responses
+    return paginator.finish()
 
 
 async def construct_item_transfer_display(guild: Guild, action: Literal['gained', 'lost'], item: Item, game: Game) -> \
         List[str]:
-    formatted_responses = []
+    context = await RenderContext.build(guild=guild, game=game)
+    paginator = MessagePaginator(context=context)
     formatted_item = ""
 
     if action == 'gained':
         formatted_item += f'You have **gained possession** of the item **{item.item_name}**:\n'
-        formatted_item += await format_item(item, game=game)
+        formatted_item += await format_item(item, context=context)
     else:
         formatted_item += f'You have **lost possession** of the item **{item.item_name}**!\n'
 
-    formatted_responses.append(await sdec.format_text(text=formatted_item, guild=guild))
+    await paginator.add(formatted_item)
 
-    return formatted_responses
+    return paginator.finish()
 
 
-async def format_item(item: Item, game: Game) -> str:
+async def format_item(item: Item, context: RenderContext) -> str:
     formatted_item = f'-'
     if item.item_type is not None:
-        game_item_type_defs = game.get_item_type_definitions()
-        if item.item_type in game_item_type_defs:
-            item_type_def_str = game_item_type_defs[item.item_type].emoji_text
+        if item.item_type in context.item_type_defs:
+            item_type_def_str = context.item_type_defs[item.item_type].emoji_text
         else:
             item_type_def_str = item.item_type
         formatted_item += f' {item_type_def_str}'
     formatted_item += f' **{item.item_name}**\n'
     if item.item_properties is not None:
         formatted_item += f' - {item.item_properties}\n'
-    formatted_item += f'  - *{item.item_descr}*\n'
+    formatted_item += f'  - *{item.item_desc}*\n'
     if item.item_action is not None and item.item_action.action_name:
         item_action = item.item_action
         formatted_item += '\n'
@@ -224,15 +240,7 @@ async def format_item(item: Item, game: Game) -> str:
             formatted_item += f' {item_action.action_timing} '
         if item_action.action_costs:
             formatted_item += f'- Cost: '
-            costs = []
-            for cost in item_action.action_costs:
-                game_res_defs = game.get_resource_definitions()
-                if cost.res_name in game_res_defs:
-                    res_def_display_name = game_res_defs[cost.res_name].emoji_text
-                else:
-                    res_def_display_name = cost.res_name
-                costs.append(f'{cost.amount} {res_def_display_name}')
-            formatted_item += ' + '.join(costs) + " "
+            formatted_item += await format_costs(item_action.action_costs, context=context)
         if item_action.action_uses and item_action.action_uses != -1:
             uses_emoji = await convert_uses_to_emoji(item_action.action_uses)
             formatted_item += f'- {uses_emoji} '
@@ -251,10 +259,11 @@ async def format_attribute(attribute_amt: int, attribute_definition: AttributeDe
 
 async def construct_attribute_modified_display(guild: Guild, action: Literal['increased', 'decreased'],
                                                player_attribute: Attribute, att_change_amt: int, game: Game) -> List[str]:
-    formatted_responses = []
+    context = await RenderContext.build(guild=guild, game=game)
+    paginator = MessagePaginator(context=context)
     formatted_attribute = ""
 
-    attribute_definition: AttributeDefinition = game.get_attribute_definition_by_name(player_attribute.name)
+    attribute_definition: AttributeDefinition = context.attribute_defs.get(player_attribute.name)
     attribute_string = await format_attribute(attribute_amt=player_attribute.level,
                                               attribute_definition=attribute_definition)
     change_att_str = await format_attribute(attribute_amt=att_change_amt, attribute_definition=attribute_definition)
@@ -265,35 +274,25 @@ async def construct_attribute_modified_display(guild: Guild, action: Literal['in
         formatted_attribute += f'You have **lost** {change_att_str}\n'
     formatted_attribute += f'You now have {attribute_string}'
 
-    formatted_responses.append(await sdec.format_text(text=formatted_attribute, guild=guild))
+    await paginator.add(formatted_attribute)
 
-    return formatted_responses
+    return paginator.finish()
 
 
 async def construct_player_attributes_display(player: Player, guild: Guild, game: Game) -> List[str]:
-    formatted_responses = []
-
-    formatted_attributes = ""
+    context = await RenderContext.build(guild=guild, game=game)
+    paginator = MessagePaginator(context=context)
 
     formatted_player_attribute_header = f'**Player {player.player_discord_name} Attributes as of <t:{int(time.time())}>**\n'
-    formatted_responses.append(formatted_player_attribute_header)
+    paginator.pages.append(formatted_player_attribute_header)
 
     for player_attribute in player.player_attributes:
-        att_def: AttributeDefinition = game.get_attribute_definition_by_name(player_attribute.name)
+        att_def: AttributeDefinition = context.attribute_defs.get(player_attribute.name)
 
-        this_formatted_attribute = await format_attribute(attribute_amt=player_attribute.level,
-                                                          attribute_definition=att_def) + "\n"
-        if len(await sdec.format_text(text=formatted_attributes, guild=guild)) + len(
-                await sdec.format_text(text=this_formatted_attribute, guild=guild)) <= 1750:
-            formatted_attributes += this_formatted_attribute
-        else:
-            formatted_responses.append(await sdec.format_text(text=formatted_attributes, guild=guild))
-            formatted_attributes = ""
-            formatted_attributes += this_formatted_attribute
-    if formatted_attributes:
-        formatted_responses.append(await sdec.format_text(text=formatted_attributes, guild=guild))
+        await paginator.add(await format_attribute(attribute_amt=player_attribute.level,
+                                                   attribute_definition=att_def) + "\n")
 
-    return formatted_responses
+    return paginator.finish()
 
 
 async def format_attribute_row(attribute_defs: dict[str, AttributeDefinition], player: Player) -> str:
@@ -320,29 +319,16 @@ async def format_attribute_row(attribute_defs: dict[str, AttributeDefinition], p
 
 
 async def construct_player_attributes_display_table(players: List[Player], guild: Guild, game: Game) -> List[str]:
-    formatted_responses = []
-
-    formatted_attributes = ""
+    context = await RenderContext.build(guild=guild, game=game)
+    paginator = MessagePaginator(context=context)
 
     formatted_player_attribute_header = f'**Aggregate Player Attributes as of <t:{int(time.time())}>**\n'
-    formatted_responses.append(formatted_player_attribute_header)
-
-    att_defs: dict[str, AttributeDefinition] = game.get_attribute_definitions()
+    paginator.pages.append(formatted_player_attribute_header)
 
     for player in players:
-        formatted_attribute_row = await format_attribute_row(attribute_defs=att_defs, player=player)
+        await paginator.add(await format_attribute_row(attribute_defs=context.attribute_defs, player=player))
 
-        if len(await sdec.format_text(text=formatted_attributes, guild=guild)) + len(
-                await sdec.format_text(text=formatted_attribute_row, guild=guild)) <= 1500:
-            formatted_attributes += formatted_attribute_row
-        else:
-            formatted_responses.append(await sdec.format_text(text=formatted_attributes, guild=guild))
-            formatted_attributes = ""
-            formatted_attributes += formatted_attribute_row
-    if formatted_attributes:
-        formatted_responses.append(await sdec.format_text(text=formatted_attributes, guild=guild))
-
-    return formatted_responses
+    return paginator.finish()
 
 
 async def format_resource(resource_amt: int, resource_definition: ResourceDefinition) -> str:
@@ -356,10 +342,11 @@ async def format_resource(resource_amt: int, resource_definition: ResourceDefini
 async def construct_resource_modified_display(guild: Guild, action: Literal[
     'gained', 'lost', 'income', 'expired', 'received', 'sent'],
                                               player_resource: Resource, res_change_amt: int, game: Game) -> List[str]:
-    formatted_responses = []
+    context = await RenderContext.build(guild=guild, game=game)
+    paginator = MessagePaginator(context=context)
     formatted_resource = ""
 
-    resource_definition: ResourceDefinition = game.get_resource_definition_by_name(player_resource.resource_type)
+    resource_definition: ResourceDefinition = context.resource_defs.get(player_resource.resource_type)
     resource_string = await format_resource(resource_amt=player_resource.resource_amt,
                                             resource_definition=resource_definition)
     change_res_str = await format_resource(resource_amt=res_change_amt, resource_definition=resource_definition)
@@ -380,34 +367,24 @@ async def construct_resource_modified_display(guild: Guild, action: Literal[
             formatted_resource += f'You have **sent** {change_res_str}\n'
         formatted_resource += f'You now have {resource_string}'
 
-    formatted_responses.append(await sdec.format_text(text=formatted_resource, guild=guild))
+    await paginator.add(formatted_resource)
 
-    return formatted_responses
+    return paginator.finish()
 
 
 async def construct_player_resources_display(player: Player, guild: Guild, game: Game) -> List[str]:
-    formatted_responses = []
+    context = await RenderContext.build(guild=guild, game=game)
+    paginator = MessagePaginator(context=context)
 
     formatted_action_header = f'**Player {player.player_discord_name} Resources as of <t:{int(time.time())}>**\n'
-    formatted_responses.append(formatted_action_header)
+    paginator.pages.append(formatted_action_header)
 
-    formatted_resources = ""
     for player_resource in player.player_resources:
-        res_def: ResourceDefinition = game.get_resource_definition_by_name(player_resource.resource_type)
-
-        this_formatted_resource = await format_resource(resource_amt=player_resource.resource_amt,
-                                                        resource_definition=res_def) + "\n"
-        if len(await sdec.format_text(text=formatted_resources, guild=guild)) + len(
-                await sdec.format_text(text=this_formatted_resource, guild=guild)) <= 1750:
-            formatted_resources += this_formatted_resource
-        else:
-            formatted_responses.append(await sdec.format_text(text=formatted_resources, guild=guild))
-            formatted_resource = ""
-            formatted_resource += this_formatted_resource
-    if formatted_resources:
-        formatted_responses.append(await sdec.format_text(text=formatted_resources, guild=guild))
+        paginator.add_formatted(await render_resource_line(resource_amt=player_resource.resource_amt,
+                                                           resource_type=player_resource.resource_type,
+                                                           context=context))
 
-    return formatted_responses
+    return paginator.finish()
 
 
 async def format_resource_row(resource_defs: dict[str, ResourceDefinition], player: Player) -> str:
@@ -434,41 +411,28 @@ async def format_resource_row(resource_defs: dict[str, ResourceDefinition], play
 
 
 async def construct_player_resources_display_table(players: List[Player], guild: Guild, game: Game) -> List[str]:
-    formatted_responses = []
-
-    formatted_resources = ""
+    context = await RenderContext.build(guild=guild, game=game)
+    paginator = MessagePaginator(context=context)
 
     formatted_player_resource_header = f'**Aggregate Player Resources as of <t:{int(time.time())}>**\n'
-    formatted_responses.append(formatted_player_resource_header)
-
-    res_defs: dict[str, ResourceDefinition] = game.get_resource_definitions()
+    paginator.pages.append(formatted_player_resource_header)
 
     for player in players:
-        formatted_resource_row = await format_resource_row(resource_defs=res_defs, player=player)
+        await paginator.add(await format_resource_row(resource_defs=context.resource_defs, player=player))
 
-        if len(await sdec.format_text(text=formatted_resources, guild=guild)) + len(
-                await sdec.format_text(text=formatted_resource_row, guild=guild)) <= 1500:
-            formatted_resources += formatted_resource_row
-        else:
-            formatted_responses.append(await sdec.format_text(text=formatted_resources, guild=guild))
-            formatted_resources = ""
-            formatted_resources += formatted_resource_row
-    if formatted_resources:
-        formatted_responses.append(await sdec.format_text(text=formatted_resources, guild=guild))
-
-    return formatted_responses
+    return paginator.finish()
 
 
 async def insufficient_resources_msg(action: Action, player: Player, game: Game, guild: Guild) -> list[str]:
-    formatted_responses = []
+    context = await RenderContext.build(guild=guild, game=game)
+    paginator = MessagePaginator(context=context)
 
     formatted_action_header = f'**Insufficient resources for action {action.action_name}!\n'
-    formatted_responses.append(formatted_action_header)
+    paginator.pages.append(formatted_action_header)
 
-    formatted_resources = ""
     for resource_cost in action.action_costs:
         player_resource = player.get_resource(resource_cost.res_name)
-        res_def: ResourceDefinition = game.get_resource_definition_by_name(player_resource.resource_type)
+        res_def: ResourceDefinition = context.resource_defs.get(resource_cost.res_name)
 
         this_formatted_resource_cost = await format_resource(resource_amt=resource_cost.amount,
                                                              resource_definition=res_def)
@@ -478,16 +442,7 @@ async def insufficient_resources_msg(action: Action, player: Player, game: Game,
         else:
             this_formatted_player_resource = await format_resource(resource_amt=0, resource_definition=res_def)
 
-        this_formatted_resource = f"Action Resource Cost: {this_formatted_resource_cost}; " \
-                                  f"Player Resources: {this_formatted_player_resource}\n"
-
-        if len(await sdec.format_text(text=formatted_resources, guild=guild)) + len(
-                await sdec.format_text(text=this_formatted_resource, guild=guild)) <= 1750:
-            formatted_resources += this_formatted_resource
-        else:
-            formatted_responses.append(await sdec.format_text(text=formatted_resources, guild=guild))
-            formatted_resource = ""
-            formatted_resource += this_formatted_resource
-    formatted_responses.append(await sdec.format_text(text=formatted_resources, guild=guild))
+        await paginator.add(f"Action Resource Cost: {this_formatted_resource_cost}; "
+                            f"Player Resources: {this_formatted_player_resource}\n")
 
-    return formatted_responses
+    return paginator.finish()
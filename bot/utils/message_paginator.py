@@ -0,0 +1,61 @@
+#! message_paginator.py
+# Packs formatted message fragments into as few Discord messages as fit under the message length limit
+
+from typing import List
+from bot.utils.render_context import RenderContext
+
+# Discord rejects message content longer than this
+DISCORD_MESSAGE_LIMIT = 2000
+
+
+def split_oversized(text: str, limit: int) -> List[str]:
+    # A single fragment longer than a page is split at line breaks, and only cut mid-line when one line is too long
+    if len(text) <= limit:
+        return [text]
+    pieces = []
+    while len(text) > limit:
+        cut = text.rfind('\n', 0, limit) + 1
+        if cut == 0:
+            cut = limit
+        pieces.append(text[:cut])
+        text = text[cut:]
+    if text:
+        pieces.append(text)
+    return pieces
+
+
+class MessagePaginator:
+    def __init__(self, context: RenderContext, page_limit: int = DISCORD_MESSAGE_LIMIT):
+        self.context: RenderContext = context
+        self.page_limit: int = page_limit
+        self.pages: List[str] = []
+        # Fragments of the page being filled, joined once when the page is closed
+        self._fragments: List[str] = []
+        self._length: int = 0
+
+    async def add(self, text: str):
+        # Each fragment is formatted exactly once, and measured after emoji substitution since that is what is sent
+        self.add_formatted(await self.context.format_text(text))
+
+    def add_formatted(self, formatted_text: str):
+        for piece in split_oversized(formatted_text, self.page_limit):
+            if self._length + len(piece) > self.page_limit:
+                self.break_page()
+            self._fragments.append(piece)
+            self._length += len(piece)
+
+    async def add_page(self, text: str):
+        # Text that is always sent as a message of its own, e.g. a display header
+        self.break_page()
+        await self.add(text)
+        self.break_page()
+
+    def break_page(self):
+        if self._fragments:
+            self.pages.append(''.join(self._fragments))
+            self._fragments = []
+            self._length = 0
+
+    def finish(self) -> List[str]:
+        self.break_page()
+        return self.pages
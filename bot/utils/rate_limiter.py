@@ -0,0 +1,102 @@
+#! rate_limiter.py
+# Token bucket rate limiting for slash commands: per-user buckets with burst capacity under a global ceiling
+
+import time
+import discord
+from discord import app_commands
+from typing import Dict, Optional
+from bot.model.conf_vars import ConfVars as Conf
+
+
+class RateLimited(app_commands.CheckFailure):
+    def __init__(self, command_name: str, retry_after: float, is_global: bool):
+        self.command_name: str = command_name
+        self.retry_after: float = retry_after
+        self.is_global: bool = is_global
+        super().__init__(f'Command {command_name} is rate limited for {retry_after:.1f} seconds')
+
+
+class TokenBucket:
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self.tokens: float = capacity
+        self.updated: float = now
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def retry_after(self) -> float:
+        # Seconds until one token is available; 0 when a command may run now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def is_full(self) -> bool:
+        return self.tokens >= self.capacity
+
+
+class RateLimiter:
+    # Buckets that refilled completely are dropped on this interval, so idle users cost no memory
+    PRUNE_INTERVAL = 300.0
+
+    def __init__(self, rate: float, burst: int, global_rate: float, global_burst: int):
+        self.rate: float = rate
+        self.burst: int = burst
+        self._global_bucket: TokenBucket = TokenBucket(rate=global_rate, capacity=global_burst, now=time.monotonic())
+        self._buckets: Dict[tuple[str, int], TokenBucket] = {}
+        self._last_prune: float = time.monotonic()
+        self.allowed: Dict[str, int] = {}
+        self.rejected: Dict[str, int] = {}
+
+    def acquire(self, command_name: str, user_id: int, rate: Optional[float] = None, burst: Optional[int] = None):
+        now = time.monotonic()
+        self._prune(now)
+
+        bucket = self._buckets.get((command_name, user_id))
+        if bucket is None:
+            bucket = TokenBucket(rate=rate if rate else self.rate, capacity=burst if burst else self.burst, now=now)
+            self._buckets[(command_name, user_id)] = bucket
+        bucket.refill(now)
+        self._global_bucket.refill(now)
+
+        # Neither bucket is charged unless both allow the command
+        retry_after = bucket.retry_after()
+        global_retry_after = self._global_bucket.retry_after()
+        if retry_after or global_retry_after:
+            self.rejected[command_name] = self.rejected.get(command_name, 0) + 1
+            raise RateLimited(command_name=command_name, retry_after=max(retry_after, global_retry_after),
+                              is_global=global_retry_after > retry_after)
+
+        bucket.tokens -= 1
+        self._global_bucket.tokens -= 1
+        self.allowed[command_name] = self.allowed.get(command_name, 0) + 1
+
+    def _prune(self, now: float):
+        if now - self._last_prune < self.PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+        for key, bucket in list(self._buckets.items()):
+            bucket.refill(now)
+            if bucket.is_full():
+                del self._buckets[key]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {command_name: {'allowed': self.allowed.get(command_name, 0),
+                               'rejected': self.rejected.get(command_name, 0)}
+                for command_name in sorted(self.allowed.keys() | self.rejected.keys())}
+
+
+rate_limiter = RateLimiter(rate=Conf.RATE_LIMIT_RATE, burst=Conf.RATE_LIMIT_BURST,
+                           global_rate=Conf.RATE_LIMIT_GLOBAL_RATE, global_burst=Conf.RATE_LIMIT_GLOBAL_BURST)
+
+
+def rate_limit(rate: Optional[float] = None, burst: Optional[int] = None):
+    # Check decorator replacing app_commands.checks.cooldown; rate and burst override the configured defaults
+    def predicate(interaction: discord.Interaction) -> bool:
+        rate_limiter.acquire(command_name=interaction.command.name, user_id=interaction.user.id, rate=rate,
+                             burst=burst)
+        return True
+
+    return app_commands.check(predicate)
@@ -0,0 +1,29 @@
+#! render_context.py
+# Everything a response is rendered with, looked up once per response instead of once per fragment
+
+from discord import Guild
+from bot.model.data_model import Game, ActionTypeDefinition, ItemTypeDefinition, ResourceDefinition, \
+    AttributeDefinition
+from bot.cogs.emoji_manager import get_guild_emoji_version
+import bot.utils.string_decorator as sdec
+
+
+class RenderContext:
+    def __init__(self, guild: Guild, game: Game, emoji_matcher: sdec.EmojiMatcher, emoji_version: int):
+        self.guild: Guild = guild
+        self.game: Game = game
+        self.emoji_matcher: sdec.EmojiMatcher = emoji_matcher
+        self.emoji_version: int = emoji_version
+        self.action_type_defs: dict[str, ActionTypeDefinition] = game.get_action_type_definitions()
+        self.item_type_defs: dict[str, ItemTypeDefinition] = game.get_item_type_definitions()
+        self.resource_defs: dict[str, ResourceDefinition] = game.get_resource_definitions()
+        self.attribute_defs: dict[str, AttributeDefinition] = game.get_attribute_definitions()
+
+    @classmethod
+    async def build(cls, guild: Guild, game: Game) -> 'RenderContext':
+        emoji_matcher = await sdec.get_emoji_matcher(guild=guild)
+        return cls(guild=guild, game=game, emoji_matcher=emoji_matcher, emoji_version=get_guild_emoji_version())
+
+    async def format_text(self, text: str) -> str:
+        formatted_text = await sdec.reformat_newline(text=text)
+        return self.emoji_matcher.sub(formatted_text)
@@ -0,0 +1,82 @@
+#! report_refresher.py
+# Coalesces edits of pinned vote report messages into at most one edit per report per refresh window
+
+import asyncio
+import time
+import discord
+from typing import Awaitable, Callable, Dict
+from bot.botlogger.logging_manager import logger
+from bot.model.conf_vars import ConfVars as Conf
+
+
+class ReportRefresher:
+    def __init__(self, window: float):
+        self.window: float = window
+        # Latest render per report message; rendering happens at edit time so the newest tally always wins
+        self._renders: Dict[int, Callable[[], Awaitable[str]]] = {}
+        self._messages: Dict[int, discord.PartialMessage] = {}
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._last_edit: Dict[int, float] = {}
+        self.requested_edits: int = 0
+        self.performed_edits: int = 0
+        self.failed_edits: int = 0
+
+    def request_refresh(self, client: discord.Client, channel_id: int, message_id: int,
+                        render: Callable[[], Awaitable[str]]):
+        self.requested_edits += 1
+        self._renders[message_id] = render
+        if message_id not in self._messages:
+            # A partial message needs no REST round trips; edits go straight to the message endpoint
+            channel = client.get_partial_messageable(channel_id)
+            self._messages[message_id] = channel.get_partial_message(message_id)
+
+        refresh_task = self._tasks.get(message_id)
+        if refresh_task is None or refresh_task.done():
+            delay = max(0.0, self._last_edit.get(message_id, 0.0) + self.window - time.monotonic())
+            self._tasks[message_id] = asyncio.get_running_loop().create_task(self._refresh_later(message_id, delay))
+
+    async def _refresh_later(self, message_id: int, delay: float):
+        await asyncio.sleep(delay)
+        await self._refresh(message_id)
+        # Requests that arrived while the edit was in flight get one more edit, a window later
+        while message_id in self._renders:
+            await asyncio.sleep(self.window)
+            await self._refresh(message_id)
+
+    async def _refresh(self, message_id: int):
+        render = self._renders.pop(message_id, None)
+        message = self._messages.get(message_id)
+        if render is None or message is None:
+            return
+        self._last_edit[message_id] = time.monotonic()
+        try:
+            content = await render()
+        except Exception as e:
+            # Runs in a background task, where an escaping exception would only surface as an unretrieved task error
+            self.failed_edits += 1
+            logger.error(f'Failed to render report message {message_id}: {e!r}')
+            return
+        try:
+            await message.edit(content=content)
+            self.performed_edits += 1
+        except discord.HTTPException as e:
+            self.failed_edits += 1
+            logger.error(f'Failed to refresh report message {message_id}: {e}')
+            # The message may have been deleted or the channel changed; resolve it again on the next request
+            self._messages.pop(message_id, None)
+
+    async def flush(self):
+        # Sends every pending edit immediately (used on shutdown)
+        for message_id, refresh_task in list(self._tasks.items()):
+            if not refresh_task.done():
+                refresh_task.cancel()
+            await self._refresh(message_id)
+        self._tasks.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {'requested_edits': self.requested_edits, 'performed_edits': self.performed_edits,
+                'failed_edits': self.failed_edits,
+                'saved_edits': self.requested_edits - self.performed_edits - self.failed_edits - len(self._renders)}
+
+
+report_refresher = ReportRefresher(window=Conf.REPORT_REFRESH_WINDOW)
@@ -0,0 +1,55 @@
+#! single_flight.py
+# Shares one in-flight computation between concurrent identical requests and memoizes its result for a short time
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class SingleFlight:
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl: float = ttl
+        self.max_entries: int = max_entries
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        # Finished results with the time they expire, least recently used first
+        self._results: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        # Results are only valid for the object they were computed from (e.g. the loaded game instance)
+        self._generation: Optional[Any] = None
+        self.memo_hits: int = 0
+        self.shared_calls: int = 0
+        self.computed_calls: int = 0
+
+    async def run(self, key: Hashable, compute: Callable[[], Awaitable[Any]], generation: Optional[Any] = None) -> Any:
+        if generation is not self._generation:
+            self._results.clear()
+            self._generation = generation
+
+        memoized = self._results.get(key)
+        if memoized is not None and memoized[1] > time.monotonic():
+            self._results.move_to_end(key)
+            self.memo_hits += 1
+            return memoized[0]
+
+        flight = self._in_flight.get(key)
+        if flight is not None:
+            self.shared_calls += 1
+        else:
+            self.computed_calls += 1
+            flight = asyncio.get_running_loop().create_task(compute())
+            self._in_flight[key] = flight
+            flight.add_done_callback(lambda done_flight: self._land(key, done_flight, generation))
+        # Shielded so that one caller giving up does not cancel the computation the others are waiting on
+        return await asyncio.shield(flight)
+
+    def _land(self, key: Hashable, flight: asyncio.Task, generation: Optional[Any]):
+        self._in_flight.pop(key, None)
+        if flight.cancelled() or flight.exception() is not None or generation is not self._generation:
+            return
+        self._results[key] = (flight.result(), time.monotonic() + self.ttl)
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {'memo_hits': self.memo_hits, 'shared_calls': self.shared_calls, 'computed_calls': self.computed_calls}
@@ -1,34 +1,68 @@
 #! string_decorator.py
 # Class with commands for formatting strings
 
-from bot.cogs.emoji_manager import get_guild_emojis
+from bot.cogs.emoji_manager import get_guild_emojis, get_guild_emoji_version
 from discord import Guild
+from typing import Optional
 import re
 
+# An emoji name up to, but not including, its closing colon; the colon is left for the next token to start from when
+# the name is not a known emoji (e.g. "10:30:smile:")
+EMOJI_TOKEN_PATTERN = re.compile(r':\w+(?=:)')
+NEWLINE_ESCAPE_PATTERN = re.compile(r'\\.')
+
+
+class EmojiMatcher:
+    # Replaces :name: tokens in a single left to right pass, looking each one up in the emoji map
+    def __init__(self, emoji_map: dict[str, str], ignore_case=False):
+        self.ignore_case = ignore_case
+        self.replacements: dict[str, str] = {(key.lower() if ignore_case else key): val
+                                             for key, val in emoji_map.items()}
+
+    def sub(self, text: str) -> str:
+        if not self.replacements or ':' not in text:
+            return text
+
+        pieces = []
+        position = 0
+        search_start = 0
+        while True:
+            match = EMOJI_TOKEN_PATTERN.search(text, search_start)
+            if match is None:
+                break
+            token = match.group(0) + ':'
+            replacement = self.replacements.get(token.lower() if self.ignore_case else token)
+            if replacement is None:
+                search_start = match.end()
+                continue
+            pieces.append(text[position:match.start()])
+            pieces.append(replacement)
+            position = search_start = match.end() + 1
+        if not pieces:
+            return text
+        pieces.append(text[position:])
+        return ''.join(pieces)
+
+
+# Matcher for the guild emoji map, with the emoji map version it was built from
+_guild_emoji_matcher: Optional[tuple[int, EmojiMatcher]] = None
+
+
+async def get_emoji_matcher(guild: Guild) -> EmojiMatcher:
+    # Built once per version of the guild's emoji set; the emoji manager bumps the version when the emojis change
+    global _guild_emoji_matcher
+    guild_emojis = await get_guild_emojis(guild=guild)
+    version = get_guild_emoji_version()
+    if _guild_emoji_matcher is None or _guild_emoji_matcher[0] != version:
+        _guild_emoji_matcher = (version, EmojiMatcher(emoji_map=guild_emojis))
+    return _guild_emoji_matcher[1]
+
 
 async def emoji_sub(text: str, emoji_map: dict[str, str], ignore_case=False):
     if not emoji_map:
         return text
 
-    if ignore_case:
-        def normalize_old(s):
-            return s.lower()
-
-        re_mode = re.IGNORECASE
-    else:
-        def normalize_old(s):
-            return s
-
-        re_mode = 0
-
-    replacements: dict[str, str] = {normalize_old(key): val for key, val in emoji_map.items()}
-
-    rep_sorted = sorted(replacements, key=len, reverse=True)
-    rep_escaped = map(re.escape, rep_sorted)
-
-    pattern = re.compile("|".join(rep_escaped), re_mode)
-
-    return pattern.sub(lambda match: replacements[normalize_old(match.group(0))], text)
+    return EmojiMatcher(emoji_map=emoji_map, ignore_case=ignore_case).sub(text)
 
 async def format_text(text: str, guild: Guild) -> str:
 
@@ -39,14 +73,16 @@ async def format_text(text: str, guild: Guild) -> str:
 
 
 async def reformat_newline(text: str) -> str:
-    formatted_text = re.sub(r'\\.', lambda x: {'\\n': '\n'}.get(x[0], x[0]), text)
+    if '\\' not in text:
+        return text
+    formatted_text = NEWLINE_ESCAPE_PATTERN.sub(lambda x: '\n' if x[0] == '\\n' else x[0], text)
 
     return formatted_text
 
 
 async def emojify(text: str, guild: Guild) -> str:
-    guild_emojis = await get_guild_emojis(guild=guild)
+    emoji_matcher = await get_emoji_matcher(guild=guild)
 
-    subbed_text = await emoji_sub(text=text, emoji_map=guild_emojis)
+    subbed_text = emoji_matcher.sub(text)
 
     return subbed_text
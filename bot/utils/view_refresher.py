@@ -0,0 +1,66 @@
+#! view_refresher.py
+# Refreshes the messages of a persistent view, editing only the messages whose content changed since the last refresh
+
+import asyncio
+import hashlib
+from discord import Guild
+from typing import Dict, List
+import bot.model.data_model as gdm
+from bot.model.conf_vars import ConfVars as Conf
+from bot.utils.channel_resolver import channel_resolver
+
+# Discord rejects empty messages, so view messages without a page of content show this instead
+EMPTY_MESSAGE_CONTENT = "."
+# Seconds between consecutive edits of one view, keeping a full refresh clear of the per-channel rate limit
+EDIT_INTERVAL = 1.0
+
+
+def hash_message_content(content: str) -> str:
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
+def hash_view_pages(message_count: int, pages: List[str]) -> List[str]:
+    return [hash_message_content(pages[i] if i < len(pages) else EMPTY_MESSAGE_CONTENT) for i in range(message_count)]
+
+
+class ViewRefresher:
+    def __init__(self):
+        self.performed_edits: int = 0
+        self.skipped_edits: int = 0
+
+    async def refresh_view(self, guild: Guild, view_name: str, pages: List[str]) -> int:
+        game = await gdm.get_game(file_path=Conf.GAME_PATH)
+        pi_view = game.get_pi_view(view_name)
+        message_ids = list(pi_view.message_ids)
+        new_hashes = hash_view_pages(len(message_ids), pages)
+
+        # Hashes of what each message shows now; a message whose edit fails keeps its old hash and is retried next time
+        written_hashes = (list(pi_view.message_hashes) + [''] * len(message_ids))[:len(message_ids)]
+        edits = 0
+        try:
+            for i, msg_id in enumerate(message_ids):
+                if written_hashes[i] == new_hashes[i]:
+                    self.skipped_edits += 1
+                    continue
+                if edits:
+                    await asyncio.sleep(EDIT_INTERVAL)
+                # A partial message is edited directly, without fetching the message first
+                msg = await channel_resolver.resolve_message(guild, pi_view.channel_id, msg_id)
+                await msg.edit(content=pages[i] if i < len(pages) else EMPTY_MESSAGE_CONTENT)
+                written_hashes[i] = new_hashes[i]
+                edits += 1
+                self.performed_edits += 1
+        finally:
+            if edits:
+                async with gdm.mutate_game() as mutation:
+                    mutated_view = mutation.game.get_pi_view(view_name)
+                    # The view may have been deleted or recreated while its messages were being edited
+                    if mutated_view is not None and mutated_view.message_ids == message_ids:
+                        mutated_view.message_hashes = written_hashes
+        return edits
+
+    def stats(self) -> Dict[str, int]:
+        return {'performed_edits': self.performed_edits, 'skipped_edits': self.skipped_edits}
+
+
+view_refresher = ViewRefresher()
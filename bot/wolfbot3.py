@@ -5,16 +5,24 @@ from discord.ext import commands
 from discord import app_commands
 from bot.botlogger.logging_manager import logger, log_info
 from bot.model.conf_vars import ConfVars as Conf
+import bot.model.data_model as gdm
+from bot.utils.report_refresher import report_refresher
+from bot.utils.command_pipeline import drain_background_tasks
+from bot.utils.rate_limiter import RateLimited
+from bot.utils.channel_resolver import channel_resolver
+from bot.utils.member_resolver import member_resolver
 from bot.cogs.action_views import ActionViewButtons
 from bot.cogs.item_views import ItemViewButtons
 
 class WolfBot(commands.Bot):
     def __init__(self):
-        super().__init__(command_prefix='!', intents=discord.Intents.all(), help_command=None)
+        super().__init__(command_prefix='!', intents=discord.Intents.all(), help_command=None,
+                         chunk_guilds_at_startup=Conf.CHUNK_MEMBERS_AT_STARTUP)
         self.synced = False
         faulthandler.enable()
 
     async def setup_hook(self):
+        gdm.recover_game_files()
         # await self.load_extension(f"cogs.test")
         await self.load_extension(f"cogs.game_management")
         await self.load_extension(f"cogs.player_management")
@@ -41,17 +49,51 @@ class WolfBot(commands.Bot):
         self.add_view(ItemViewButtons())
         print(f"We have logged in as {self.user}.")
 
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        channel_resolver.invalidate_channel(channel.id)
+
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        channel_resolver.invalidate_channel(after.id)
+
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        channel_resolver.invalidate_message(payload.message_id)
+
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        member_resolver.invalidate_member(after.id)
+
+    async def on_member_remove(self, member: discord.Member):
+        member_resolver.invalidate_member(member.id)
+
+    async def close(self):
+        await drain_background_tasks()
+        await report_refresher.flush()
+        await gdm.close_game()
+        await super().close()
+
 
 bot = WolfBot()
 
 
-@bot.event
+@bot.tree.error
 async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
-    if isinstance(error, app_commands.CommandOnCooldown):
-        await interaction.response.send_message(
-            f"Cooldown is in force, please wait for {round(error.retry_after)} seconds", ephemeral=True)
+    # Failed app command checks are reported to the tree's error handler, not dispatched as bot events
+    if isinstance(error, RateLimited):
+        limit_scope = 'The bot is handling a lot of commands right now' if error.is_global \
+            else 'You are sending commands too quickly'
+        await send_error_response(interaction,
+                                  f"{limit_scope}, please wait {error.retry_after:.1f} seconds and try again")
+    elif isinstance(error, app_commands.CommandOnCooldown):
+        await send_error_response(interaction,
+                                  f"Cooldown is in force, please wait for {round(error.retry_after)} seconds")
+    else:
+        await app_commands.CommandTree.on_error(bot.tree, interaction, error)
+
+
+async def send_error_response(interaction: discord.Interaction, message: str):
+    if interaction.response.is_done():
+        await interaction.followup.send(message, ephemeral=True)
     else:
-        raise error
+        await interaction.response.send_message(message, ephemeral=True)
 
 
 def log_interaction_call(interaction: discord.Interaction):
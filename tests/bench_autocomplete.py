@@ -0,0 +1,72 @@
+#! bench_autocomplete.py
+# Per-keystroke latency of NameIndex.search, with prefix, typo and swapped-letter queries. Names made of random letters
+# are the typical case; names built from a few shared syllables are the worst case for the typo prefilter, which then
+# lets many more names through to the edit distance check. The baseline column is the sorted substring scan the
+# autocompletes ran before the index, timed on the same queries.
+#   PYTHONPATH=. python tests/bench_autocomplete.py
+
+import random
+import string
+from typing import Callable, Iterable, List
+import conftest
+from bench_common import time_calls, format_samples
+from bot.utils.autocomplete_index import MAX_CHOICES, NameIndex
+
+CANDIDATE_COUNTS = (25, 250, 2500)
+SYLLABLES = ('ka', 'lo', 'mi', 'ren', 'tor', 'vel', 'sha', 'dun', 'ith', 'or', 'bel', 'zar')
+
+
+def random_letter_word(rng: random.Random) -> str:
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+
+
+def syllable_word(rng: random.Random) -> str:
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def make_names(rng: random.Random, make_word: Callable[[random.Random], str], count: int) -> List[str]:
+    return [' '.join(make_word(rng) for _ in range(rng.randint(1, 3))) + f' {name_num}' for name_num in range(count)]
+
+
+def make_queries(rng: random.Random, names: List[str], count: int) -> List[str]:
+    # A third each of plain prefixes, prefixes with one wrong letter and prefixes with two letters swapped
+    queries = []
+    for query_num in range(count):
+        name = rng.choice(names)
+        query = name[:rng.randint(3, min(8, len(name)))]
+        if query_num % 3 == 1:
+            typo_at = rng.randrange(len(query))
+            query = query[:typo_at] + rng.choice(string.ascii_lowercase) + query[typo_at + 1:]
+        elif query_num % 3 == 2:
+            swap_at = rng.randrange(len(query) - 1)
+            query = query[:swap_at] + query[swap_at + 1] + query[swap_at] + query[swap_at + 2:]
+        queries.append(query)
+    return queries
+
+
+def baseline_search(names: List[str], query: str) -> List[str]:
+    matches = []
+    for name in sorted(names, key=lambda e: e.lower()):
+        if query and query.lower() not in name.lower():
+            continue
+        matches.append(name)
+    return matches[:MAX_CHOICES]
+
+
+def main(candidate_counts: Iterable[int] = CANDIDATE_COUNTS, query_count: int = 600):
+    for label, make_word in (('random letters', random_letter_word), ('shared syllables', syllable_word)):
+        rng = random.Random(19)
+        for candidate_count in candidate_counts:
+            names = make_names(rng, make_word, candidate_count)
+            name_index = NameIndex((name, name) for name in names)
+            query_list = make_queries(rng, names, query_count)
+            queries = iter(query_list)
+            samples = time_calls(lambda: name_index.search(next(queries)), query_count)
+            queries = iter(query_list)
+            baseline_samples = time_calls(lambda: baseline_search(names, next(queries)), query_count)
+            print(f'{candidate_count} candidates, {label}: {format_samples(samples)}; '
+                  f'baseline scan {format_samples(baseline_samples)}')
+
+
+if __name__ == '__main__':
+    main()
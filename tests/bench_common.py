@@ -0,0 +1,40 @@
+#! bench_common.py
+# Timing helpers shared by the bench_*.py scripts. The scripts are run by hand from the repository root, e.g.
+#   PYTHONPATH=. python tests/bench_game_load.py
+# and are not collected by pytest; test_benchmarks.py only checks that they still run.
+
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+
+def time_calls(func: Callable[[], object], repeat: int) -> List[float]:
+    # Duration of each call, in milliseconds
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def time_async_calls(func: Callable[[], Awaitable], repeat: int) -> List[float]:
+    async def run():
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await func()
+            samples.append((time.perf_counter() - started) * 1000)
+        return samples
+
+    return asyncio.run(run())
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def format_samples(samples: List[float]) -> str:
+    return f'p50 {statistics.median(samples):.2f} ms, p99 {percentile(samples, 0.99):.2f} ms'
@@ -0,0 +1,80 @@
+#! bench_game_load.py
+# Loading a bot-written snapshot (trusted, single-pass model_validate_json) against the fully validated path that
+# hand-edited files take, on synthetic games with 20 actions and 20 items per player. Also times building the game
+# with model_construct over the parsed tree instead of validating it, and a startup: the recovery check plus the load.
+#   PYTHONPATH=. python tests/bench_game_load.py
+
+import json
+import os
+import statistics
+import typing
+from typing import Iterable
+from pydantic import BaseModel
+from conftest import TEST_BASE_PATH, make_game, make_action, make_item
+from bench_common import time_calls
+import bot.model.data_model as gdm
+
+PLAYER_COUNTS = (10, 50, 200)
+
+
+def make_player_heavy_game(player_count: int, per_player: int = 20) -> gdm.Game:
+    game = make_game(player_count=player_count)
+    for player in game.players:
+        for entry_num in range(per_player):
+            player.add_action(make_action(f'Action {entry_num}'))
+            player.add_item(make_item(f'Item {entry_num}', action=make_action(f'Item action {entry_num}')))
+    return game
+
+
+def construct_from_tree(annotation, value):
+    # Builds the model tree with model_construct, skipping validation; only handles the types the game model uses
+    origin = typing.get_origin(annotation)
+    if value is None:
+        return None
+    if origin is typing.Union:
+        return construct_from_tree(next(arg for arg in typing.get_args(annotation) if arg is not type(None)), value)
+    if origin in (list, set):
+        return origin(construct_from_tree(typing.get_args(annotation)[0], entry) for entry in value)
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        fields = {}
+        for field_name, field in annotation.model_fields.items():
+            key = field.alias if field.alias in value else field_name
+            if key in value:
+                fields[field_name] = construct_from_tree(field.annotation, value[key])
+        return annotation.model_construct(**fields)
+    return value
+
+
+def main(player_counts: Iterable[int] = PLAYER_COUNTS, repeat: int = 5):
+    file_path = os.path.join(TEST_BASE_PATH, 'bench_game.json')
+    for player_count in player_counts:
+        game = make_player_heavy_game(player_count)
+        gdm.write_dom_to_json(game=game, filepath=file_path)
+        trusted = time_calls(lambda: gdm.read_json_to_dom(filepath=file_path), repeat)
+
+        def construct():
+            # model_construct still runs Game.model_post_init, which binds the tree like a validated load
+            with open(file_path, 'rb') as snapshot_file:
+                return construct_from_tree(gdm.Game, json.loads(snapshot_file.read()))
+
+        assert construct().model_dump() == game.model_dump()
+        constructed = time_calls(construct, repeat)
+
+        def startup():
+            gdm.recover_json_file(filepath=file_path, model=gdm.Game)
+            return gdm.read_json_to_dom(filepath=file_path)
+
+        trusted_startup = time_calls(startup, repeat)
+        # Without its meta file the snapshot can no longer be trusted, like a hand-edited one
+        os.remove(gdm.snapshot_meta_path(file_path))
+        full = time_calls(lambda: gdm.read_json_to_dom(filepath=file_path), repeat)
+        full_startup = time_calls(startup, repeat)
+        print(f'{player_count} players: trusted {statistics.median(trusted):.1f} ms, '
+              f'full validation {statistics.median(full):.1f} ms, '
+              f'model_construct {statistics.median(constructed):.1f} ms; '
+              f'startup trusted {statistics.median(trusted_startup):.1f} ms, '
+              f'untrusted {statistics.median(full_startup):.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
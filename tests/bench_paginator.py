@@ -0,0 +1,51 @@
+#! bench_paginator.py
+# Rendering and paging the action and item catalog displays, with 60 guild emojis. Cold runs start from an empty
+# fragment cache; warm runs reuse the fragments of the previous run.
+#   PYTHONPATH=. python tests/bench_paginator.py
+
+import asyncio
+import statistics
+import types
+from typing import Iterable
+from conftest import make_game, make_action, make_item
+from bench_common import time_async_calls
+from bot.model.data_model import ResourceCost
+from bot.utils.fragment_cache import fragment_cache
+from bot.utils.message_formatter import construct_action_display, construct_item_display
+
+CATALOG_SIZES = (50, 200, 1000)
+EMOJI_COUNT = 60
+
+
+def make_catalog_game(size: int):
+    actions = [make_action(f'Action {entry_num}', uses=entry_num % 7,
+                           costs=[ResourceCost(res_name='gold', amount=2)]) for entry_num in range(size)]
+    for action in actions:
+        action.action_desc = f'Does thing :e{len(action.action_name) % EMOJI_COUNT}: to a target, with a ' \
+                             f'reasonably long description of the effect.'
+    items = [make_item(f'Item {entry_num}', action=actions[entry_num] if entry_num % 3 == 0 else None)
+             for entry_num in range(size)]
+    return make_game(player_count=1, actions=actions, items=items)
+
+
+def main(catalog_sizes: Iterable[int] = CATALOG_SIZES, repeat: int = 5):
+    guild = types.SimpleNamespace(id=1, emojis=[types.SimpleNamespace(name=f'e{emoji_num}', id=10 ** 17 + emoji_num)
+                                                for emoji_num in range(EMOJI_COUNT)])
+    for size in catalog_sizes:
+        game = make_catalog_game(size)
+        for label, render in (('actions', lambda: construct_action_display(guild=guild, game=game,
+                                                                           actions=game.actions)),
+                              ('items', lambda: construct_item_display(guild=guild, game=game, items=game.items))):
+            async def cold_render():
+                fragment_cache.clear()
+                return await render()
+
+            cold = time_async_calls(cold_render, repeat)
+            warm = time_async_calls(render, repeat)
+            page_count = len(asyncio.run(render()))
+            print(f'{size} {label}: cold {statistics.median(cold):.1f} ms, warm {statistics.median(warm):.1f} ms, '
+                  f'{page_count} pages')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#! bench_render.py
+# Emoji substitution and display rendering with 60 guild emojis, against the implementations they replaced:
+#  - format_text on one 20-action page: the alternation regex rebuilt on every call vs EmojiMatcher
+#  - format_action over a catalog: definitions and emoji matcher looked up for every fragment (a RenderContext built
+#    per action) vs one RenderContext per response
+#  - construct_action_display, cold: the original builders (tests/baseline_message_formatter.py with the old
+#    format_text) vs the current ones with an empty fragment cache
+#   PYTHONPATH=. python tests/bench_render.py
+
+import asyncio
+import re
+import statistics
+import types
+from typing import Iterable
+from conftest import make_game, make_action
+from bench_common import time_calls, time_async_calls
+import baseline_message_formatter as baseline
+import bot.utils.string_decorator as sdec
+from bot.cogs.emoji_manager import get_guild_emojis
+from bot.model.data_model import ResourceCost, ResourceDefinition, ActionTypeDefinition
+from bot.utils.fragment_cache import fragment_cache
+from bot.utils.message_formatter import construct_action_display, format_action
+from bot.utils.render_context import RenderContext
+
+CATALOG_SIZES = (200, 1000)
+EMOJI_COUNT = 60
+PAGE_ACTIONS = 20
+
+
+async def baseline_emoji_sub(text: str, emoji_map: dict[str, str]) -> str:
+    # emoji_sub before EmojiMatcher, without the unused ignore_case branch
+    if not emoji_map:
+        return text
+    rep_escaped = map(re.escape, sorted(emoji_map, key=len, reverse=True))
+    pattern = re.compile("|".join(rep_escaped))
+    return pattern.sub(lambda match: emoji_map[match.group(0)], text)
+
+
+async def baseline_format_text(text: str, guild) -> str:
+    formatted_text = re.sub(r'\\.', lambda x: {'\\n': '\n'}.get(x[0], x[0]), text)
+    return await baseline_emoji_sub(formatted_text, await get_guild_emojis(guild=guild))
+
+
+def make_render_game(size: int):
+    actions = [make_action(f'Action {entry_num}', uses=entry_num % 7,
+                           costs=[ResourceCost(res_name='gold', amount=2)]) for entry_num in range(size)]
+    for entry_num, action in enumerate(actions):
+        action.action_type = 'Spell'
+        action.action_desc = f'Strikes one target with :e{entry_num % EMOJI_COUNT}:.'
+    return make_game(player_count=1, actions=actions,
+                     resource_definitions=[ResourceDefinition(resource_name='gold', is_commodity=True,
+                                                              is_perishable=False, emoji_text=':e1:')],
+                     action_type_definitions=[ActionTypeDefinition(action_type='Spell', emoji_text=':e2:')])
+
+
+def time_per_call_us(func, calls: int, repeat: int) -> float:
+    # Median over repeat batches, in microseconds per call
+    return statistics.median(time_calls(lambda: [func() for _ in range(calls)], repeat)) * 1000 / calls
+
+
+def main(catalog_sizes: Iterable[int] = CATALOG_SIZES, repeat: int = 5, calls: int = 500):
+    guild = types.SimpleNamespace(id=1, emojis=[types.SimpleNamespace(name=f'e{emoji_num}', id=10 ** 17 + emoji_num)
+                                                for emoji_num in range(EMOJI_COUNT)])
+    loop = asyncio.new_event_loop()
+
+    page_game = make_render_game(PAGE_ACTIONS)
+    page_context = loop.run_until_complete(RenderContext.build(guild=guild, game=page_game))
+    page = ''.join(loop.run_until_complete(format_action(action, context=page_context))
+                   for action in page_game.actions)
+    assert loop.run_until_complete(baseline_format_text(page, guild)) == \
+        loop.run_until_complete(sdec.format_text(page, guild))
+    before = time_per_call_us(lambda: loop.run_until_complete(baseline_format_text(page, guild)), calls, repeat)
+    after = time_per_call_us(lambda: loop.run_until_complete(sdec.format_text(page, guild)), calls, repeat)
+    print(f'format_text, {len(page)} character page: regex rebuilt per call {before:.1f} us, '
+          f'EmojiMatcher {after:.1f} us')
+    loop.close()
+
+    for size in catalog_sizes:
+        game = make_render_game(size)
+
+        async def context_per_fragment():
+            for action in game.actions:
+                await format_action(action, context=await RenderContext.build(guild=guild, game=game))
+
+        async def context_per_response():
+            context = await RenderContext.build(guild=guild, game=game)
+            for action in game.actions:
+                await format_action(action, context=context)
+
+        before = statistics.median(time_async_calls(context_per_fragment, repeat))
+        after = statistics.median(time_async_calls(context_per_response, repeat))
+        print(f'{size} actions, format_action: lookups per fragment {before:.2f} ms, per response {after:.2f} ms')
+
+        async def baseline_display():
+            original_format_text = sdec.format_text
+            sdec.format_text = baseline_format_text
+            try:
+                return await baseline.construct_action_display(guild=guild, game=game, actions=game.actions)
+            finally:
+                sdec.format_text = original_format_text
+
+        async def cold_display():
+            fragment_cache.clear()
+            return await construct_action_display(guild=guild, game=game, actions=game.actions)
+
+        before = statistics.median(time_async_calls(baseline_display, repeat))
+        after = statistics.median(time_async_calls(cold_display, repeat))
+        print(f'{size} actions, construct_action_display cold: original {before:.1f} ms, current {after:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#! conftest.py
+# Shared test setup: the bot reads its settings from the environment at import time, so the game files are pointed at
+# a throwaway directory before any bot module is imported
+
+import os
+import tempfile
+import types
+import pytest
+
+TEST_BASE_PATH = tempfile.mkdtemp(prefix='wolfbot-tests-')
+
+# Set (not defaulted) so that a developer's .env can never point the tests at a real game file
+os.environ['BASE_PATH'] = TEST_BASE_PATH
+os.environ['GAME_FILE'] = 'game.json'
+os.environ['STORAGE_BACKEND'] = 'json'
+for unset_name in ('WRITE_BEHIND_INTERVAL', 'JOURNAL_SNAPSHOT_EVERY', 'GAME_CATALOG_FILE'):
+    os.environ.pop(unset_name, None)
+for required_name in ('DISCORD_TOKEN', 'GUILD_ID', 'MOD_ROLE_ID', 'PRIVATE_CHAT_CATEGORY', 'MOD_CATEGORY',
+                      'REQUEST_CHANNEL', 'VOTE_CHANNEL'):
+    os.environ.setdefault(required_name, '1')
+
+import bot.model.data_model as gdm
+from bot.model.conf_vars import ConfVars as Conf
+from bot.model.data_model import Game, Player, Party, Round, Dilemma, Action, Item, Resource, ResourceCost
+
+
+@pytest.fixture(autouse=True)
+def game_store(monkeypatch):
+    # Every test starts from an empty game directory, a fresh resident game cache and synchronous writes
+    for file_name in os.listdir(TEST_BASE_PATH):
+        if file_name.startswith('game.json'):
+            os.remove(os.path.join(TEST_BASE_PATH, file_name))
+    monkeypatch.setattr(Conf, 'WRITE_BEHIND_INTERVAL', None)
+    monkeypatch.setattr(Conf, 'JOURNAL_SNAPSHOT_EVERY', None)
+    store = gdm.GameStore(backend=gdm.JsonGameStorage())
+    monkeypatch.setattr(gdm, 'game_store', store)
+    yield store
+    store._executor.shutdown(wait=True)
+
+
+def make_game(player_count: int = 3, **fields) -> Game:
+    game_fields = dict(is_active=True, parties_locked=False, voting_locked=False, items_locked=False,
+                       resources_locked=False,
+                       players=[Player(player_id=player_id, player_discord_name=f'player{player_id}',
+                                       player_resources=[Resource(resource_type='gold', resource_amt=10)])
+                                for player_id in range(1, player_count + 1)],
+                       rounds=[Round(round_channel_id=1, round_message_id=1, round_number=1, is_active_round=True)])
+    game_fields.update(fields)
+    return Game(**game_fields)
+
+
+def make_action(action_name: str, uses: int = 2, costs: list[ResourceCost] = None) -> Action:
+    return Action(action_name=action_name, action_uses=uses, action_priority=1, action_desc=f'{action_name} text',
+                  action_costs=costs if costs else [])
+
+
+def make_item(item_name: str, action: Action = None) -> Item:
+    return Item(item_name=item_name, item_type='Standard', item_desc=f'{item_name} text', item_action=action)
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int = 1):
+        self.id = channel_id
+        self.sent: list[str] = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append(content)
+
+
+class FakeResponse:
+    def __init__(self):
+        self.done = False
+        self.sent: list[str] = []
+
+    def is_done(self) -> bool:
+        return self.done
+
+    async def defer(self, **kwargs):
+        self.done = True
+
+    async def send_message(self, content=None, **kwargs):
+        self.done = True
+        self.sent.append(content)
+
+
+class FakeFollowup:
+    def __init__(self):
+        self.sent: list[str] = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append(content)
+
+
+def make_interaction(user_id: int, command_name: str = 'test-command'):
+    # Just enough of discord.Interaction for command callbacks run without a gateway connection
+    channel = FakeChannel()
+    guild = types.SimpleNamespace(id=int(os.environ['GUILD_ID']), emojis=[], get_channel=lambda channel_id: channel,
+                                  get_member=lambda member_id: None)
+    return types.SimpleNamespace(user=types.SimpleNamespace(id=user_id, name=f'player{user_id}'), guild=guild,
+                                 channel=channel, command=types.SimpleNamespace(name=command_name), data={},
+                                 response=FakeResponse(), followup=FakeFollowup(),
+                                 client=types.SimpleNamespace(get_partial_messageable=lambda channel_id: channel))
+
+
+def make_emoji_guild(*emoji_names: str):
+    return types.SimpleNamespace(id=int(os.environ['GUILD_ID']),
+                                 emojis=[types.SimpleNamespace(name=name, id=10 ** 17 + index)
+                                         for index, name in enumerate(emoji_names)])
+
+
+@pytest.fixture
+def render_caches(monkeypatch):
+    # Renders start without an emoji map, a compiled emoji matcher or cached fragments, at a fixed timestamp
+    import time
+    import bot.cogs.emoji_manager as emoji_manager
+    import bot.utils.string_decorator as sdec
+    from bot.utils.fragment_cache import fragment_cache
+
+    monkeypatch.setattr(emoji_manager, 'guild_emoji_map', {})
+    monkeypatch.setattr(emoji_manager, 'guild_emoji_map_populated', False)
+    monkeypatch.setattr(emoji_manager, 'guild_emoji_version', 0)
+    monkeypatch.setattr(sdec, '_guild_emoji_matcher', None)
+    monkeypatch.setattr(time, 'time', lambda: 1700000000.0)
+    fragment_cache.clear()
@@ -0,0 +1,78 @@
+#! test_autocomplete_index.py
+# NameIndex ranking tiers, and the banded edit distance and typo prefilter against unbounded reference checks
+
+import random
+import string
+from typing import Optional
+import pytest
+from bot.utils.autocomplete_index import NameIndex, bounded_prefix_edit_distance, max_typos
+
+NAMES = ('Lantern', 'Rope', 'Silver Dagger', 'Anna', 'Hanna', 'Amma')
+
+
+def reference_prefix_edit_distance(query: str, target: str) -> int:
+    # Full optimal string alignment table, minimized over every prefix of target
+    rows = [[i + j if i == 0 or j == 0 else 0 for j in range(len(target) + 1)] for i in range(len(query) + 1)]
+    for i in range(1, len(query) + 1):
+        for j in range(1, len(target) + 1):
+            rows[i][j] = min(rows[i - 1][j] + 1, rows[i][j - 1] + 1,
+                             rows[i - 1][j - 1] + (query[i - 1] != target[j - 1]))
+            if i > 1 and j > 1 and query[i - 1] == target[j - 2] and query[i - 2] == target[j - 1]:
+                rows[i][j] = min(rows[i][j], rows[i - 2][j - 2] + 1)
+    return min(rows[len(query)])
+
+
+def reference_typo_distance(name_index: NameIndex, query: str, position: int) -> Optional[int]:
+    bound = max_typos(query)
+    distances = [reference_prefix_edit_distance(query, name_index.names[position][word_start:])
+                 for word_start in (0, *name_index._word_starts[position])]
+    return min(distances) if min(distances) <= bound else None
+
+
+def test_prefix_and_substring_hits_skip_fuzzy_matching(monkeypatch):
+    name_index = NameIndex((name, name) for name in NAMES)
+
+    def fail(*args):
+        raise AssertionError('fuzzy matching ran')
+    monkeypatch.setattr(NameIndex, '_typo_candidates', fail)
+    monkeypatch.setattr(NameIndex, '_subsequence_candidates', fail)
+
+    assert name_index.search('ann') == ['Anna', 'Hanna']
+    assert name_index.search('dag') == ['Silver Dagger']
+
+
+def test_typos_and_swaps_match_when_nothing_else_does():
+    name_index = NameIndex((name, name) for name in NAMES)
+
+    assert name_index.search('lantren') == ['Lantern']
+    assert name_index.search('dsgger') == ['Silver Dagger']
+    assert name_index.search('rpoe') == ['Rope']
+    assert name_index.search('xyzzy') == []
+
+
+def test_banded_distance_matches_reference():
+    rng = random.Random(19)
+    for _ in range(3000):
+        query = ''.join(rng.choice('abc') for _ in range(rng.randint(1, 7)))
+        target = ''.join(rng.choice('abc') for _ in range(rng.randint(0, 10)))
+        bound = rng.randint(0, 2)
+        expected = reference_prefix_edit_distance(query, target)
+        assert bounded_prefix_edit_distance(query, target, bound) == (expected if expected <= bound else None)
+
+
+@pytest.mark.parametrize('alphabet', ['abcde', string.ascii_lowercase])
+def test_typo_prefilter_keeps_every_match(alphabet):
+    rng = random.Random(19)
+    names = [' '.join(''.join(rng.choice(alphabet) for _ in range(rng.randint(2, 9)))
+                      for _ in range(rng.randint(1, 3))) for _ in range(200)]
+    name_index = NameIndex((name, name) for name in names)
+    for _ in range(150):
+        query = ''.join(rng.choice(alphabet) for _ in range(rng.randint(3, 10)))
+        bound = max_typos(query)
+        candidates = name_index._typo_candidates(query, bound)
+        for position in range(len(names)):
+            expected = reference_typo_distance(name_index, query, position)
+            if expected is not None:
+                assert position in candidates
+            if position in candidates:
+                assert name_index._typo_distance(query, position, bound) == expected
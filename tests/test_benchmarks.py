@@ -0,0 +1,23 @@
+#! test_benchmarks.py
+# Runs each benchmark script at a tiny size, so the scripts keep working as the code they measure changes
+
+import bench_autocomplete
+import bench_game_load
+import bench_paginator
+import bench_render
+
+
+def test_game_load_benchmark_runs():
+    bench_game_load.main(player_counts=(2,), repeat=1)
+
+
+def test_autocomplete_benchmark_runs():
+    bench_autocomplete.main(candidate_counts=(25,), query_count=6)
+
+
+def test_paginator_benchmark_runs():
+    bench_paginator.main(catalog_sizes=(5,), repeat=1)
+
+
+def test_render_benchmark_runs():
+    bench_render.main(catalog_sizes=(5,), repeat=1, calls=1)
@@ -0,0 +1,52 @@
+#! test_catalog_copies.py
+# Players are granted their own copies of catalog actions and items, so using one never changes another holder's
+
+import asyncio
+import bot.model.data_model as gdm
+from bot.model.conf_vars import ConfVars as Conf
+from bot.model.game_journal import ItemMovedEvent, apply_event
+from bot.cogs.action_item_management import ActionItemManager
+from bot.cogs.moderator_request_management import ModRequestManager
+from conftest import make_game, make_action, make_item, make_interaction
+
+
+async def grant_and_use_action():
+    await gdm.write_game(make_game(actions=[make_action('Scry', uses=2)]))
+    action_item_manager = ActionItemManager(bot=None)
+    for player_id in (1, 2):
+        await ActionItemManager.actions_player_add.callback(action_item_manager, make_interaction(user_id=99),
+                                                            player=str(player_id), action='Scry')
+    await ModRequestManager.action_submission.callback(ModRequestManager(bot=None), make_interaction(user_id=1),
+                                                       action='Scry', target1=None, target2=None, target3=None,
+                                                       request_details=None)
+    return await gdm.get_game(file_path=Conf.GAME_PATH)
+
+
+def test_holders_of_one_action_decrement_independently():
+    game = asyncio.run(grant_and_use_action())
+
+    assert game.get_player(1).get_action('Scry').action_uses == 1
+    assert game.get_player(2).get_action('Scry').action_uses == 2
+    assert game.get_action('Scry').action_uses == 2
+
+
+def test_holders_of_one_action_decrement_independently_after_reload(game_store):
+    asyncio.run(grant_and_use_action())
+    game_store.invalidate()
+    game = asyncio.run(gdm.get_game(file_path=Conf.GAME_PATH))
+
+    assert game.get_player(1).get_action('Scry').action_uses == 1
+    assert game.get_player(2).get_action('Scry').action_uses == 2
+    assert game.get_action('Scry').action_uses == 2
+
+
+def test_replayed_catalog_item_is_copied_to_each_holder():
+    game = make_game(items=[make_item('Lantern', action=make_action('Light', uses=1))])
+    apply_event(game, ItemMovedEvent(item_name='Lantern', to_player_id=1))
+    apply_event(game, ItemMovedEvent(item_name='Lantern', to_player_id=2))
+
+    game.get_player(1).get_item('Lantern').item_action.action_uses = 0
+
+    assert game.get_player(2).get_item('Lantern').item_action.action_uses == 1
+    assert game.get_item('Lantern').item_action.action_uses == 1
+    assert game.get_player(1).get_item('Lantern') is not game.get_item('Lantern')
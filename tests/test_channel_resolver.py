@@ -0,0 +1,90 @@
+#! test_channel_resolver.py
+# Channels and messages come from the gateway cache or the resolver's own cache, and only a miss goes over REST
+
+import asyncio
+import types
+from bot.utils.channel_resolver import ChannelResolver
+
+
+class StubChannel:
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+        self.partial_messages: list[int] = []
+
+    def get_partial_message(self, message_id: int):
+        self.partial_messages.append(message_id)
+        return types.SimpleNamespace(id=message_id, channel=self)
+
+
+class StubGuild:
+    def __init__(self, cached_ids=(), fetchable_ids=()):
+        self.cached = {channel_id: StubChannel(channel_id) for channel_id in cached_ids}
+        self.fetchable = {channel_id: StubChannel(channel_id) for channel_id in fetchable_ids}
+        self.fetched: list[int] = []
+
+    def get_channel(self, channel_id: int):
+        return self.cached.get(channel_id)
+
+    async def fetch_channel(self, channel_id: int):
+        self.fetched.append(channel_id)
+        return self.fetchable[channel_id]
+
+
+def test_gateway_cache_hit_skips_rest():
+    resolver = ChannelResolver()
+    guild = StubGuild(cached_ids=[1])
+
+    channel = asyncio.run(resolver.resolve_channel(guild, 1))
+
+    assert channel is guild.cached[1]
+    assert guild.fetched == []
+    assert resolver.stats() == {'cache_hits': 1, 'rest_fetches': 0}
+
+
+def test_cache_miss_is_fetched_once():
+    resolver = ChannelResolver()
+    guild = StubGuild(fetchable_ids=[2])
+
+    first = asyncio.run(resolver.resolve_channel(guild, 2))
+    second = asyncio.run(resolver.resolve_channel(guild, 2))
+
+    assert first is second is guild.fetchable[2]
+    assert guild.fetched == [2]
+    assert resolver.stats() == {'cache_hits': 1, 'rest_fetches': 1}
+
+
+def test_missing_channel_id_resolves_to_none():
+    resolver = ChannelResolver()
+
+    assert asyncio.run(resolver.resolve_channel(StubGuild(), None)) is None
+    assert resolver.stats() == {'cache_hits': 0, 'rest_fetches': 0}
+
+
+def test_invalidate_channel_refetches_and_drops_its_messages():
+    resolver = ChannelResolver()
+    guild = StubGuild(fetchable_ids=[2, 3])
+    asyncio.run(resolver.resolve_message(guild, 2, 20))
+    asyncio.run(resolver.resolve_message(guild, 3, 30))
+
+    resolver.invalidate_channel(2)
+    asyncio.run(resolver.resolve_message(guild, 2, 20))
+    asyncio.run(resolver.resolve_message(guild, 3, 30))
+
+    assert guild.fetched == [2, 3, 2]
+    assert guild.fetchable[2].partial_messages == [20, 20]
+    assert guild.fetchable[3].partial_messages == [30]
+
+
+def test_partial_messages_are_reused_until_invalidated():
+    resolver = ChannelResolver()
+    guild = StubGuild(cached_ids=[1])
+
+    first = asyncio.run(resolver.resolve_message(guild, 1, 10))
+    second = asyncio.run(resolver.resolve_message(guild, 1, 10))
+    resolver.invalidate_message(10)
+    third = asyncio.run(resolver.resolve_message(guild, 1, 10))
+
+    assert first is second
+    assert third is not first
+    assert guild.cached[1].partial_messages == [10, 10]
+    assert guild.fetched == []
@@ -0,0 +1,92 @@
+#! test_command_locking.py
+# Commands re-check what they validated once they hold the mutation lock, since the game may change while they wait
+
+import asyncio
+import bot.model.data_model as gdm
+from bot.model.conf_vars import ConfVars as Conf
+from bot.model.data_model import Dilemma, ResourceDefinition
+from bot.cogs.voting import VotingManager
+from bot.cogs.moderator_request_management import ModRequestManager
+from bot.cogs.resource_management import ResourceManager
+from conftest import make_game, make_action, make_interaction
+
+
+async def vote_while_voting_closes(game, vote, close):
+    await gdm.write_game(game)
+    interaction = make_interaction(user_id=1)
+    async with gdm.mutate_game() as mutation:
+        # The vote validates against the open round, then waits for the lock held here
+        vote_task = asyncio.get_running_loop().create_task(vote(interaction))
+        await asyncio.sleep(0)
+        close(mutation.game)
+    await vote_task
+    return await gdm.get_game(file_path=Conf.GAME_PATH), interaction
+
+
+def test_round_vote_rejected_when_round_closes_while_waiting():
+    def close(game):
+        game.get_round(1).is_active_round = False
+
+    game, interaction = asyncio.run(vote_while_voting_closes(
+        make_game(),
+        lambda interaction: VotingManager.round_vote.callback(VotingManager(bot=None), interaction, player='2'),
+        close))
+
+    assert game.get_round(1).votes == []
+    assert interaction.followup.sent == ['No currently active round found for this game!']
+
+
+def test_dilemma_vote_rejected_when_dilemma_closes_while_waiting():
+    game = make_game()
+    game.get_round(1).add_dilemma(Dilemma(dilemma_name='Fork', dilemma_channel_id=1, dilemma_message_id=1,
+                                          dilemma_player_ids={1}, dilemma_choices={'Left', 'Right'},
+                                          is_active_dilemma=True))
+
+    def close(game):
+        game.get_round(1).get_dilemma('Fork').is_active_dilemma = False
+
+    game, interaction = asyncio.run(vote_while_voting_closes(
+        game,
+        lambda interaction: VotingManager.dilemma_vote.callback(VotingManager(bot=None), interaction,
+                                                                dilemma_name='Fork', dilemma_choice='Left'),
+        close))
+
+    assert game.get_round(1).get_dilemma('Fork').dilemma_votes == []
+    assert interaction.followup.sent == ['Could not find an active dilemma for player player1!']
+
+
+def test_action_submission_without_the_action_is_rejected_before_locking():
+    async def run():
+        await gdm.write_game(make_game(actions=[make_action('Scry')]))
+        interaction = make_interaction(user_id=1)
+        await ModRequestManager.action_submission.callback(ModRequestManager(bot=None), interaction, action='Scry',
+                                                           target1=None, target2=None, target3=None,
+                                                           request_details=None)
+        return interaction
+
+    interaction = asyncio.run(run())
+
+    assert interaction.followup.sent == ['You do not have the action Scry!']
+    assert gdm.game_store.mutations == 0
+
+
+def test_moderator_resource_add_waits_for_the_mutation_lock():
+    async def run():
+        await gdm.write_game(make_game(resource_definitions=[
+            ResourceDefinition(resource_name='gold', is_commodity=True, is_perishable=False)]))
+        interaction = make_interaction(user_id=99)
+        async with gdm.mutate_game() as mutation:
+            add_task = asyncio.get_running_loop().create_task(ResourceManager.resource_player_add.callback(
+                ResourceManager(bot=None), interaction, player='1', resource_type='gold', resource_amt=5))
+            await asyncio.sleep(0)
+            # The command must not touch the game while another mutation holds it
+            gold_while_locked = mutation.game.get_player(1).get_resource('gold').resource_amt
+            mutation.game.get_player(1).modify_resource(resource_name='gold', amt=-4)
+        await add_task
+        return gold_while_locked, await gdm.get_game(file_path=Conf.GAME_PATH)
+
+    gold_while_locked, game = asyncio.run(run())
+
+    assert gold_while_locked == 10
+    assert game.get_player(1).get_resource('gold').resource_amt == 11
+    assert gdm.game_store.contended_mutations == 1
@@ -0,0 +1,39 @@
+#! test_emoji_manager.py
+# The emoji map is loaded once, and its version only moves when the guild's emoji set changes
+
+import asyncio
+import types
+import pytest
+import bot.cogs.emoji_manager as emoji_manager
+
+
+@pytest.fixture(autouse=True)
+def empty_emoji_map(monkeypatch):
+    monkeypatch.setattr(emoji_manager, 'guild_emoji_map', {})
+    monkeypatch.setattr(emoji_manager, 'guild_emoji_map_populated', False)
+    monkeypatch.setattr(emoji_manager, 'guild_emoji_version', 0)
+
+
+def make_guild(*emoji_names: str):
+    return types.SimpleNamespace(emojis=[types.SimpleNamespace(name=name, id=index)
+                                         for index, name in enumerate(emoji_names)])
+
+
+def test_guild_without_emojis_is_populated_once():
+    guild = make_guild()
+    for _ in range(3):
+        assert asyncio.run(emoji_manager.get_guild_emojis(guild)) == {}
+
+    assert emoji_manager.get_guild_emoji_version() == 0
+
+
+def test_version_moves_only_when_emoji_set_changes():
+    asyncio.run(emoji_manager.populate_guild_emojis(make_guild('wolf')))
+    version = emoji_manager.get_guild_emoji_version()
+
+    asyncio.run(emoji_manager.populate_guild_emojis(make_guild('wolf')))
+    assert emoji_manager.get_guild_emoji_version() == version
+
+    asyncio.run(emoji_manager.populate_guild_emojis(make_guild('wolf', 'moon')))
+    assert emoji_manager.get_guild_emoji_version() == version + 1
+    assert emoji_manager.guild_emoji_map == {':wolf:': '<:wolf:0>', ':moon:': '<:moon:1>'}
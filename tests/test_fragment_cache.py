@@ -0,0 +1,79 @@
+#! test_fragment_cache.py
+# The rendered fragment cache evicts by its byte budget, and a cached fragment is never served once the game instance,
+# the definitions it was rendered with or the guild emojis change
+
+import asyncio
+import sys
+import pytest
+import bot.cogs.emoji_manager as emoji_manager
+from bot.model.data_model import ResourceCost, ResourceDefinition
+from bot.utils.fragment_cache import FragmentCache
+from bot.utils.message_formatter import render_action
+from bot.utils.render_context import RenderContext
+from conftest import make_game, make_action, make_emoji_guild
+
+pytestmark = pytest.mark.usefixtures('render_caches')
+
+
+def test_cache_evicts_least_recently_used_by_byte_budget():
+    entry_size = sys.getsizeof('x' * 100) + sys.getsizeof('a')
+    cache = FragmentCache(max_bytes=2 * entry_size)
+    cache.put('a', 'x' * 100)
+    cache.put('b', 'y' * 100)
+    assert cache.get('a') == 'x' * 100
+
+    cache.put('c', 'z' * 100)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 'x' * 100
+    assert cache.get('c') == 'z' * 100
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['bytes'] == 2 * entry_size
+
+
+def test_cache_skips_fragments_over_the_budget():
+    cache = FragmentCache(max_bytes=100)
+    cache.put('a', 'x' * 200)
+
+    assert cache.get('a') is None
+    assert cache.stats()['bytes'] == 0
+
+
+def test_cache_clears_when_the_game_instance_changes():
+    cache = FragmentCache(max_bytes=10000)
+    first_game, second_game = make_game(), make_game()
+    cache.get('a', generation=first_game)
+    cache.put('a', 'text')
+    assert cache.get('a', generation=first_game) == 'text'
+
+    assert cache.get('a', generation=second_game) is None
+    assert cache.stats()['entries'] == 0
+
+
+def render_scry(game, guild) -> str:
+    async def render():
+        context = await RenderContext.build(guild=guild, game=game)
+        return await render_action(game.get_action('Scry'), context=context)
+    return asyncio.run(render())
+
+
+def test_cached_fragment_is_rerendered_after_definition_change():
+    game = make_game(actions=[make_action('Scry', costs=[ResourceCost(res_name='gold', amount=2)])],
+                     resource_definitions=[ResourceDefinition(resource_name='gold', is_commodity=True,
+                                                              is_perishable=False, emoji_text='(g)')])
+    guild = make_emoji_guild()
+    assert '2 (g)' in render_scry(game, guild)
+
+    game.get_resource_definitions()['gold'].emoji_text = '(gold)'
+
+    assert '2 (gold)' in render_scry(game, guild)
+
+
+def test_cached_fragment_is_rerendered_after_emoji_change():
+    game = make_game(actions=[make_action('Scry')])
+    game.get_action('Scry').action_desc = 'Sees :eye: far'
+    assert 'Sees :eye: far' in render_scry(game, make_emoji_guild())
+
+    asyncio.run(emoji_manager.populate_guild_emojis(make_emoji_guild('eye')))
+
+    assert f'Sees <:eye:{10 ** 17}> far' in render_scry(game, make_emoji_guild('eye'))
@@ -0,0 +1,93 @@
+#! test_game_indexes.py
+# Every Game mutator leaves the lazily built lookup indexes identical to indexes rebuilt from scratch
+
+import pytest
+from bot.model.data_model import INDEX_KEY_FIELDS, Game, Player, Party, Round, Dilemma, PersistentInteractableView, \
+    ItemTypeDefinition, AttributeDefinition, ResourceDefinition, ActionTypeDefinition
+from conftest import make_game, make_action, make_item
+
+
+def make_indexed_game() -> Game:
+    game = make_game(player_count=4,
+                     parties=[Party(party_name='Den', max_size=3, channel_id=10, player_ids={1, 2}),
+                              Party(party_name='Pack', max_size=3, channel_id=11, player_ids={3})],
+                     actions=[make_action('Scry'), make_action('Howl')],
+                     items=[make_item('Lantern'), make_item('Rope')],
+                     pi_views=[PersistentInteractableView(view_name='actions', channel_id=1, message_ids=[1],
+                                                          button_msg_id=2)],
+                     item_type_definitions=[ItemTypeDefinition(item_type='Standard', is_equippable=False,
+                                                               max_equippable=0)],
+                     attribute_definitions=[AttributeDefinition(attribute_name='Body')],
+                     resource_definitions=[ResourceDefinition(resource_name='gold', is_commodity=True,
+                                                              is_perishable=False)],
+                     action_type_definitions=[ActionTypeDefinition(action_type='Passive')])
+    game.get_round(1).add_dilemma(Dilemma(dilemma_name='Fork', dilemma_channel_id=1, dilemma_message_id=1,
+                                          is_active_dilemma=True))
+    return game
+
+
+def lookup_results(game: Game) -> dict:
+    # Identity of the entry every lookup returns, for each key present in the game
+    results = {section: {getattr(entry, key_field): id(game._index(section).get(getattr(entry, key_field)))
+                         for entry in getattr(game, section)}
+               for section, key_field in INDEX_KEY_FIELDS.items()}
+    results['party_members'] = {player.player_id: id(game.get_player_party(player)) for player in game.players}
+    results['latest_round'] = id(game.get_latest_round())
+    results['dilemmas'] = {(a_round.round_number, dilemma.dilemma_name):
+                           id(a_round.get_dilemma(dilemma.dilemma_name))
+                           for a_round in game.rounds for dilemma in a_round.round_dilemmas}
+    return results
+
+
+def rebuilt_lookup_results(game: Game) -> dict:
+    game._indexes.clear()
+    return lookup_results(game)
+
+
+MUTATIONS = {
+    'add_player': lambda game: game.add_player(Player(player_id=5, player_discord_name='player5')),
+    'add_later_round': lambda game: game.add_round(Round(round_channel_id=1, round_message_id=2, round_number=2,
+                                                         is_active_round=True)),
+    'add_earlier_round': lambda game: game.add_round(Round(round_channel_id=1, round_message_id=2, round_number=0,
+                                                           is_active_round=False)),
+    'add_party': lambda game: game.add_party(Party(party_name='Coven', max_size=2, channel_id=12, player_ids={4})),
+    'add_party_member': lambda game: game.get_party(11).add_player(game.get_player(4)),
+    'remove_party_member': lambda game: game.get_party(10).remove_player(game.get_player(2)),
+    'add_pi_view': lambda game: game.add_pi_view(PersistentInteractableView(view_name='items', channel_id=1,
+                                                                            message_ids=[3], button_msg_id=4)),
+    'remove_pi_view': lambda game: game.remove_pi_view('actions'),
+    'add_dilemma': lambda game: game.get_round(1).add_dilemma(
+        Dilemma(dilemma_name='Bridge', dilemma_channel_id=1, dilemma_message_id=2, is_active_dilemma=True)),
+    'rename_player_id': lambda game: setattr(game.get_player(2), 'player_id', 20),
+    'renumber_round': lambda game: setattr(game.get_round(1), 'round_number', 7),
+    'move_party_channel': lambda game: setattr(game.get_party(10), 'channel_id', 20),
+    'replace_party_members': lambda game: setattr(game.get_party(10), 'player_ids', {4}),
+    'rename_action': lambda game: setattr(game.get_action('Scry'), 'action_name', 'Divine'),
+    'rename_item': lambda game: setattr(game.get_item('Rope'), 'item_name', 'Chain'),
+    'rename_pi_view': lambda game: setattr(game.get_pi_view('actions'), 'view_name', 'abilities'),
+    'rename_dilemma': lambda game: setattr(game.get_round(1).get_dilemma('Fork'), 'dilemma_name', 'Crossroads'),
+    'rename_item_type': lambda game: setattr(game.item_type_definitions[0], 'item_type', 'Relic'),
+    'rename_attribute': lambda game: setattr(game.attribute_definitions[0], 'attribute_name', 'Mind'),
+    'rename_resource': lambda game: setattr(game.resource_definitions[0], 'resource_name', 'silver'),
+    'rename_action_type': lambda game: setattr(game.action_type_definitions[0], 'action_type', 'Active'),
+    'replace_players': lambda game: setattr(game, 'players', [Player(player_id=9, player_discord_name='player9')]),
+    'replace_rounds': lambda game: setattr(game, 'rounds', [Round(round_channel_id=1, round_message_id=3,
+                                                                  round_number=3, is_active_round=True)]),
+    'replace_parties': lambda game: setattr(game, 'parties', [Party(party_name='Solo', max_size=1, channel_id=13,
+                                                                    player_ids={1})]),
+    'replace_actions': lambda game: setattr(game, 'actions', [make_action('Shift')]),
+    'replace_items': lambda game: setattr(game, 'items', [make_item('Mirror')]),
+    'replace_pi_views': lambda game: setattr(game, 'pi_views', []),
+    'rollback': lambda game: game.rollback(make_game(player_count=1).model_dump()),
+}
+
+
+@pytest.mark.parametrize('mutation', MUTATIONS.values(), ids=MUTATIONS.keys())
+def test_indexes_match_rebuild_after_mutation(mutation):
+    game = make_indexed_game()
+    # Every index is built before the mutation, so a stale entry would survive it
+    lookup_results(game)
+
+    mutation(game)
+
+    assert lookup_results(game) == rebuilt_lookup_results(game)
@@ -0,0 +1,54 @@
+#! test_game_journal.py
+# Journal compaction keeps the records a snapshot does not cover and never leaves the journal half-written, and a new
+# game never inherits the journal of the one it replaces
+
+import asyncio
+import os
+import pytest
+import bot.model.data_model as gdm
+import bot.model.game_journal as journal
+from bot.model.conf_vars import ConfVars as Conf
+from bot.model.game_journal import RoundVoteEvent
+from conftest import make_game
+
+
+def write_votes(game, count: int):
+    events = [RoundVoteEvent(round_number=1, player_id=1, choice=str(i), timestamp=i) for i in range(count)]
+    journal.write_records(journal.build_records(game=game, events=events), game_path=Conf.GAME_PATH)
+
+
+def test_compaction_keeps_records_after_snapshot():
+    game = make_game()
+    write_votes(game, 5)
+
+    journal.compact_journal(game_path=Conf.GAME_PATH, snapshot_seq=3)
+
+    assert [record.seq for record in journal.read_records(Conf.GAME_PATH)] == [4, 5]
+    assert not os.path.exists(f'{journal.journal_path(Conf.GAME_PATH)}.compact')
+
+
+def test_failed_compaction_leaves_journal_whole(monkeypatch):
+    game = make_game()
+    write_votes(game, 5)
+
+    def failing_replace(src, dst):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(journal.os, 'replace', failing_replace)
+    with pytest.raises(OSError):
+        journal.compact_journal(game_path=Conf.GAME_PATH, snapshot_seq=3)
+
+    assert [record.seq for record in journal.read_records(Conf.GAME_PATH)] == [1, 2, 3, 4, 5]
+
+
+def test_new_game_discards_previous_games_journal(game_store):
+    # The operator deletes the old game file to start over; its journal must not be replayed onto the new game
+    write_votes(make_game(), 3)
+
+    asyncio.run(gdm.write_new_game(make_game()))
+
+    game_store.invalidate()
+    game = asyncio.run(gdm.get_game(file_path=Conf.GAME_PATH))
+    assert game.journal_seq == 0
+    assert game.get_round(1).votes == []
+    assert journal.read_records(Conf.GAME_PATH) == []
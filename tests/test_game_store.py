@@ -0,0 +1,161 @@
+#! test_game_store.py
+# Resident game cache: saves are serialized on the event loop and written on the worker, and write-behind changes
+# reach the disk
+
+import asyncio
+import threading
+import time
+import bot.model.data_model as gdm
+from bot.model.conf_vars import ConfVars as Conf
+from conftest import make_game, make_item
+
+# How much longer than the serialization itself the event loop may stall while a large game is saved; file writes and
+# fsyncs on the worker must not add to the stall
+SAVE_LOOP_LAG_SLACK = 0.05
+
+
+def make_large_game(player_count: int = 200, items_per_player: int = 50) -> gdm.Game:
+    game = make_game(player_count=player_count)
+    for player in game.players:
+        for item_num in range(items_per_player):
+            player.add_item(make_item(f'Item {item_num}'))
+    return game
+
+
+async def measure_loop_lag(operation) -> tuple[float, float, int]:
+    # Runs operation while a ticker measures the longest gap between its wake-ups
+    gaps = []
+    finished = False
+
+    async def ticker():
+        last_tick = time.perf_counter()
+        while not finished:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last_tick)
+            last_tick = now
+
+    ticker_task = asyncio.get_running_loop().create_task(ticker())
+    await asyncio.sleep(0.01)
+    gaps.clear()
+    started = time.perf_counter()
+    await operation()
+    duration = time.perf_counter() - started
+    ticks = len(gaps)
+    finished = True
+    await ticker_task
+    return duration, max(gaps, default=0.0), ticks
+
+
+class TimedStorage(gdm.JsonGameStorage):
+    # Records the thread and duration of the serialization and of the write
+    def __init__(self):
+        super().__init__()
+        self.dump_threads: list[threading.Thread] = []
+        self.write_threads: list[threading.Thread] = []
+        self.dump_seconds: float = 0.0
+        self.write_seconds: float = 0.0
+
+    def dump(self, *args, **kwargs):
+        started = time.perf_counter()
+        dump = super().dump(*args, **kwargs)
+        self.dump_seconds = time.perf_counter() - started
+        self.dump_threads.append(threading.current_thread())
+        return dump
+
+    def save_dump(self, *args, **kwargs):
+        started = time.perf_counter()
+        super().save_dump(*args, **kwargs)
+        self.write_seconds = time.perf_counter() - started
+        self.write_threads.append(threading.current_thread())
+
+
+def test_save_stalls_event_loop_for_serialization_only(game_store):
+    game = make_large_game()
+    asyncio.run(gdm.write_game(game))
+    game.mark_section_dirty('players')
+    game_store.backend = storage = TimedStorage()
+
+    duration, max_lag, ticks = asyncio.run(measure_loop_lag(lambda: gdm.write_game(game)))
+
+    assert ticks > 0
+    assert storage.dump_threads == [threading.main_thread()]
+    assert storage.write_threads and storage.write_threads[0] is not threading.main_thread()
+    assert max_lag < duration
+    assert max_lag < storage.dump_seconds + SAVE_LOOP_LAG_SLACK
+
+
+def test_mutations_during_queued_save_stay_out_of_snapshot(game_store):
+    # A mutation made while the save waits for the worker must neither reach the snapshot nor be counted in the
+    # journal position it records, or journal replay would apply the mutation's events on top of it a second time
+    game = make_game()
+    asyncio.run(gdm.write_game(game))
+    worker_released = threading.Event()
+
+    async def run():
+        blocker = asyncio.get_running_loop().create_task(game_store.run_io(worker_released.wait))
+        game.get_player(1).get_resource('gold').resource_amt = 20
+        game.mark_section_dirty('players')
+        save = asyncio.get_running_loop().create_task(gdm.write_game(game))
+        await asyncio.sleep(0.01)
+        game.get_player(1).get_resource('gold').resource_amt = 30
+        game.journal_seq += 1
+        game.mark_section_dirty('players')
+        worker_released.set()
+        await asyncio.gather(blocker, save)
+
+    asyncio.run(run())
+
+    on_disk = gdm.JsonGameStorage().load(file_path=Conf.GAME_PATH)
+    assert on_disk.get_player(1).get_resource('gold').resource_amt == 20
+    assert on_disk.journal_seq == 0
+    assert game.get_dirty_sections() == {'players', 'journal_seq'}
+
+
+async def write_behind_gold_change(game_store) -> gdm.Game:
+    # The game starts out fully on disk, then write-behind is switched on
+    await gdm.write_game(make_game())
+    Conf.WRITE_BEHIND_INTERVAL = 3600
+    # Within the interval of a flush that just happened, so the change below waits for the next one
+    game_store._last_flush = time.monotonic()
+    game = await gdm.get_game(file_path=Conf.GAME_PATH)
+    game.get_player(1).get_resource('gold').resource_amt += 10
+    await gdm.write_game(game)
+    return game
+
+
+def gold_on_disk(player_id: int) -> int:
+    return gdm.JsonGameStorage().load(file_path=Conf.GAME_PATH).get_player(player_id).get_resource('gold').resource_amt
+
+
+def test_get_game_returns_unflushed_changes(game_store):
+    async def run():
+        game = await write_behind_gold_change(game_store)
+        return game, await gdm.get_game(file_path=Conf.GAME_PATH)
+
+    written_game, game = asyncio.run(run())
+
+    assert game is written_game
+    assert game.get_player(1).get_resource('gold').resource_amt == 20
+    assert gold_on_disk(1) == 10
+
+
+def test_flush_game_writes_changes_made_within_interval(game_store):
+    async def run():
+        await write_behind_gold_change(game_store)
+        await gdm.flush_game()
+
+    asyncio.run(run())
+
+    assert not game_store.has_unsaved_changes()
+    assert gold_on_disk(1) == 20
+
+
+def test_close_writes_changes_made_within_interval(game_store):
+    async def run():
+        await write_behind_gold_change(game_store)
+        await gdm.close_game()
+
+    asyncio.run(run())
+
+    assert gold_on_disk(1) == 20
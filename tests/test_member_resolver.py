@@ -0,0 +1,110 @@
+#! test_member_resolver.py
+# Members come from the interaction, the gateway cache or the resolver's TTL'd cache; only misses go over REST, and
+# bulk misses are queried over the gateway in batches
+
+import asyncio
+import types
+import discord
+import pytest
+import bot.utils.member_resolver as member_resolver_module
+from bot.utils.member_resolver import MemberResolver, QUERY_MEMBERS_LIMIT
+
+
+class StubGuild:
+    def __init__(self, cached_ids=(), query_fails: bool = False):
+        self.cached = {member_id: types.SimpleNamespace(id=member_id) for member_id in cached_ids}
+        self.query_fails = query_fails
+        self.fetched: list[int] = []
+        self.queried: list[list[int]] = []
+
+    def get_member(self, member_id: int):
+        return self.cached.get(member_id)
+
+    async def fetch_member(self, member_id: int):
+        self.fetched.append(member_id)
+        return types.SimpleNamespace(id=member_id)
+
+    async def query_members(self, user_ids, limit, cache):
+        self.queried.append(list(user_ids))
+        if self.query_fails:
+            raise TimeoutError('no gateway response')
+        return [types.SimpleNamespace(id=member_id) for member_id in user_ids]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(member_resolver_module, 'time', types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_interaction_member_is_used_without_lookup():
+    member = object.__new__(discord.Member)
+    member._user = types.SimpleNamespace(id=5)
+    interaction = types.SimpleNamespace(user=member)
+    resolver = MemberResolver(ttl=60)
+    guild = StubGuild()
+
+    assert asyncio.run(resolver.resolve_member(guild, 5, interaction)) is member
+    assert guild.fetched == []
+    assert resolver.stats() == {'cache_hits': 1, 'rest_fetches': 0}
+
+
+def test_gateway_cache_hit_skips_rest():
+    resolver = MemberResolver(ttl=60)
+    guild = StubGuild(cached_ids=[1])
+
+    assert asyncio.run(resolver.resolve_member(guild, 1)) is guild.cached[1]
+    assert guild.fetched == []
+
+
+def test_rest_fetch_is_reused_until_it_expires(clock):
+    resolver = MemberResolver(ttl=60)
+    guild = StubGuild()
+
+    first = asyncio.run(resolver.resolve_member(guild, 2))
+    clock[0] += 59
+    second = asyncio.run(resolver.resolve_member(guild, 2))
+    clock[0] += 2
+    asyncio.run(resolver.resolve_member(guild, 2))
+
+    assert first is second
+    assert guild.fetched == [2, 2]
+    assert resolver.stats() == {'cache_hits': 1, 'rest_fetches': 2}
+
+
+def test_invalidate_member_refetches(clock):
+    resolver = MemberResolver(ttl=60)
+    guild = StubGuild()
+    asyncio.run(resolver.resolve_member(guild, 2))
+
+    resolver.invalidate_member(2)
+    asyncio.run(resolver.resolve_member(guild, 2))
+
+    assert guild.fetched == [2, 2]
+
+
+def test_bulk_misses_are_queried_in_batches(clock):
+    resolver = MemberResolver(ttl=60)
+    guild = StubGuild(cached_ids=[0])
+    member_ids = list(range(QUERY_MEMBERS_LIMIT + 51))
+
+    members = asyncio.run(resolver.resolve_members(guild, member_ids + [1]))
+
+    assert sorted(members) == member_ids
+    assert [len(batch) for batch in guild.queried] == [QUERY_MEMBERS_LIMIT, 50]
+    assert guild.fetched == []
+    # Queried members are cached like REST fetches
+    asyncio.run(resolver.resolve_member(guild, 7))
+    assert guild.fetched == []
+
+
+def test_failed_bulk_query_falls_back_to_rest(clock):
+    resolver = MemberResolver(ttl=60)
+    guild = StubGuild(query_fails=True)
+
+    members = asyncio.run(resolver.resolve_members(guild, [3, 4]))
+
+    assert sorted(members) == [3, 4]
+    assert guild.queried == [[3, 4]]
+    assert guild.fetched == [3, 4]
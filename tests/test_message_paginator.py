@@ -0,0 +1,133 @@
+#! test_message_paginator.py
+# Page packing and oversized fragment splitting, and the paged displays against the builders they replaced
+
+import asyncio
+import types
+import pytest
+import baseline_message_formatter as baseline
+from bot.model.data_model import ResourceCost, ResourceDefinition, ActionTypeDefinition, ItemTypeDefinition
+from bot.utils.message_formatter import construct_action_display, construct_item_display
+from bot.utils.message_paginator import MessagePaginator, split_oversized, DISCORD_MESSAGE_LIMIT
+from conftest import make_game, make_action, make_item, make_emoji_guild
+
+pytestmark = pytest.mark.usefixtures('render_caches')
+
+
+async def unchanged_text(text: str) -> str:
+    return text
+
+
+def make_paginator(page_limit: int = DISCORD_MESSAGE_LIMIT) -> MessagePaginator:
+    return MessagePaginator(context=types.SimpleNamespace(format_text=unchanged_text), page_limit=page_limit)
+
+
+def test_short_fragment_is_not_split():
+    assert split_oversized('abc\ndef\n', 8) == ['abc\ndef\n']
+
+
+def test_oversized_fragment_splits_at_line_breaks():
+    text = 'aaaa\nbbbb\ncccc\n'
+
+    assert split_oversized(text, 11) == ['aaaa\nbbbb\n', 'cccc\n']
+
+
+def test_overlong_line_is_cut_at_the_limit():
+    text = 'x' * 25 + '\nshort\n'
+    pieces = split_oversized(text, 10)
+
+    assert pieces == ['x' * 10, 'x' * 10, 'x' * 5 + '\n', 'short\n']
+    assert ''.join(pieces) == text
+
+
+def test_fragments_pack_up_to_the_message_limit():
+    paginator = make_paginator()
+    paginator.add_formatted('a' * 1000)
+    paginator.add_formatted('b' * 1000)
+    paginator.add_formatted('c')
+
+    assert paginator.finish() == ['a' * 1000 + 'b' * 1000, 'c']
+
+
+def test_oversized_fragment_fills_whole_pages():
+    paginator = make_paginator(page_limit=10)
+    paginator.add_formatted('head\n')
+    paginator.add_formatted('0123456789' * 2 + 'tail\n')
+
+    pages = paginator.finish()
+    assert pages == ['head\n', '0123456789', '0123456789', 'tail\n']
+    assert all(len(page) <= 10 for page in pages)
+
+
+def test_add_page_and_break_page_boundaries():
+    paginator = make_paginator()
+
+    async def fill():
+        await paginator.add('first ')
+        await paginator.add_page('header\n')
+        await paginator.add('second ')
+        paginator.break_page()
+        paginator.break_page()
+        await paginator.add('third')
+
+    asyncio.run(fill())
+
+    # The header is a message of its own, and breaking an empty page does not send an empty message
+    assert paginator.finish() == ['first ', 'header\n', 'second ', 'third']
+
+
+def make_sample_game(entry_count: int):
+    actions = [make_action(f'Action {entry_num}', uses=entry_num % 7,
+                           costs=[ResourceCost(res_name='gold', amount=entry_num % 3 + 1)])
+               for entry_num in range(entry_count)]
+    for entry_num, action in enumerate(actions):
+        action.action_type = 'Spell' if entry_num % 2 else 'Skill'
+        action.action_desc = f'Does :e{entry_num % 5}: to a target\\nwith :unknown: side effects.'
+    items = [make_item(f'Item {entry_num}', action=actions[entry_num] if entry_num % 3 == 0 else None)
+             for entry_num in range(entry_count)]
+    return make_game(player_count=1, actions=actions, items=items,
+                     resource_definitions=[ResourceDefinition(resource_name='gold', is_commodity=True,
+                                                              is_perishable=False, emoji_text=':e1:')],
+                     action_type_definitions=[ActionTypeDefinition(action_type='Spell', emoji_text=':e2:')],
+                     item_type_definitions=[ItemTypeDefinition(item_type='Standard', is_equippable=False,
+                                                               max_equippable=0, emoji_text=':e3:')])
+
+
+BUILDERS = {'actions': (construct_action_display, baseline.construct_action_display),
+            'items': (construct_item_display, baseline.construct_item_display)}
+
+
+def render_both(display: str, game, guild) -> tuple[list[str], list[str]]:
+    if display == 'actions':
+        kwargs = dict(actions=game.actions,
+                      item_actions=[(item.item_name, item.item_action) for item in game.items if item.item_action])
+    else:
+        kwargs = dict(items=game.items)
+    builder, baseline_builder = BUILDERS[display]
+    return (asyncio.run(builder(guild=guild, game=game, **kwargs)),
+            asyncio.run(baseline_builder(guild=guild, game=game, **kwargs)))
+
+
+@pytest.mark.parametrize('display', BUILDERS)
+def test_small_display_matches_baseline_builder(display):
+    guild = make_emoji_guild(*(f'e{emoji_num}' for emoji_num in range(5)))
+    game = make_sample_game(entry_count=6)
+
+    pages, baseline_pages = render_both(display, game, guild)
+
+    assert pages == baseline_pages
+    # A second render is served from the fragment cache and must not differ either
+    assert render_both(display, game, guild)[0] == baseline_pages
+
+
+@pytest.mark.parametrize('display', BUILDERS)
+def test_paged_display_sends_baseline_text(display):
+    # Pages are now packed up to the message limit instead of 1750 characters, so only the page breaks may move
+    guild = make_emoji_guild(*(f'e{emoji_num}' for emoji_num in range(5)))
+    game = make_sample_game(entry_count=120)
+
+    pages, baseline_pages = render_both(display, game, guild)
+
+    assert len(pages) < len(baseline_pages)
+    assert all(len(page) <= DISCORD_MESSAGE_LIMIT for page in pages)
+    assert pages[0] == baseline_pages[0]
+    assert ''.join(pages) == ''.join(baseline_pages)
@@ -0,0 +1,64 @@
+#! test_mutate_game.py
+# A failed mutate_game block is undone without losing changes committed before it
+
+import asyncio
+import time
+import pytest
+import bot.model.data_model as gdm
+from bot.model.conf_vars import ConfVars as Conf
+from conftest import make_game
+
+
+async def add_gold(player_id: int, amount: int, fail: bool = False):
+    async with gdm.mutate_game() as mutation:
+        mutation.game.get_player(player_id).get_resource('gold').resource_amt += amount
+        if fail:
+            raise RuntimeError('command failed mid-mutation')
+
+
+async def commit_then_fail():
+    await add_gold(player_id=1, amount=10)
+    with pytest.raises(RuntimeError):
+        await add_gold(player_id=2, amount=5, fail=True)
+    return await gdm.get_game(file_path=Conf.GAME_PATH)
+
+
+def test_failed_mutation_keeps_unflushed_changes(game_store, monkeypatch):
+    monkeypatch.setattr(Conf, 'WRITE_BEHIND_INTERVAL', 3600)
+    asyncio.run(gdm.write_game(make_game()))
+    # Within the interval of a flush that just happened, so the +10 below stays unflushed
+    game_store._last_flush = time.monotonic()
+
+    game = asyncio.run(commit_then_fail())
+
+    assert game_store.has_unsaved_changes()
+    assert game.get_player(1).get_resource('gold').resource_amt == 20
+    assert game.get_player(2).get_resource('gold').resource_amt == 10
+
+    asyncio.run(gdm.flush_game())
+    game_store.invalidate()
+    game = asyncio.run(gdm.get_game(file_path=Conf.GAME_PATH))
+    assert game.get_player(1).get_resource('gold').resource_amt == 20
+    assert game.get_player(2).get_resource('gold').resource_amt == 10
+
+
+def test_failed_mutation_is_undone_by_reload():
+    asyncio.run(gdm.write_game(make_game()))
+
+    game = asyncio.run(commit_then_fail())
+
+    assert game.get_player(1).get_resource('gold').resource_amt == 20
+    assert game.get_player(2).get_resource('gold').resource_amt == 10
+
+
+def test_rollback_keeps_game_instance_and_indexes_current():
+    game = make_game()
+    snapshot = game.model_dump()
+    game.get_player(1).get_resource('gold').resource_amt = 0
+    game.players.pop()
+
+    game.rollback(snapshot)
+
+    assert game.get_player(1).get_resource('gold').resource_amt == 10
+    assert game.get_player(3) is game.players[2]
+    assert 'players' in game.get_dirty_sections()
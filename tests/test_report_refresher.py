@@ -0,0 +1,79 @@
+#! test_report_refresher.py
+# Report edits are coalesced per refresh window, and a failing render or edit is counted instead of escaping the
+# background task
+
+import asyncio
+import types
+from bot.utils.report_refresher import ReportRefresher
+
+
+class StubMessage:
+    def __init__(self):
+        self.edits: list[str] = []
+
+    async def edit(self, content=None, **kwargs):
+        self.edits.append(content)
+
+
+def make_client(message: StubMessage):
+    channel = types.SimpleNamespace(get_partial_message=lambda message_id: message)
+    return types.SimpleNamespace(get_partial_messageable=lambda channel_id: channel)
+
+
+def render_text(text: str):
+    async def render():
+        return text
+    return render
+
+
+async def failing_render():
+    raise KeyError('round')
+
+
+def test_requests_within_a_window_are_coalesced():
+    async def run():
+        refresher = ReportRefresher(window=0.01)
+        message = StubMessage()
+        for text in ('one', 'two', 'three'):
+            refresher.request_refresh(make_client(message), channel_id=1, message_id=10, render=render_text(text))
+        await refresher._tasks[10]
+        return refresher, message
+
+    refresher, message = asyncio.run(run())
+
+    assert message.edits == ['three']
+    assert refresher.stats()['saved_edits'] == 2
+
+
+def test_render_failure_is_counted_and_does_not_escape_the_task():
+    async def run():
+        refresher = ReportRefresher(window=0)
+        message = StubMessage()
+        refresher.request_refresh(make_client(message), channel_id=1, message_id=10, render=failing_render)
+        failed_task = refresher._tasks[10]
+        await asyncio.wait([failed_task])
+        refresher.request_refresh(make_client(message), channel_id=1, message_id=10, render=render_text('tally'))
+        await refresher._tasks[10]
+        return refresher, message, failed_task
+
+    refresher, message, failed_task = asyncio.run(run())
+
+    assert failed_task.exception() is None
+    assert message.edits == ['tally']
+    assert refresher.stats() == {'requested_edits': 2, 'performed_edits': 1, 'failed_edits': 1, 'saved_edits': 0}
+
+
+def test_flush_survives_a_render_failure():
+    async def run():
+        refresher = ReportRefresher(window=60)
+        message = StubMessage()
+        refresher._last_edit[10] = refresher._last_edit[11] = float('inf')
+        refresher.request_refresh(make_client(message), channel_id=1, message_id=10, render=failing_render)
+        refresher.request_refresh(make_client(message), channel_id=1, message_id=11, render=render_text('tally'))
+        await refresher.flush()
+        return refresher, message
+
+    refresher, message = asyncio.run(run())
+
+    assert message.edits == ['tally']
+    assert refresher.failed_edits == 1
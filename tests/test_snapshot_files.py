@@ -0,0 +1,67 @@
+#! test_snapshot_files.py
+# Bot-written snapshots are recognised by their checksum and loaded in a single pass; anything else is fully
+# validated, and startup recovery only parses files it cannot trust
+
+import json
+import os
+import pytest
+import bot.model.data_model as gdm
+from conftest import TEST_BASE_PATH, make_game, make_action, make_item
+
+
+@pytest.fixture
+def snapshot_path() -> str:
+    file_path = os.path.join(TEST_BASE_PATH, 'game.json')
+    game = make_game(actions=[make_action('Scry')], items=[make_item('Rope', action=make_action('Climb'))])
+    gdm.write_dom_to_json(game=game, filepath=file_path)
+    return file_path
+
+
+@pytest.fixture
+def validations(monkeypatch) -> list:
+    # Models validated from raw JSON bytes
+    validated = []
+    original = gdm.BaseModel.model_validate_json.__func__
+
+    def model_validate_json(cls, json_data, *args, **kwargs):
+        validated.append(cls.__name__)
+        return original(cls, json_data, *args, **kwargs)
+
+    monkeypatch.setattr(gdm.Game, 'model_validate_json', classmethod(model_validate_json))
+    return validated
+
+
+def test_trusted_and_untrusted_loads_agree(snapshot_path, validations):
+    trusted = gdm.read_json_to_dom(filepath=snapshot_path)
+    os.remove(gdm.snapshot_meta_path(snapshot_path))
+    untrusted = gdm.read_json_to_dom(filepath=snapshot_path)
+
+    assert validations == ['Game']
+    assert trusted.model_dump() == untrusted.model_dump()
+
+
+def test_hand_edited_snapshot_is_fully_validated(snapshot_path, validations):
+    with open(snapshot_path, 'r', encoding='utf8') as snapshot_file:
+        game_data = json.load(snapshot_file)
+    game_data['is_active'] = False
+    with open(snapshot_path, 'w', encoding='utf8') as snapshot_file:
+        json.dump(game_data, snapshot_file)
+
+    game = gdm.read_json_to_dom(filepath=snapshot_path)
+
+    assert validations == []
+    assert game.is_active is False
+
+
+def test_recovery_does_not_parse_a_trusted_snapshot(snapshot_path, validations):
+    assert gdm.recover_json_file(filepath=snapshot_path, model=gdm.Game) is None
+    assert validations == []
+
+
+def test_recovery_restores_a_damaged_snapshot_from_backup(snapshot_path, validations):
+    gdm.write_dom_to_json(game=gdm.read_json_to_dom(filepath=snapshot_path), filepath=snapshot_path)
+    with open(snapshot_path, 'w', encoding='utf8') as snapshot_file:
+        snapshot_file.write('{"players": [')
+
+    assert gdm.recover_json_file(filepath=snapshot_path, model=gdm.Game) == gdm.backup_path(snapshot_path)
+    assert gdm.read_json_to_dom(filepath=snapshot_path).get_action('Scry') is not None
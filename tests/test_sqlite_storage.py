@@ -0,0 +1,130 @@
+#! test_sqlite_storage.py
+# The SQLite backend round-trips a game, keeps its rows in line with the model for every journal event type, and
+# receives a faithful copy from /game-migrate-storage
+
+import asyncio
+import pytest
+import bot.model.data_model as gdm
+from bot.cogs.game_management import GameManager
+from bot.model.conf_vars import ConfVars as Conf
+from bot.model.data_model import Game, Party, Dilemma, Vote, Attribute, PersistentInteractableView, ResourceDefinition
+from bot.model.game_journal import RoundVoteEvent, DilemmaVoteEvent, ResourceDeltaEvent, ItemMovedEvent, \
+    PlayerKilledEvent, apply_event
+from bot.model.sqlite_storage import SqliteGameStorage
+from conftest import make_game, make_action, make_item, make_interaction
+
+
+def make_stored_game() -> Game:
+    game = make_game(player_count=3,
+                     parties=[Party(party_name='Den', max_size=3, channel_id=10, player_ids={1, 2})],
+                     actions=[make_action('Scry')],
+                     items=[make_item('Lantern'), make_item('Rope', action=make_action('Climb'))],
+                     pi_views=[PersistentInteractableView(view_name='actions', channel_id=1, message_ids=[1, 2],
+                                                          button_msg_id=3)],
+                     resource_definitions=[ResourceDefinition(resource_name='gold', is_commodity=True,
+                                                              is_perishable=False)])
+    game.get_player(1).player_attributes.append(Attribute(name='Body', level=2, max_level=5))
+    game.get_player(1).add_item(make_item('Lantern'))
+    game.get_player(2).add_action(make_action('Scry'))
+    game.get_round(1).add_dilemma(Dilemma(dilemma_name='Fork', dilemma_channel_id=1, dilemma_message_id=1,
+                                          is_active_dilemma=True, dilemma_player_ids={1, 2},
+                                          dilemma_choices={'left', 'right'}))
+    game.get_round(1).add_vote(Vote(player_id=2, choice='player1', timestamp=5))
+    return game
+
+
+@pytest.fixture
+def db_path(tmp_path) -> str:
+    return str(tmp_path / 'game.db')
+
+
+def test_round_trip(db_path):
+    game = make_stored_game()
+    storage = SqliteGameStorage()
+
+    storage.save(game, db_path)
+
+    assert storage.load(db_path).model_dump() == game.model_dump()
+
+
+def test_state_save_keeps_catalog_rows(db_path):
+    game = make_stored_game()
+    storage = SqliteGameStorage()
+    storage.save(game, db_path)
+
+    game.get_player(3).is_dead = True
+    storage.save(game, db_path, include_catalog=False)
+
+    assert storage.load(db_path).model_dump() == game.model_dump()
+
+
+@pytest.mark.parametrize('events', [
+    [RoundVoteEvent(round_number=1, player_id=1, choice='player3', timestamp=7)],
+    [RoundVoteEvent(round_number=1, player_id=2, choice='player3', timestamp=7)],
+    [RoundVoteEvent(round_number=1, player_id=2, choice=None, timestamp=7)],
+    [DilemmaVoteEvent(round_number=1, dilemma_name='Fork', player_id=1, choice='left', timestamp=7),
+     DilemmaVoteEvent(round_number=1, dilemma_name='Fork', player_id=2, choice='right', timestamp=8)],
+    [ResourceDeltaEvent(player_id=1, resource_name='gold', amount=-4)],
+    [ItemMovedEvent(item_name='Lantern', from_player_id=1, to_player_id=2)],
+    [ItemMovedEvent(item_name='Rope', from_player_id=None, to_player_id=3)],
+    [ItemMovedEvent(item_name='Lantern', from_player_id=1, to_player_id=None)],
+    [PlayerKilledEvent(player_id=3, is_dead=True)],
+], ids=['new round vote', 'changed round vote', 'withdrawn round vote', 'dilemma votes', 'resource delta',
+        'item given', 'catalog item granted', 'item removed', 'player killed'])
+def test_save_events_matches_model(db_path, events):
+    game = make_stored_game()
+    storage = SqliteGameStorage()
+    storage.save(game, db_path)
+
+    for event in events:
+        apply_event(game, event)
+    game.journal_seq += len(events)
+    assert storage.save_events(game, events, db_path)
+
+    assert storage.load(db_path).model_dump() == game.model_dump()
+
+
+def test_resource_delta_for_missing_resource(db_path):
+    # resource-player-transfer journals a delta for the recipient even when they do not hold the resource
+    game = make_stored_game()
+    game.get_player(2).player_resources.clear()
+    storage = SqliteGameStorage()
+    storage.save(game, db_path)
+
+    events = [ResourceDeltaEvent(player_id=1, resource_name='gold', amount=-3),
+              ResourceDeltaEvent(player_id=2, resource_name='gold', amount=3)]
+    for event in events:
+        apply_event(game, event)
+    storage.save_events(game, events, db_path)
+
+    loaded = storage.load(db_path)
+    assert loaded.model_dump() == game.model_dump()
+    assert loaded.get_player(2).get_resource('gold') is None
+
+
+def test_migrate_storage_copies_game():
+    game = make_stored_game()
+    asyncio.run(gdm.write_game(game))
+    interaction = make_interaction(user_id=1, command_name='game-migrate-storage')
+
+    asyncio.run(GameManager.game_migrate_storage.callback(GameManager(bot=None), interaction, 'sqlite',
+                                                          'game.json.sqlite'))
+
+    migrated = SqliteGameStorage().load(f'{Conf.BASE_PATH}/game.json.sqlite')
+    assert migrated.model_dump() == game.model_dump()
+    assert 'sqlite backend' in interaction.response.sent[0]
+
+
+def test_event_rows_are_captured_when_dumped(db_path):
+    # The storage worker writes the rows as they were when the events were dumped, not as the live game has them now
+    game = make_stored_game()
+    storage = SqliteGameStorage()
+    storage.save(game, db_path)
+
+    event = ResourceDeltaEvent(player_id=1, resource_name='gold', amount=-4)
+    apply_event(game, event)
+    dump = storage.dump_events(game, [event])
+    game.get_player(1).get_resource('gold').resource_amt = 0
+    storage.save_event_dump(dump, db_path)
+
+    assert storage.load(db_path).get_player(1).get_resource('gold').resource_amt == 6
@@ -0,0 +1,50 @@
+#! test_string_decorator.py
+# EmojiMatcher replaces :name: tokens in one pass, with the same result as the alternation regex it replaced
+
+import random
+import re
+import pytest
+from bot.utils.string_decorator import EmojiMatcher
+
+EMOJI_MAP = {':a:': '<:a:1>', ':b:': '<:b:2>', ':smile:': '<:smile:3>', ':Wolf:': '<:Wolf:4>'}
+
+
+def reference_sub(text: str, emoji_map: dict[str, str], ignore_case: bool = False) -> str:
+    # emoji_sub before EmojiMatcher: one alternation of every key, longest first
+    replacements = {(key.lower() if ignore_case else key): val for key, val in emoji_map.items()}
+    pattern = re.compile('|'.join(map(re.escape, sorted(replacements, key=len, reverse=True))),
+                         re.IGNORECASE if ignore_case else 0)
+    return pattern.sub(lambda match: replacements[match.group(0).lower() if ignore_case else match.group(0)], text)
+
+
+@pytest.mark.parametrize('text, expected', [
+    (':a::b:', '<:a:1><:b:2>'),
+    ('10:30:smile:', '10:30<:smile:3>'),
+    ('at 10:30 sharp', 'at 10:30 sharp'),
+    (':nope: and :a:', ':nope: and <:a:1>'),
+    (':nope:a:', ':nope<:a:1>'),
+    ('::a:::', ':<:a:1>::'),
+    ('no emojis here', 'no emojis here'),
+], ids=['adjacent', 'time before emoji', 'time only', 'unknown name', 'unknown name shares colon', 'extra colons',
+        'no colons'])
+def test_sub(text, expected):
+    assert EmojiMatcher(EMOJI_MAP).sub(text) == expected
+
+
+def test_sub_ignore_case():
+    assert EmojiMatcher(EMOJI_MAP, ignore_case=True).sub(':A: :WOLF: :wolf:') == '<:a:1> <:Wolf:4> <:Wolf:4>'
+    assert EmojiMatcher(EMOJI_MAP).sub(':A: :WOLF: :Wolf:') == ':A: :WOLF: <:Wolf:4>'
+
+
+def test_sub_without_emojis_returns_text():
+    assert EmojiMatcher({}).sub(':a:') == ':a:'
+
+
+@pytest.mark.parametrize('ignore_case', [False, True])
+def test_sub_matches_reference(ignore_case):
+    rng = random.Random(22)
+    for _ in range(3000):
+        text = ''.join(rng.choice(['a', 'b', 'A', 'smile', 'wolf', 'Wolf', ':', ':', ' ', '1'])
+                       for _ in range(rng.randint(0, 12)))
+        assert EmojiMatcher(EMOJI_MAP, ignore_case=ignore_case).sub(text) == \
+            reference_sub(text, EMOJI_MAP, ignore_case=ignore_case), text
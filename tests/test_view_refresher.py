@@ -0,0 +1,115 @@
+#! test_view_refresher.py
+# ViewRefresher edits only the messages whose content changed, and records what each message shows only when the
+# view it edited is still the one in the game
+
+import asyncio
+import pytest
+import bot.model.data_model as gdm
+import bot.utils.view_refresher as view_refresher_module
+from bot.model.conf_vars import ConfVars as Conf
+from bot.model.data_model import PersistentInteractableView
+from bot.utils.channel_resolver import channel_resolver
+from bot.utils.view_refresher import ViewRefresher, EMPTY_MESSAGE_CONTENT, hash_view_pages
+from conftest import make_game, make_interaction
+
+
+class FakeMessage:
+    def __init__(self, message_id: int, edits: list, fail: bool = False):
+        self.id = message_id
+        self.edits = edits
+        self.fail = fail
+        self.on_edit = None
+
+    async def edit(self, content=None, **kwargs):
+        if self.fail:
+            raise RuntimeError(f'edit of message {self.id} failed')
+        self.edits.append((self.id, content))
+        if self.on_edit is not None:
+            self.on_edit()
+
+
+@pytest.fixture
+def messages(monkeypatch):
+    edits = []
+    messages = {message_id: FakeMessage(message_id, edits) for message_id in (1, 2, 3)}
+
+    async def resolve_message(guild, channel_id, message_id):
+        return messages[message_id]
+
+    monkeypatch.setattr(channel_resolver, 'resolve_message', resolve_message)
+    monkeypatch.setattr(view_refresher_module, 'EDIT_INTERVAL', 0)
+    return messages
+
+
+def refresh(refresher: ViewRefresher, pages: list) -> int:
+    guild = make_interaction(user_id=1).guild
+    return asyncio.run(refresher.refresh_view(guild, 'actions', pages))
+
+
+def view_hashes() -> list:
+    return asyncio.run(gdm.get_game(file_path=Conf.GAME_PATH)).get_pi_view('actions').message_hashes
+
+
+@pytest.fixture(autouse=True)
+def stored_view():
+    asyncio.run(gdm.write_game(make_game(pi_views=[
+        PersistentInteractableView(view_name='actions', channel_id=1, message_ids=[1, 2, 3], button_msg_id=4)])))
+
+
+def test_unchanged_content_is_not_edited(messages):
+    refresher = ViewRefresher()
+    refresh(refresher, ['one', 'two', 'three'])
+    messages[1].edits.clear()
+
+    assert refresh(refresher, ['one', 'two', 'three']) == 0
+    assert messages[1].edits == []
+    assert refresher.stats() == {'performed_edits': 3, 'skipped_edits': 3}
+
+
+def test_only_changed_messages_are_edited(messages):
+    refresher = ViewRefresher()
+    refresh(refresher, ['one', 'two', 'three'])
+    messages[1].edits.clear()
+
+    assert refresh(refresher, ['one', 'TWO', 'three']) == 1
+    assert messages[1].edits == [(2, 'TWO')]
+
+
+def test_trailing_placeholders_are_edited_once(messages):
+    refresher = ViewRefresher()
+
+    assert refresh(refresher, ['one']) == 3
+    assert messages[1].edits == [(1, 'one'), (2, EMPTY_MESSAGE_CONTENT), (3, EMPTY_MESSAGE_CONTENT)]
+    assert refresh(refresher, ['one']) == 0
+    assert view_hashes() == hash_view_pages(3, ['one'])
+
+
+def test_failed_edit_keeps_its_old_hash(messages):
+    refresher = ViewRefresher()
+    refresh(refresher, ['one', 'two', 'three'])
+    messages[3].fail = True
+
+    with pytest.raises(RuntimeError):
+        refresh(refresher, ['ONE', 'TWO', 'THREE'])
+
+    # The edits that went through are recorded; the failed one is retried on the next refresh
+    assert view_hashes() == hash_view_pages(3, ['ONE', 'TWO', 'three'])
+    messages[3].fail = False
+    messages[1].edits.clear()
+    assert refresh(refresher, ['ONE', 'TWO', 'THREE']) == 1
+    assert messages[1].edits == [(3, 'THREE')]
+
+
+def test_hashes_are_not_written_for_a_recreated_view(messages):
+    refresher = ViewRefresher()
+
+    resident_game = asyncio.run(gdm.get_game(file_path=Conf.GAME_PATH))
+
+    def recreate_view():
+        # A moderator recreates the view while its messages are being edited
+        resident_game.get_pi_view('actions').message_ids = [5, 6, 7]
+
+    messages[1].on_edit = recreate_view
+
+    assert refresh(refresher, ['one', 'two', 'three']) == 3
+    assert view_hashes() == []